@@ -11,6 +11,7 @@ DROP TABLE IF EXISTS options_quotes CASCADE;
 DROP TABLE IF EXISTS underlying_quotes CASCADE;
 DROP TABLE IF EXISTS ingestion_metrics CASCADE;
 DROP TABLE IF EXISTS service_uptime_checks CASCADE;
+DROP TABLE IF EXISTS monitor_snapshots CASCADE;
 
 -- ============================================================================
 -- Underlying quotes table (TIME-SERIES)
@@ -199,6 +200,22 @@ CREATE TABLE service_uptime_checks (
 -- Convert to hypertable
 SELECT create_hypertable('service_uptime_checks', 'timestamp');
 
+-- ============================================================================
+-- Monitor snapshot table (TIME-SERIES)
+-- ============================================================================
+CREATE TABLE monitor_snapshots (
+    timestamp TIMESTAMPTZ NOT NULL,
+    cpu_percent DOUBLE PRECISION,
+    memory_percent DOUBLE PRECISION,
+    disk_percent DOUBLE PRECISION,
+    quotes_recent_10min BIGINT,
+    records_ingested BIGINT,
+    PRIMARY KEY (timestamp)
+);
+
+-- Convert to hypertable
+SELECT create_hypertable('monitor_snapshots', 'timestamp');
+
 -- ============================================================================
 -- Indexes for options_quotes (latest state table)
 -- ============================================================================
@@ -224,13 +241,8 @@ ON options_quotes (expiration, last_updated DESC);
 -- Indexes for time-series tables
 -- ============================================================================
 
--- Underlying quotes indexes
-CREATE INDEX idx_underlying_quotes_symbol 
-ON underlying_quotes(symbol, timestamp DESC);
-
-CREATE INDEX idx_underlying_quotes_spy_timestamp_agg
-ON underlying_quotes(symbol, timestamp DESC)
-WHERE symbol = 'SPY';
+-- underlying_quotes and service_uptime_checks get their (symbol /
+-- service_name, timestamp DESC) covering indexes from performance_indexes.sql
 
 -- GEX metrics indexes
 CREATE INDEX idx_gex_metrics_symbol 
@@ -251,10 +263,6 @@ CREATE INDEX idx_option_flow_premium
 ON option_flow_metrics(symbol, timestamp DESC, total_premium DESC)
 WHERE total_premium > 100000;
 
--- Service uptime indexes
-CREATE INDEX idx_service_uptime_service 
-ON service_uptime_checks(service_name, timestamp DESC);
-
 -- ============================================================================
 -- Compression policies (for hypertables only)
 -- ============================================================================
@@ -264,6 +272,7 @@ SELECT add_compression_policy('gex_metrics', INTERVAL '7 days');
 SELECT add_compression_policy('option_flow_metrics', INTERVAL '2 day');
 SELECT add_compression_policy('ingestion_metrics', INTERVAL '7 days');
 SELECT add_compression_policy('service_uptime_checks', INTERVAL '7 days');
+SELECT add_compression_policy('monitor_snapshots', INTERVAL '7 days');
 
 -- ============================================================================
 -- Retention policies (for hypertables only)
@@ -274,6 +283,7 @@ SELECT add_retention_policy('gex_metrics', INTERVAL '30 days');
 SELECT add_retention_policy('option_flow_metrics', INTERVAL '90 days');
 SELECT add_retention_policy('ingestion_metrics', INTERVAL '30 days');
 SELECT add_retention_policy('service_uptime_checks', INTERVAL '30 days');
+SELECT add_retention_policy('monitor_snapshots', INTERVAL '30 days');
 
 -- ============================================================================
 -- Views for common queries
@@ -375,6 +385,9 @@ COMMENT ON TABLE underlying_quotes IS
 COMMENT ON TABLE gex_metrics IS 
 'Time-series of gamma exposure calculations. Stores historical GEX data.';
 
+COMMENT ON TABLE monitor_snapshots IS 
+'Time-series of monitor daemon snapshots (system load, recent quotes, records ingested), one row per collection cycle.';
+
 COMMENT ON TABLE option_flow_metrics IS 
 'Time-series of option flow metrics aggregated into 5-minute buckets. Tracks volume, premium, notional value, and delta-weighted flows for calls and puts separately.';
 
@@ -406,6 +419,7 @@ BEGIN
     RAISE NOTICE '  - option_flow_metrics (hypertable - time-series, 5-min buckets)';
     RAISE NOTICE '  - ingestion_metrics (hypertable - time-series)';
     RAISE NOTICE '  - service_uptime_checks (hypertable - time-series)';
+    RAISE NOTICE '  - monitor_snapshots (hypertable - time-series)';
     RAISE NOTICE '';
     RAISE NOTICE 'Views created:';
     RAISE NOTICE '  - latest_gex';
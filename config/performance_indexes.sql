@@ -0,0 +1,185 @@
+-- GEX Options Platform Performance Indexes and Aggregates
+-- Idempotent: safe to re-run against an existing database
+--
+-- Apply with:
+--   make db-indexes
+--
+-- Hypertables do not support CREATE INDEX CONCURRENTLY, so their indexes
+-- are built one chunk per transaction to avoid locking the whole table.
+
+-- ============================================================================
+-- underlying_quotes (hypertable)
+-- ============================================================================
+
+-- Covering index for the SPY history, latest-bar and spy-change queries:
+-- WHERE symbol = ... ORDER BY timestamp DESC becomes an index-only scan
+CREATE INDEX IF NOT EXISTS idx_underlying_quotes_symbol_ts_covering
+ON underlying_quotes (symbol, timestamp DESC)
+INCLUDE (open, high, low, close, total_volume, up_volume, down_volume, actual_time)
+WITH (timescaledb.transaction_per_chunk);
+
+-- Built by earlier versions of the base schema with the same
+-- (symbol, timestamp DESC) key as the covering index above, so they only
+-- add write cost to every tick insert
+DROP INDEX IF EXISTS idx_underlying_quotes_symbol;
+DROP INDEX IF EXISTS idx_underlying_quotes_spy_timestamp_agg;
+
+-- ============================================================================
+-- ingestion_metrics and service_uptime_checks (hypertables)
+-- ============================================================================
+
+-- The hourly continuous aggregates below read recent ranges of these tables
+-- on every refresh and for the still-open hour. Chunk exclusion and the
+-- default (timestamp DESC) index already bound the scan to recent chunks,
+-- so BRIN would add nothing; these covering indexes let those reads run as
+-- index-only scans instead of visiting the heap for every row in range.
+CREATE INDEX IF NOT EXISTS idx_ingestion_metrics_ts_covering
+ON ingestion_metrics (timestamp DESC)
+INCLUDE (records_ingested, error_count)
+WITH (timescaledb.transaction_per_chunk);
+
+CREATE INDEX IF NOT EXISTS idx_service_uptime_service_ts_covering
+ON service_uptime_checks (service_name, timestamp DESC)
+INCLUDE (is_up)
+WITH (timescaledb.transaction_per_chunk);
+
+-- Built by earlier versions of the base schema; superseded by the
+-- covering index above (same key)
+DROP INDEX IF EXISTS idx_service_uptime_service;
+
+-- ============================================================================
+-- options_quotes (regular table)
+-- ============================================================================
+
+-- The dashboard queries filter on substring(symbol from 1 for 3) and
+-- expiration, which match the idx_options_quotes_underlying and
+-- idx_options_quotes_gex expression indexes from the base schema.
+
+-- Recency across all symbols for the monitoring table browser
+-- (ORDER BY last_updated DESC LIMIT n). The hypertables below already get
+-- a (timestamp DESC) index from create_hypertable.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_options_quotes_last_updated
+ON options_quotes (last_updated DESC);
+
+-- ============================================================================
+-- underlying_5min_bars (continuous aggregate)
+-- ============================================================================
+
+-- 5-minute OHLCV bars for the SPY history and range charts. Buckets start
+-- one minute past each 5-minute mark, so ticks from 9:31 up to 9:36 land in
+-- the bucket stamped 9:31; readers subtract a minute to label it the 9:30
+-- bar as the charts expect. Real-time aggregation fills in the still-open
+-- bar from raw ticks.
+CREATE MATERIALIZED VIEW IF NOT EXISTS underlying_5min_bars
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT
+    time_bucket(INTERVAL '5 minutes', timestamp, INTERVAL '1 minute') AS bucket,
+    symbol,
+    first(open, timestamp) AS open,
+    MAX(high) AS high,
+    MIN(low) AS low,
+    last(close, timestamp) AS close,
+    MAX(timestamp) AS actual_timestamp,
+    MAX(actual_time) AS actual_time,
+    SUM(COALESCE(total_volume, 0)) AS volume,
+    SUM(COALESCE(up_volume, 0)) AS up_volume,
+    SUM(COALESCE(down_volume, 0)) AS down_volume
+FROM underlying_quotes
+GROUP BY bucket, symbol;
+
+-- Materialize closed bars every minute; raw ticks are kept for 7 days
+SELECT add_continuous_aggregate_policy('underlying_5min_bars',
+    start_offset => INTERVAL '3 days',
+    end_offset => INTERVAL '1 minute',
+    schedule_interval => INTERVAL '1 minute',
+    if_not_exists => true);
+
+CREATE INDEX IF NOT EXISTS idx_underlying_5min_bars_symbol_bucket
+ON underlying_5min_bars (symbol, bucket DESC);
+
+-- ============================================================================
+-- ingestion_hourly and uptime_hourly (continuous aggregates)
+-- ============================================================================
+
+-- Hourly rollups behind the monitoring ingestion and uptime charts, so each
+-- poll reads ~48 precomputed rows instead of re-aggregating 48 hours of raw
+-- checks. UTC hour buckets line up with Eastern hours since the offset is
+-- a whole number of hours. Real-time aggregation fills in the current hour.
+
+-- The ingestion counters are cumulative; the chart differences the last
+-- value of consecutive hours
+CREATE MATERIALIZED VIEW IF NOT EXISTS ingestion_hourly
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT
+    time_bucket(INTERVAL '1 hour', timestamp) AS bucket,
+    last(records_ingested, timestamp) AS records_ingested,
+    last(error_count, timestamp) AS error_count
+FROM ingestion_metrics
+GROUP BY bucket;
+
+SELECT add_continuous_aggregate_policy('ingestion_hourly',
+    start_offset => INTERVAL '3 days',
+    end_offset => INTERVAL '1 hour',
+    schedule_interval => INTERVAL '15 minutes',
+    if_not_exists => true);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS uptime_hourly
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT
+    time_bucket(INTERVAL '1 hour', timestamp) AS bucket,
+    service_name,
+    COUNT(*) AS total_checks,
+    SUM(is_up) AS up_checks
+FROM service_uptime_checks
+GROUP BY bucket, service_name;
+
+SELECT add_continuous_aggregate_policy('uptime_hourly',
+    start_offset => INTERVAL '3 days',
+    end_offset => INTERVAL '1 hour',
+    schedule_interval => INTERVAL '15 minutes',
+    if_not_exists => true);
+
+CREATE INDEX IF NOT EXISTS idx_uptime_hourly_service_bucket
+ON uptime_hourly (service_name, bucket DESC);
+
+-- ============================================================================
+-- monitor_snapshots (hypertable)
+-- ============================================================================
+
+-- One row per monitor collection cycle, replacing the daily JSONL history
+-- files. Created here as well as in the base schema so existing databases
+-- get it on the next make db-indexes.
+CREATE TABLE IF NOT EXISTS monitor_snapshots (
+    timestamp TIMESTAMPTZ NOT NULL,
+    cpu_percent DOUBLE PRECISION,
+    memory_percent DOUBLE PRECISION,
+    disk_percent DOUBLE PRECISION,
+    quotes_recent_10min BIGINT,
+    records_ingested BIGINT,
+    PRIMARY KEY (timestamp)
+);
+
+SELECT create_hypertable('monitor_snapshots', 'timestamp', if_not_exists => true);
+
+SELECT add_compression_policy('monitor_snapshots', INTERVAL '7 days', if_not_exists => true);
+SELECT add_retention_policy('monitor_snapshots', INTERVAL '30 days', if_not_exists => true);
+
+-- ============================================================================
+-- ingestion_update notifications
+-- ============================================================================
+
+-- The monitor LISTENs on ingestion_update and only recomputes its latest
+-- ingestion metric after new rows arrive, instead of on every cycle.
+-- Statement-level, so the engine's per-symbol inserts in one transaction
+-- send a single notification.
+CREATE OR REPLACE FUNCTION notify_ingestion_update() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('ingestion_update', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS ingestion_metrics_notify ON ingestion_metrics;
+CREATE TRIGGER ingestion_metrics_notify
+AFTER INSERT ON ingestion_metrics
+FOR EACH STATEMENT EXECUTE FUNCTION notify_ingestion_update();
@@ -38,6 +38,7 @@ Available Steps:
   015.data_volume     - Data volume setup (/data mount and structure)
   020.database        - PostgreSQL + TimescaleDB setup (uses /data/postgresql)
   021.database_tuning - PostgreSQL performance tuning (uses /data/postgresql)
+  022.pgbouncer       - PgBouncer connection pooler for the dashboards
   030.application     - Application setup and dependencies
   040.tokens          - TradeStation token initialization
   050.security        - Security hardening (firewall, SSH)
@@ -16,7 +16,11 @@ https://api.tradestation.com/docs/fundamentals/authentication/auth-code
 """
 
 import os
+import secrets
+import shutil
+import tempfile
 import requests
+from pathlib import Path
 from urllib.parse import urlencode, urlparse, parse_qs
 from dotenv import load_dotenv
 
@@ -24,8 +28,10 @@ print("\n" + "="*60)
 print("TradeStation OAuth Setup")
 print("="*60)
 
-# Load .env file
-load_dotenv()
+# Load .env file from the project root; the refresh token is written back
+# to the same file
+env_file = Path(__file__).resolve().parent.parent / ".env"
+load_dotenv(env_file)
 
 # Configuration
 CLIENT_ID = os.getenv('TRADESTATION_CLIENT_ID')
@@ -36,7 +42,7 @@ USE_SANDBOX = os.getenv('TRADESTATION_USE_SANDBOX', 'false').lower() == 'true'
 # Check that client ID and secret are specified in .env
 if not CLIENT_ID or not CLIENT_SECRET:
     print("❌ Error: TRADESTATION_CLIENT_ID and TRADESTATION_CLIENT_SECRET must be set in .env file")
-    print("\nPlease add these lines to /home/ubuntu/gex-options-platform/.env:")
+    print(f"\nPlease add these lines to {env_file}:")
     print("TRADESTATION_CLIENT_ID=your_client_id_here")
     print("TRADESTATION_CLIENT_SECRET=your_client_secret_here\n")
     exit(1)
@@ -51,13 +57,17 @@ if USE_SANDBOX:
     AUTH_URL = "https://sim-signin.tradestation.com/authorize"
     TOKEN_URL = "https://sim-signin.tradestation.com/oauth/token"
 
+# Random per-run state, checked against the callback URL so a code from
+# another authorization request is not accepted
+expected_state = secrets.token_urlsafe(16)
+
 # Generate authorization URL
 params = {
     'response_type': 'code',
     'client_id': CLIENT_ID,
     'audience' : 'https://api.tradestation.com',
     'redirect_uri': REDIRECT_URI,
-    'state' : 'gex',
+    'state' : expected_state,
     'scope': 'openid offline_access profile MarketData ReadAccount Trade OptionSpreads'
 }
 
@@ -81,6 +91,11 @@ if 'code' not in params:
     print("❌ No authorization code found in URL\n")
     exit(1)
 
+if not secrets.compare_digest(params.get('state', [''])[0], expected_state):
+    print("❌ The state in the URL does not match this authorization request")
+    print("   Use the callback URL from the link printed above\n")
+    exit(1)
+
 auth_code = params['code'][0]
 print(f"\n✅ Received authorization code:")
 print(f"   {auth_code[:20]}...")
@@ -96,7 +111,13 @@ data = {
     'redirect_uri': REDIRECT_URI
 }
 
-response = requests.post(TOKEN_URL, data=data)
+# (connect, read) timeouts so a silent token endpoint fails instead of
+# hanging the setup
+try:
+    response = requests.post(TOKEN_URL, data=data, timeout=(3.05, 10))
+except requests.RequestException as e:
+    print(f"❌ Failed: could not reach {TOKEN_URL}: {e}\n")
+    exit(1)
 
 if response.status_code == 200:
 
@@ -119,19 +140,35 @@ if response.status_code == 200:
         print(f"   Expires in: {expires_in} seconds")
 
         # Read lines from .env
-        env_path = '/home/ubuntu/gex-options-platform/.env'
-        with open(env_path, 'r') as f:
+        with open(env_file, 'r') as f:
             lines = f.readlines()
 
-        # Update .env with updated refresh tokens
-        with open(env_path, 'w') as f:
-            for line in lines:
-                if line.startswith('TRADESTATION_REFRESH_TOKEN='):
-                    f.write(f"TRADESTATION_REFRESH_TOKEN={refresh_token}\n")
-                else:
-                    f.write(line)
-
-        print(f"\n💾 Refresh token saved to {env_path}")
+        # Swap in the new refresh token in one pass, adding the line if
+        # .env does not have one yet
+        token_line = f"TRADESTATION_REFRESH_TOKEN={refresh_token}\n"
+        updated = [token_line if line.startswith('TRADESTATION_REFRESH_TOKEN=') else line
+                   for line in lines]
+        if token_line not in updated:
+            if updated and not updated[-1].endswith('\n'):
+                updated[-1] += '\n'
+            updated.append(token_line)
+
+        # Update .env with updated refresh tokens: write a temporary file
+        # next to it and rename it into place, so a failed write never
+        # leaves a truncated .env behind
+        fd, tmp_path = tempfile.mkstemp(dir=env_file.parent, prefix='.env.', text=True)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.writelines(updated)
+                f.flush()
+                os.fsync(f.fileno())
+            shutil.copymode(env_file, tmp_path)
+            os.replace(tmp_path, env_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        print(f"\n💾 Refresh token saved to {env_file}")
         print("\n✅ Done! You can now start your services:")
         print("   sudo systemctl start gex-ingestion")
         print("   sudo systemctl start gex-scheduler\n")
@@ -4,45 +4,223 @@ ZeroGEX Monitoring Web Dashboard
 Simple Flask app to display monitoring metrics
 """
 
-from flask import Flask, jsonify, send_from_directory
-import json
+from flask import Flask, Response, jsonify, request
+from flask_compress import Compress
+from flask.json.provider import JSONProvider
+from werkzeug.http import generate_etag
+import orjson
+from decimal import Decimal
+import gzip
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+import hashlib
+import os
+import textwrap
 from pathlib import Path
 import psycopg2
-from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+from psycopg2 import pool, sql
 import traceback
-from datetime import datetime
-import pytz
+from datetime import datetime, timezone
 import time
-from functools import wraps
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+
+UTC = timezone.utc
+
+def _orjson_default(obj):
+    """Serialize types orjson does not handle natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson
+
+    orjson encodes straight to UTF-8 bytes and serializes datetimes as
+    ISO 8601 strings, so endpoints can hand it DB rows as-is.
+    """
+    option = orjson.OPT_NAIVE_UTC
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_orjson_default, option=self.option)
+        return self._app.response_class(body, mimetype='application/json')
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+@app.after_request
+def answer_not_modified(response):
+    """Answer a GET whose If-None-Match matches the ETag with an empty 304
+
+    Registered before Compress(app) so that it runs after compression: Flask
+    calls after_request hooks in reverse order. The ETag compared is the one
+    actually sent, which flask-compress suffixes with the encoding
+    ("<hash>:br"), so compressing clients revalidate too.
+    """
+    if (request.method in ('GET', 'HEAD') and response.status_code == 200
+            and 'ETag' in response.headers):
+        response.make_conditional(request)
+    return response
+
+# Dynamic responses are compressed with brotli when the client and the
+# installed packages allow it, gzip otherwise
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip'] if HAS_BROTLI else ['gzip']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_BR_LEVEL'] = 5
+Compress(app)
 METRICS_FILE = Path("/data/monitoring/current_metrics.json")
 DASHBOARD_DIR = Path("/opt/zerogex/monitoring")
 CREDS_FILE = Path.home() / ".zerogex_db_creds"
-_query_cache = {}
+# LRU of (expires_at, body, {encoding: compressed body}, etag) keyed by
+# (endpoint, args, kwargs)
+QUERY_CACHE_MAXSIZE = 256
+# Bodies smaller than this are not worth compressing (flask-compress's default)
+GZIP_MIN_SIZE = 500
+INFLIGHT_WAIT_SECONDS = 10
+_query_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_inflight = {}
+
+# (checked_at, (mtime_ns, size), body, etag) for the current metrics file
+_metrics_cache = (0, None, None, None)
+
+# path -> (mtime_ns, body, etag) for the dashboard page and logo
+_static_cache = {}
+
+# Fallback served when the metrics file is missing or unreadable; the
+# error and timestamp are filled in per response
+_EMPTY_METRICS = {
+    'error': None,
+    'timestamp': None,
+    'market_open': False,
+    'system': {
+        'cpu_percent': 0,
+        'memory_percent': 0,
+        'disk_percent': 0,
+        'memory_used_gb': 0,
+        'memory_total_gb': 0,
+        'disk_used_gb': 0,
+        'disk_total_gb': 0
+    },
+    'services': {},
+    'database': {'error': 'Unavailable'},
+    'alerts': []
+}
+
+# Prepended to each history query, so the settings travel in the same
+# simple-query message and cost no extra round trip. They cannot be set
+# once per connection with libpq startup options: PgBouncer drops
+# "options" (see ignore_startup_parameters in deploy step 022) and hands
+# each transaction whichever server connection is free. SET LOCAL only
+# lasts for the current transaction, so it is safe behind the pooler. The
+# Eastern time zone lets to_char() render ISO timestamps with the ET offset.
+HISTORY_SESSION_SETTINGS = (
+    "SET LOCAL statement_timeout = '3s'; "
+    "SET LOCAL TIME ZONE 'America/New_York';"
+)
+ISO_TIMESTAMP_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SSTZH:TZM'
+
+# The history charts are hourly, so only the open hour changes between
+# polls; cached bodies are refreshed this often and at each new hour
+HISTORY_CACHE_SECONDS = 300
+
+# Most recent rows shown per table in the table browser
+TABLE_BROWSER_LIMIT = 100
+
+# Tables the dashboard's table browser may query, with the columns it shows
+TABLE_BROWSER_COLUMNS = {
+    'options_quotes': [
+        'last_updated', 'symbol', 'strike', 'expiration', 'option_type', 'dte',
+        'bid', 'ask', 'mid', 'last', 'volume', 'open_interest', 'implied_vol',
+        'delta', 'gamma'
+    ],
+    'underlying_quotes': [
+        'timestamp', 'symbol', 'open', 'high', 'low', 'close',
+        'total_volume', 'up_volume', 'down_volume'
+    ],
+    'gex_metrics': [
+        'timestamp', 'symbol', 'expiration', 'underlying_price', 'total_gamma_exposure',
+        'net_gex', 'call_gamma', 'put_gamma', 'gamma_flip_point', 'max_gamma_strike',
+        'put_call_ratio', 'max_pain'
+    ],
+    'ingestion_metrics': [
+        'timestamp', 'source', 'symbol', 'records_ingested', 'records_stored',
+        'error_count', 'heartbeat_count', 'processing_time_ms'
+    ]
+}
+
+# Table browser statements, composed once per table; options_quotes is the
+# latest-state table, so it is ordered by last_updated instead of timestamp.
+# PostgreSQL builds the JSON array itself, so the rows come back as one
+# text value that is sent as-is.
+TABLE_BROWSER_QUERIES = {
+    table: sql.SQL(
+        "SELECT COALESCE(json_agg(t ORDER BY t.{order_column} DESC), '[]')::text FROM ("
+        "SELECT {columns} FROM {table} ORDER BY {order_column} DESC LIMIT %s) t"
+    ).format(
+        columns=sql.SQL(', ').join(sql.Identifier(c) for c in columns),
+        table=sql.Identifier(table),
+        order_column=sql.Identifier('last_updated' if table == 'options_quotes' else 'timestamp')
+    )
+    for table, columns in TABLE_BROWSER_COLUMNS.items()
+}
 
 # Global connection pool
 db_pool = None
+_pool_lock = threading.Lock()
+_pool_failed_at = None
+POOL_RETRY_SECONDS = 5
+POOL_MAX_CONNECTIONS = 8
+# Requests beyond POOL_MAX_CONNECTIONS queue for a free connection instead
+# of failing with "connection pool exhausted"
+POOL_WAIT_SECONDS = 5
+_pool_slots = threading.BoundedSemaphore(POOL_MAX_CONNECTIONS)
+
+@lru_cache(maxsize=1)
+def _read_creds_file(mtime_ns):
+    """Parse KEY=value lines from the credentials file
+
+    Keyed on the file's mtime so the file is only re-read after it changes.
+    """
+    config = {}
+    with open(CREDS_FILE) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                config[key] = value
+    return config
 
 def load_db_config():
-    """Load database configuration from ~/.zerogex_db_creds"""
+    """Load database configuration from ~/.zerogex_db_creds
+
+    Only called when a worker builds its connection pool, never per
+    request. The parsed file is reused until its mtime changes.
+    """
     try:
-        if not CREDS_FILE.exists():
+        try:
+            mtime_ns = CREDS_FILE.stat().st_mtime_ns
+        except FileNotFoundError:
             print(f"Credentials file not found: {CREDS_FILE}")
             return None
 
-        config = {}
-        with open(CREDS_FILE) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    config[key] = value
-
+        config = _read_creds_file(mtime_ns)
         return {
             'host': config.get('DB_HOST', 'localhost'),
-            'port': int(config.get('DB_PORT', '5432')),
+            # Prefer PgBouncer when step 022 has installed it
+            'port': int(config.get('PGBOUNCER_PORT', config.get('DB_PORT', '5432'))),
             'database': config.get('DB_NAME', 'gex_db'),
             'user': config.get('DB_USER', 'gex_user'),
             'password': config.get('DB_PASSWORD', ''),
@@ -53,22 +231,38 @@ def load_db_config():
         return None
 
 def init_db_pool():
-    """Initialize database connection pool"""
-    global db_pool
-    if db_pool is None:
+    """Initialize database connection pool
+
+    Guarded by a lock so concurrent first requests build a single pool.
+    After a failure, attempts are skipped for POOL_RETRY_SECONDS so a
+    database outage does not stall every request on connect_timeout.
+    """
+    global db_pool, _pool_failed_at
+    with _pool_lock:
+        if db_pool is not None:
+            return
+        if _pool_failed_at is not None and time.monotonic() - _pool_failed_at < POOL_RETRY_SECONDS:
+            return
+
         db_config = load_db_config()
-        if db_config:
-            try:
-                db_pool = psycopg2.pool.SimpleConnectionPool(
-                    minconn=1,
-                    maxconn=3,
-                    connect_timeout=3,
-                    **db_config
-                )
-                print("Database connection pool initialized")
-            except Exception as e:
-                print(f"Error creating connection pool: {e}")
-                db_pool = None
+        if not db_config:
+            _pool_failed_at = time.monotonic()
+            return
+
+        try:
+            # Shared by all of a worker's greenlets; see POOL_WAIT_SECONDS
+            db_pool = psycopg2.pool.ThreadedConnectionPool(
+                minconn=2,
+                maxconn=POOL_MAX_CONNECTIONS,
+                connect_timeout=3,
+                **db_config
+            )
+            _pool_failed_at = None
+            print("Database connection pool initialized")
+        except Exception as e:
+            print(f"Error creating connection pool: {e}")
+            db_pool = None
+            _pool_failed_at = time.monotonic()
 
 def get_db_connection():
     """Get a connection from the pool"""
@@ -77,9 +271,13 @@ def get_db_connection():
         init_db_pool()
 
     if db_pool:
+        if not _pool_slots.acquire(timeout=POOL_WAIT_SECONDS):
+            print("Timed out waiting for a pooled connection")
+            return None
         try:
             return db_pool.getconn()
         except Exception as e:
+            _pool_slots.release()
             print(f"Error getting connection from pool: {e}")
             return None
     return None
@@ -92,332 +290,445 @@ def return_db_connection(conn):
             db_pool.putconn(conn)
         except Exception as e:
             print(f"Error returning connection to pool: {e}")
-
-def cache_query(ttl_seconds=30):
-    """Cache query results for ttl_seconds"""
+        finally:
+            _pool_slots.release()
+
+@contextmanager
+def db_cursor():
+    """Borrow a pooled connection and yield a cursor on it
+
+    Yields None when the database is unavailable. The transaction is
+    rolled back if the body raises, and the connection always goes back
+    to the pool.
+    """
+    conn = get_db_connection()
+    if not conn:
+        yield None
+        return
+
+    cursor = conn.cursor()
+    try:
+        yield cursor
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        return_db_connection(conn)
+
+def _compress_body(body):
+    """Brotli and gzip copies of a body for the cache, keyed by encoding"""
+    if len(body) < GZIP_MIN_SIZE:
+        return {}
+    encoded = {'gzip': gzip.compress(body, compresslevel=6)}
+    if HAS_BROTLI:
+        encoded['br'] = brotli.compress(body, quality=5)
+    return encoded
+
+def _cached_response(body, encoded, etag):
+    """Build a response from a cache entry, precompressed when the client accepts it
+
+    Brotli is preferred over gzip. flask-compress leaves responses that
+    already carry a Content-Encoding alone, so cache hits are never
+    recompressed; their ETag gets the same ":<encoding>" suffix
+    flask-compress gives a freshly compressed body, so hits and misses
+    validate alike.
+    """
+    for encoding in ('br', 'gzip'):
+        if encoding in encoded and encoding in request.accept_encodings:
+            response = Response(encoded[encoding], mimetype='application/json')
+            response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+            response.set_etag(f"{etag}:{encoding}")
+            return response
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+def _expires_at(ttl_seconds, bucket_seconds):
+    """Monotonic deadline ttl_seconds from now, cut short at the next bucket
+
+    Bucket boundaries are multiples of bucket_seconds on the wall clock, so
+    an hourly chart picks up its new hour as soon as it starts.
+    """
+    ttl = ttl_seconds
+    if bucket_seconds:
+        ttl = min(ttl, bucket_seconds - time.time() % bucket_seconds)
+    return time.monotonic() + ttl
+
+def cache_query(ttl_seconds=30, bucket_seconds=None):
+    """Cache successful JSON responses for ttl_seconds
+
+    The serialized body is cached, along with compressed copies, so hits skip
+    the query, JSON encoding and compression. When bucket_seconds is given,
+    entries also expire at the next bucket boundary. The cache is an LRU
+    bounded by QUERY_CACHE_MAXSIZE entries. Concurrent misses for the same
+    key wait for the first caller's query instead of running their own.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            cache_key = f"{func.__name__}:{args}:{kwargs}"
-            now = time.time()
+            cache_key = (func.__name__, args, tuple(sorted(kwargs.items())))
+
+            while True:
+                with _cache_lock:
+                    cached = _query_cache.get(cache_key)
+                    if cached and cached[0] > time.monotonic():
+                        _query_cache.move_to_end(cache_key)
+                        return _cached_response(cached[1], cached[2], cached[3])
 
-            if cache_key in _query_cache:
-                result, timestamp = _query_cache[cache_key]
-                if now - timestamp < ttl_seconds:
-                    return result
+                    done = _inflight.get(cache_key)
+                    if done is None:
+                        done = _inflight[cache_key] = threading.Event()
+                        break
 
-            result = func(*args, **kwargs)
-            _query_cache[cache_key] = (result, now)
-            return result
+                # Another request is running this query; reuse its result
+                if not done.wait(timeout=INFLIGHT_WAIT_SECONDS):
+                    return func(*args, **kwargs)
+
+            try:
+                result = func(*args, **kwargs)
+                if isinstance(result, Response) and result.status_code == 200:
+                    body = result.get_data()
+                    encoded = _compress_body(body)
+                    etag = generate_etag(body)
+                    result.set_etag(etag)
+                    with _cache_lock:
+                        _query_cache[cache_key] = (_expires_at(ttl_seconds, bucket_seconds), body, encoded, etag)
+                        _query_cache.move_to_end(cache_key)
+                        while len(_query_cache) > QUERY_CACHE_MAXSIZE:
+                            _query_cache.popitem(last=False)
+                return result
+            finally:
+                with _cache_lock:
+                    _inflight.pop(cache_key, None)
+                done.set()
         return wrapper
     return decorator
 
+def cached_body(view, *args, **kwargs):
+    """Return the uncompressed JSON body of a cache_query view, or None on error
+
+    A fresh cache entry is used as is; otherwise the view runs, which fills
+    the cache. Lets one endpoint embed another's cached payload without
+    re-querying or re-parsing it.
+    """
+    cache_key = (view.__name__, args, tuple(sorted(kwargs.items())))
+    with _cache_lock:
+        cached = _query_cache.get(cache_key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    response = view(*args, **kwargs)
+    if not isinstance(response, Response) or response.status_code != 200:
+        return None
+    with _cache_lock:
+        cached = _query_cache.get(cache_key)
+    if cached:
+        return cached[1]
+    if 'Content-Encoding' in response.headers:
+        return None
+    return response.get_data()
+
+@app.after_request
+def add_etag(response):
+    """Tag JSON responses with a hash of the uncompressed body
+
+    Runs before compression, which then suffixes the tag with the encoding;
+    answer_not_modified turns a matching If-None-Match into a 304. Streamed
+    responses are left alone since hashing them needs the full body.
+    """
+    if (request.method == 'GET' and response.status_code == 200
+            and response.mimetype == 'application/json' and not response.is_streamed):
+        response.add_etag()
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def serve_static(directory, filename, mimetype):
+    """Serve a static file from memory with an ETag and browser caching
+
+    The bytes and ETag are reloaded only when the file's mtime changes, so a
+    redeploy is picked up without a restart. A matching If-None-Match is
+    answered with an empty 304 by answer_not_modified, after compression.
+    """
+    path = Path(directory) / filename
+    mtime_ns = path.stat().st_mtime_ns
+    cached = _static_cache.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        body = path.read_bytes()
+        cached = (mtime_ns, body, hashlib.blake2b(body, digest_size=8).hexdigest())
+        _static_cache[path] = cached
+
+    response = Response(cached[1], mimetype=mimetype)
+    response.set_etag(cached[2])
+    response.headers['Cache-Control'] = 'public, max-age=300'
+    return response
+
 @app.route('/')
 def dashboard():
     try:
-        return send_from_directory(DASHBOARD_DIR, 'dashboard.html')
+        return serve_static(DASHBOARD_DIR, 'dashboard.html', 'text/html')
     except Exception as e:
         print(f"Error serving dashboard: {e}")
         return jsonify({'error': str(e)}), 500
 
+def _unavailable_metrics(error):
+    """Minimal metrics payload so the dashboard renders when the file is missing"""
+    return {**_EMPTY_METRICS, 'error': error, 'timestamp': datetime.now(UTC)}
+
+def _load_metrics():
+    """Return the monitor's current metrics file as (body, etag)
+
+    The monitor replaces the file with an atomic rename, so a read always
+    sees a complete document. The bytes are kept in memory until the
+    file's mtime or size changes, and the file is stat'ed at most once a
+    second. The ETag is hashed once per file version rather than by
+    add_etag on every poll.
+    """
+    global _metrics_cache
+    checked_at, file_key, body, etag = _metrics_cache
+
+    now = time.monotonic()
+    if body is None or now - checked_at >= 1:
+        st = METRICS_FILE.stat()
+        current_key = (st.st_mtime_ns, st.st_size)
+        if body is None or current_key != file_key:
+            # Key the body on the fstat of the descriptor it was read
+            # from, in case the monitor swapped the file after the stat
+            with open(METRICS_FILE, 'rb') as f:
+                st = os.fstat(f.fileno())
+                current_key = (st.st_mtime_ns, st.st_size)
+                body = f.read()
+            # Older monitor builds could omit the top-level timestamp. Parsed
+            # once per file version; nested "timestamp" keys do not count.
+            data = orjson.loads(body)
+            if not data.get('timestamp'):
+                data['timestamp'] = datetime.now(UTC)
+                body = orjson.dumps(data, default=_orjson_default)
+            etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        _metrics_cache = (now, current_key, body, etag)
+    return body, etag
+
 @app.route('/api/metrics')
 def get_metrics():
-    import time
-    max_retries = 3
-
-    for attempt in range(max_retries):
-        try:
-            if METRICS_FILE.exists():
-                # Use with statement and explicit error handling
-                with open(METRICS_FILE, 'r') as f:
-                    content = f.read()
-
-                # Validate it's not empty
-                if not content or len(content) < 10:
-                    print(f"Metrics file is empty or too small (attempt {attempt + 1})")
-                    time.sleep(0.1)
-                    continue
-
-                try:
-                    data = json.loads(content)
-                    # Ensure timestamp is valid
-                    if not data.get('timestamp'):
-                        data['timestamp'] = datetime.now(pytz.utc).isoformat()
-                    return jsonify(data)
-                except json.JSONDecodeError as e:
-                    print(f"JSON decode error (attempt {attempt + 1}): {e}")
-                    if attempt < max_retries - 1:
-                        time.sleep(0.1)
-                        continue
-                    else:
-                        # Return a minimal valid response
-                        return jsonify({
-                            'error': 'Metrics temporarily unavailable',
-                            'timestamp': datetime.now(pytz.utc).isoformat(),
-                            'market_open': False,
-                            'system': {
-                                'cpu_percent': 0,
-                                'memory_percent': 0,
-                                'disk_percent': 0,
-                                'memory_used_gb': 0,
-                                'memory_total_gb': 0,
-                                'disk_used_gb': 0,
-                                'disk_total_gb': 0
-                            },
-                            'services': {},
-                            'database': {'error': 'Unavailable'},
-                            'alerts': []
-                        })
-            else:
-                return jsonify({
-                    'error': 'Metrics file not found',
-                    'timestamp': datetime.now(pytz.utc).isoformat(),
-                    'market_open': False,
-                    'system': {
-                        'cpu_percent': 0,
-                        'memory_percent': 0,
-                        'disk_percent': 0,
-                        'memory_used_gb': 0,
-                        'memory_total_gb': 0,
-                        'disk_used_gb': 0,
-                        'disk_total_gb': 0
-                    },
-                    'services': {},
-                    'database': {'error': 'Unavailable'},
-                    'alerts': []
-                }), 404
+    """Serve the monitor's current metrics file verbatim"""
+    try:
+        body, etag = _load_metrics()
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response
 
-        except Exception as e:
-            print(f"Error reading metrics file (attempt {attempt + 1}): {e}")
-            if attempt < max_retries - 1:
-                time.sleep(0.1)
-                continue
-            else:
-                traceback.print_exc()
-                return jsonify({
-                    'error': str(e),
-                    'timestamp': datetime.now(pytz.utc).isoformat(),
-                    'market_open': False,
-                    'system': {
-                        'cpu_percent': 0,
-                        'memory_percent': 0,
-                        'disk_percent': 0,
-                        'memory_used_gb': 0,
-                        'memory_total_gb': 0,
-                        'disk_used_gb': 0,
-                        'disk_total_gb': 0
-                    },
-                    'services': {},
-                    'database': {'error': 'Unavailable'},
-                    'alerts': []
-                }), 500
-
-    # Shouldn't reach here, but just in case
-    return jsonify({'error': 'Failed after retries'}), 500
+    except FileNotFoundError:
+        return jsonify(_unavailable_metrics('Metrics file not found')), 404
+    except Exception as e:
+        print(f"Error reading metrics file: {e}")
+        traceback.print_exc()
+        return jsonify(_unavailable_metrics(str(e))), 500
 
 @app.route('/api/table/<table_name>')
 def get_table_data(table_name):
-    """Get recent 100 rows from a database table"""
-    allowed_tables = {
-        'options_quotes': 'options_quotes',
-        'underlying_quotes': 'underlying_quotes',
-        'gex_metrics': 'gex_metrics',
-        'ingestion_metrics': 'ingestion_metrics'
-    }
-
-    if table_name not in allowed_tables:
+    """Get the most recent TABLE_BROWSER_LIMIT rows from a database table"""
+    query = TABLE_BROWSER_QUERIES.get(table_name)
+    if query is None:
         return jsonify({'error': 'Invalid table name'}), 400
 
-    actual_table = allowed_tables[table_name]
-    conn = None
-
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        if actual_table == "options_quotes":
-            cursor.execute(f"""
-                SELECT * FROM options_quotes
-                ORDER BY last_updated DESC
-                LIMIT 100
-            """)
-
-        else:
-            cursor.execute(f"""
-                SELECT * FROM {actual_table}
-                ORDER BY timestamp DESC
-                LIMIT 100
-            """)
-
-        rows = cursor.fetchall()
-        cursor.close()
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
+
+            cursor.execute(query, (TABLE_BROWSER_LIMIT,))
+            body = cursor.fetchone()[0]
+
+        return Response(body, mimetype='application/json')
 
-        return jsonify([dict(row) for row in rows])
     except Exception as e:
         print(f"Error getting table data for {table_name}: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
+
+# Hourly records ingested and errors for exactly 48 hours of hourly buckets,
+# from the last record of each hour (the ingestion_hourly continuous
+# aggregate); hours without records report 0
+INGESTION_HISTORY_SQL = textwrap.dedent("""
+        WITH hour_series AS (
+            SELECT generate_series(
+                date_trunc('hour', (NOW() - INTERVAL '48 hours') AT TIME ZONE 'America/New_York'),
+                date_trunc('hour', NOW() AT TIME ZONE 'America/New_York'),
+                INTERVAL '1 hour'
+            ) AS hour_bucket
+        ),
+        hourly_differences AS (
+            SELECT
+                bucket AT TIME ZONE 'America/New_York' as hour,
+                records_ingested - LAG(records_ingested, 1, 0) OVER (ORDER BY bucket) as records_this_hour,
+                error_count - LAG(error_count, 1, 0) OVER (ORDER BY bucket) as errors_this_hour
+            FROM ingestion_hourly
+            WHERE bucket >= date_trunc('hour', NOW() - INTERVAL '48 hours')
+        )
+        SELECT
+            to_char(hs.hour_bucket AT TIME ZONE 'America/New_York', %(iso_format)s) as timestamp,
+            GREATEST(COALESCE(hd.records_this_hour, 0), 0)::bigint as records_ingested,
+            GREATEST(COALESCE(hd.errors_this_hour, 0), 0)::bigint as error_count
+        FROM hour_series hs
+        LEFT JOIN hourly_differences hd ON hs.hour_bucket = hd.hour
+        ORDER BY hs.hour_bucket ASC
+""").strip()
+
+# Ingestion service uptime for exactly 48 hours of hourly buckets, read from
+# the uptime_hourly continuous aggregate
+UPTIME_HISTORY_SQL = textwrap.dedent("""
+        WITH hour_series AS (
+            -- From 48 hours ago to now, rounded to the hour
+            SELECT generate_series(
+                date_trunc('hour', (NOW() - INTERVAL '48 hours') AT TIME ZONE 'America/New_York'),
+                date_trunc('hour', NOW() AT TIME ZONE 'America/New_York'),
+                INTERVAL '1 hour'
+            ) AS hour_bucket
+        ),
+        hourly_uptime AS (
+            -- Buckets are UTC hours; shifted to naive Eastern to match the
+            -- series (the offset is a whole number of hours)
+            SELECT
+                bucket AT TIME ZONE 'America/New_York' as hour,
+                ROUND(up_checks::numeric / total_checks * 100, 1) as uptime_percent,
+                total_checks,
+                up_checks
+            FROM uptime_hourly
+            WHERE service_name = 'gex-ingestion'
+              AND bucket >= date_trunc('hour', NOW() - INTERVAL '48 hours')
+        )
+        SELECT
+            to_char(hs.hour_bucket AT TIME ZONE 'America/New_York', %(iso_format)s) as timestamp,
+            -- Hours without any checks report 0% rather than being absent
+            COALESCE(hu.uptime_percent, 0)::float8 as uptime_percent,
+            COALESCE(hu.up_checks, 0)::bigint as up_checks,
+            COALESCE(hu.total_checks, 0)::bigint as total_checks
+        FROM hour_series hs
+        LEFT JOIN hourly_uptime hu ON hs.hour_bucket = hu.hour
+        ORDER BY hs.hour_bucket ASC
+""").strip()
+
+def _json_array_sql(query, alias):
+    """Wrap a row query so PostgreSQL returns its rows as one JSON array
+
+    Rows are aggregated in timestamp order; the timestamps are ISO strings
+    in a single zone, so text order is time order.
+    """
+    return (
+        f"SELECT COALESCE(json_agg({alias} ORDER BY {alias}.timestamp), '[]')\n"
+        f"FROM (\n{query}\n) {alias}"
+    )
+
+INGESTION_HISTORY_JSON_SQL = _json_array_sql(INGESTION_HISTORY_SQL, 'i')
+UPTIME_HISTORY_JSON_SQL = _json_array_sql(UPTIME_HISTORY_SQL, 'u')
+
+# Both histories as one JSON object, so /api/history is a single round trip
+HISTORY_SQL = (
+    "SELECT json_build_object(\n"
+    "'ingestion', (" + INGESTION_HISTORY_JSON_SQL + "),\n"
+    "'uptime', (" + UPTIME_HISTORY_JSON_SQL + ")\n"
+    ")::text"
+)
+
+# Complete statements with their session settings, encoded once; psycopg2
+# accepts bytes queries. Each returns a single row holding the response
+# body as JSON text, so no per-row Python objects are built.
+INGESTION_HISTORY_QUERY = (HISTORY_SESSION_SETTINGS + '\n' + INGESTION_HISTORY_JSON_SQL + '::text').encode()
+UPTIME_HISTORY_QUERY = (HISTORY_SESSION_SETTINGS + '\n' + UPTIME_HISTORY_JSON_SQL + '::text').encode()
+HISTORY_QUERY = (HISTORY_SESSION_SETTINGS + '\n' + HISTORY_SQL).encode()
+HISTORY_PARAMS = {'iso_format': ISO_TIMESTAMP_FORMAT}
+
+def _fetch_json(cursor, query):
+    """Run a history statement and return its JSON text"""
+    cursor.execute(query, HISTORY_PARAMS)
+    return cursor.fetchone()[0]
+
+@app.route('/api/history')
+@cache_query(ttl_seconds=HISTORY_CACHE_SECONDS, bucket_seconds=3600)
+def get_history():
+    """Get ingestion and uptime history for charts in a single round trip"""
+    try:
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
+
+            body = _fetch_json(cursor, HISTORY_QUERY)
+
+        return Response(body, mimetype='application/json')
+
+    except Exception as e:
+        print(f"Error in history: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/ingestion-history')
-@cache_query(ttl_seconds=30) # Add caching
+@cache_query(ttl_seconds=HISTORY_CACHE_SECONDS, bucket_seconds=3600)
 def get_ingestion_history():
     """Get ingestion metrics history for charts"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SET TIME ZONE 'America/New_York'")
-        cursor.execute("SET statement_timeout = '3s'")
-
-        # Get the last record of each hour to calculate differences
-        cursor.execute("""
-            WITH hourly_last_values AS (
-                SELECT DISTINCT ON (date_trunc('hour', timestamp AT TIME ZONE 'America/New_York'))
-                    date_trunc('hour', timestamp AT TIME ZONE 'America/New_York') as hour,
-                    timestamp,
-                    records_ingested,
-                    error_count
-                FROM ingestion_metrics
-                WHERE timestamp > NOW() - INTERVAL '48 hours'
-                ORDER BY date_trunc('hour', timestamp AT TIME ZONE 'America/New_York'), timestamp DESC
-            ),
-            hourly_differences AS (
-                SELECT
-                    hour,
-                    records_ingested - LAG(records_ingested, 1, 0) OVER (ORDER BY hour) as records_this_hour,
-                    error_count - LAG(error_count, 1, 0) OVER (ORDER BY hour) as errors_this_hour
-                FROM hourly_last_values
-            )
-            SELECT
-                hour,
-                GREATEST(records_this_hour, 0) as records_ingested,
-                GREATEST(errors_this_hour, 0) as error_count
-            FROM hourly_differences
-            ORDER BY hour ASC
-            LIMIT 100
-        """)
-
-        rows = cursor.fetchall()
-        cursor.close()
-
-        eastern = pytz.timezone('America/New_York')
-        result = []
-        for row in rows:
-            ts = row['hour']
-            if ts.tzinfo is None:
-                ts = eastern.localize(ts)
-            else:
-                ts = ts.astimezone(eastern)
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
 
-            result.append({
-                'timestamp': ts.isoformat(),
-                'records_ingested': int(row['records_ingested']),
-                'error_count': int(row['error_count'])
-            })
+            body = _fetch_json(cursor, INGESTION_HISTORY_QUERY)
 
-        return jsonify(result)
+        return Response(body, mimetype='application/json')
 
     except Exception as e:
         print(f"Error in ingestion-history: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/uptime-history')
-@cache_query(ttl_seconds=30) # Add caching
+@cache_query(ttl_seconds=HISTORY_CACHE_SECONDS, bucket_seconds=3600)
 def get_uptime_history():
     """Get service uptime history for exactly 48 hours with hourly buckets"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SET TIME ZONE 'America/New_York'")
-        cursor.execute("SET statement_timeout = '3s'")
-
-        # Generate exactly 48 hours of hourly buckets
-        cursor.execute("""
-            WITH RECURSIVE hour_series AS (
-                -- Start from 48 hours ago, rounded to the hour
-                SELECT date_trunc('hour', NOW() - INTERVAL '48 hours') AS hour_bucket
-                UNION ALL
-                SELECT hour_bucket + INTERVAL '1 hour'
-                FROM hour_series
-                WHERE hour_bucket < date_trunc('hour', NOW())
-            ),
-            hourly_uptime AS (
-                SELECT
-                    date_trunc('hour', timestamp AT TIME ZONE 'America/New_York') as hour,
-                    COUNT(*) as total_checks,
-                    SUM(CASE WHEN is_up = 1 THEN 1 ELSE 0 END) as up_checks
-                FROM service_uptime_checks
-                WHERE service_name = 'gex-ingestion'
-                  AND timestamp > NOW() - INTERVAL '48 hours'
-                GROUP BY date_trunc('hour', timestamp AT TIME ZONE 'America/New_York')
-            )
-            SELECT
-                hs.hour_bucket as hour,
-                COALESCE(hu.up_checks, 0) as up_checks,
-                COALESCE(hu.total_checks, 0) as total_checks,
-                CASE
-                    WHEN COALESCE(hu.total_checks, 0) = 0 THEN 0
-                    ELSE ROUND((COALESCE(hu.up_checks, 0)::numeric / hu.total_checks * 100), 1)
-                END as uptime_percent
-            FROM hour_series hs
-            LEFT JOIN hourly_uptime hu ON hs.hour_bucket = hu.hour
-            ORDER BY hs.hour_bucket ASC
-        """)
-
-        rows = cursor.fetchall()
-        cursor.close()
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
 
-        eastern = pytz.timezone('America/New_York')
-        result = []
-        for row in rows:
-            ts = row['hour']
-            if ts.tzinfo is None:
-                ts = eastern.localize(ts)
-            else:
-                ts = ts.astimezone(eastern)
+            body = _fetch_json(cursor, UPTIME_HISTORY_QUERY)
 
-            result.append({
-                'timestamp': ts.isoformat(),
-                'uptime_percent': float(row['uptime_percent'] or 0),
-                'up_checks': int(row['up_checks'] or 0),
-                'total_checks': int(row['total_checks'] or 0)
-            })
-
-        return jsonify(result)
+        return Response(body, mimetype='application/json')
 
     except Exception as e:
         print(f"Error in uptime-history: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
+
+@app.route('/api/bootstrap')
+def get_bootstrap():
+    """Get the current metrics and the chart history in one response
+
+    The dashboard polls this instead of /api/metrics and /api/history
+    separately. Both payloads are spliced in as the bytes their own caches
+    already hold, so nothing is parsed or re-serialized. A failed history
+    query leaves 'history' null rather than failing the metrics with it.
+    """
+    try:
+        metrics, _ = _load_metrics()
+    except FileNotFoundError:
+        metrics = orjson.dumps(_unavailable_metrics('Metrics file not found'), default=_orjson_default)
+    except Exception as e:
+        print(f"Error reading metrics file: {e}")
+        traceback.print_exc()
+        metrics = orjson.dumps(_unavailable_metrics(str(e)), default=_orjson_default)
+
+    history = cached_body(get_history) or b'null'
+    return Response(b'{"metrics":' + metrics + b',"history":' + history + b'}',
+                    mimetype='application/json')
 
 @app.route('/logo')
 def get_logo():
     try:
-        return send_from_directory('/opt/zerogex/monitoring', 'Dark_Full.png')
+        return serve_static(DASHBOARD_DIR, 'Dark_Full.png', 'image/png')
     except Exception as e:
         print(f"Error serving logo: {e}")
         return jsonify({'error': str(e)}), 500
 
+# Local development only; the service runs under gunicorn (gunicorn.conf.py)
 if __name__ == '__main__':
     print("Starting Flask app on port 8080...")
     print(f"Dashboard directory: {DASHBOARD_DIR}")
@@ -427,4 +738,5 @@ if __name__ == '__main__':
     # Initialize connection pool on startup
     init_db_pool()
 
-    app.run(host='0.0.0.0', port=8080, debug=False, threaded=True)
+    # The Werkzeug debugger and reloader only when asked for explicitly
+    app.run(host='0.0.0.0', port=8080, debug=os.environ.get('FLASK_DEBUG') == '1', threaded=True)
@@ -0,0 +1,35 @@
+"""
+gunicorn settings for the ZeroGEX monitoring dashboard
+
+Loaded by gex-dashboard.service with --config.
+"""
+
+bind = '0.0.0.0:8080'
+
+# gevent workers: every request is a greenlet that yields while waiting on
+# PostgreSQL or the network, so a slow query no longer ties up a thread.
+# Database work is still bounded by the per-worker connection pool.
+workers = 2
+worker_class = 'gevent'
+worker_connections = 1000
+
+# HTTP keep-alive so the polling browser reuses one connection
+keepalive = 75
+
+# Not preloaded: the gevent worker monkey-patches the standard library
+# before importing the app, which has to happen before the app's locks and
+# pool exist
+
+
+def post_worker_init(worker):
+    """Make psycopg2 cooperative and open the worker's database pool
+
+    Runs after the worker has patched the standard library and loaded the
+    app. libpq waits then yield to other greenlets instead of blocking the
+    whole worker, and connecting here keeps that cost off the first request.
+    """
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+
+    from dashboard import init_db_pool
+    init_db_pool()
@@ -0,0 +1,22 @@
+"""
+Regular-session market hours for the monitor and its debug script
+"""
+
+from datetime import datetime
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+# Built once; zoneinfo reads the system tz database, so no pytz needed
+EASTERN = ZoneInfo('America/New_York')
+
+# Session bounds as minutes after midnight, Eastern
+OPEN_MINUTE = 9 * 60 + 30
+CLOSE_MINUTE = 16 * 60
+
+
+def is_market_open(now_et: Optional[datetime] = None) -> bool:
+    """Whether now_et (default: now) is within the 9:30-16:00 ET weekday session"""
+    if now_et is None:
+        now_et = datetime.now(EASTERN)
+    # Monday = 0, Friday = 4
+    return now_et.weekday() < 5 and OPEN_MINUTE <= now_et.hour * 60 + now_et.minute < CLOSE_MINUTE
@@ -8,36 +8,292 @@ import os
 import sys
 import time
 import json
-import psutil
+import random
+import atexit
+import signal
+import select
+import shutil
 import subprocess
+import importlib.util
 from datetime import datetime, timedelta, timezone
-import pytz
 from pathlib import Path
 from typing import Dict, List, Optional
 import threading
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+
+from market_hours import is_market_open as market_is_open
+
+# Try to import optional dependencies. psycopg2 is only looked up here and
+# imported by _psycopg2() once a collector has a database to talk to.
+HAS_PSYCOPG2 = importlib.util.find_spec('psycopg2') is not None
 
-# Try to import optional dependencies
 try:
-    import psycopg2
-    from psycopg2.extras import RealDictCursor
-    HAS_PSYCOPG2 = True
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from systemd import journal
+    HAS_SYSTEMD_JOURNAL = True
 except ImportError:
-    HAS_PSYCOPG2 = False
+    HAS_SYSTEMD_JOURNAL = False
+
+
+@lru_cache(maxsize=1)
+def _psutil():
+    """Import psutil on first use, so --help and exporter-only use skip it"""
+    import psutil
+    return psutil
+
+
+@lru_cache(maxsize=1)
+def _psycopg2():
+    """Import psycopg2 with the extras and pool submodules on first use"""
+    import psycopg2
+    import psycopg2.extras
+    import psycopg2.pool
+    return psycopg2
+
+
+# Most recent errors reported per service
+LOG_ERROR_LIMIT = 10
+
+# Disk usage changes slowly, so it is sampled at most this often
+DISK_CACHE_SECONDS = 30
+
+# systemctl and journalctl output is reused for this long between cycles
+SUBPROCESS_CACHE_SECONDS = 15
+
+MONITORED_SERVICES = ['gex-ingestion', 'gex-scheduler', 'postgresql', 'fail2ban']
+
+# Snapshots kept in the uniform sample of the whole run (see
+# MonitoringCollector.sample_snapshot)
+RESERVOIR_SIZE = 2048
+
+# Uptime checks and metric snapshots are buffered and written together once
+# this many cycles are waiting or the oldest has waited this long
+HISTORY_FLUSH_ROWS = 60
+HISTORY_FLUSH_SECONDS = 300
+
+# The latest ingestion metric is only recomputed after an ingestion_update
+# notification (config/performance_indexes.sql), or at least this often so
+# it still ages out of its one-hour window once ingestion stops
+INGESTION_METRIC_MAX_AGE = 300
+
+# Every database figure in one statement, so a collection cycle pays a
+# single round trip. The latest SPY quote and ingestion metric come back as
+# JSON objects (NULL when there are none) and the row lists as JSON arrays
+# built by json_agg, which psycopg2 decodes in one pass instead of building
+# a dict per row. The histories read the 5-minute bar and hourly ingestion
+# continuous aggregates (config/performance_indexes.sql) rather than raw rows.
+# {ingestion_metric} is filled in below, with or without the aggregate.
+DATABASE_SUMMARY_SQL = """
+    SELECT
+        q.total_rows,
+        q.recent_10min,
+        q.recent_1hour,
+        q.latest_timestamp,
+        g.gex_count,
+        g.latest_gex,
+        pg_size_pretty(pg_database_size('gex_db')) as db_size,
+        (
+            SELECT COUNT(*)
+            FROM pg_stat_activity
+            WHERE datname = 'gex_db'
+        ) as active_connections,
+        (
+            SELECT row_to_json(u)
+            FROM (
+                SELECT symbol, close as price, total_volume as volume, timestamp
+                FROM underlying_quotes
+                ORDER BY timestamp DESC
+                LIMIT 1
+            ) u
+        ) as spy_quote,
+        ({ingestion_metric}) as ingestion_metric,
+        (
+            SELECT json_build_object(
+                'up_checks', COUNT(*) FILTER (WHERE is_up = 1),
+                'total_checks', COUNT(*)
+            )
+            FROM service_uptime_checks
+            WHERE service_name = 'gex-ingestion'
+              AND timestamp >= date_trunc('hour', NOW())
+        ) as uptime_current_hour,
+        (
+            SELECT COALESCE(json_agg(o ORDER BY o.timestamp DESC), '[]')
+            FROM (
+                SELECT symbol, strike, expiration, dte, option_type, last,
+                       bid, ask, mid, volume, open_interest, implied_vol,
+                       delta, gamma, theta, vega, last_updated as timestamp
+                FROM options_quotes
+                ORDER BY last_updated DESC
+                LIMIT 50
+            ) o
+        ) as recent_options,
+        (
+            SELECT COALESCE(json_agg(h ORDER BY h.timestamp), '[]')
+            FROM (
+                SELECT bucket - INTERVAL '1 minute' as timestamp, symbol, close as price, volume
+                FROM underlying_5min_bars
+                WHERE bucket > NOW() - INTERVAL '7 days'
+            ) h
+        ) as underlying_history,
+        (
+            SELECT COALESCE(json_agg(m ORDER BY m.timestamp), '[]')
+            FROM (
+                SELECT bucket as timestamp, records_ingested, error_count
+                FROM ingestion_hourly
+                WHERE bucket > NOW() - INTERVAL '48 hours'
+            ) m
+        ) as ingestion_history
+    FROM (
+        SELECT
+            COUNT(*) as total_rows,
+            COUNT(*) FILTER (WHERE last_updated > NOW() - INTERVAL '10 minutes') as recent_10min,
+            COUNT(*) FILTER (WHERE last_updated > NOW() - INTERVAL '1 hour') as recent_1hour,
+            MAX(last_updated) as latest_timestamp
+        FROM options_quotes
+    ) q
+    CROSS JOIN (
+        SELECT COUNT(*) as gex_count, MAX(timestamp) as latest_gex
+        FROM gex_metrics
+    ) g
+"""
+
+INGESTION_METRIC_SQL = """
+            SELECT row_to_json(i)
+            FROM (
+                SELECT
+                    MAX(timestamp) as timestamp,
+                    source,
+                    symbol,
+                    SUM(records_ingested) as records_ingested,
+                    SUM(error_count) as error_count,
+                    AVG(processing_time_ms)::BIGINT as processing_time_ms,
+                    SUM(heartbeat_count) as heartbeat_count,
+                    MAX(last_heartbeat) as last_heartbeat
+                FROM ingestion_metrics
+                WHERE timestamp > NOW() - INTERVAL '1 hour'
+                GROUP BY source, symbol
+                ORDER BY MAX(timestamp) DESC
+                LIMIT 1
+            ) i
+"""
+
+# The summary with the ingestion aggregate, and without it for cycles that
+# reuse the last result
+DATABASE_SUMMARY_SQL_FULL = DATABASE_SUMMARY_SQL.format(ingestion_metric=INGESTION_METRIC_SQL)
+DATABASE_SUMMARY_SQL_CACHED_INGESTION = DATABASE_SUMMARY_SQL.format(ingestion_metric='NULL')
+
+@dataclass(slots=True)
+class MetricSnapshot:
+    """The headline numbers of one collection cycle, kept for history"""
+    timestamp: float
+    cpu_percent: float
+    memory_percent: float
+    disk_percent: float
+    quotes_recent_10min: Optional[int]
+    records_ingested: Optional[int]
+
+    def as_row(self) -> tuple:
+        """Column values for a monitor_snapshots insert"""
+        return (
+            datetime.fromtimestamp(self.timestamp, timezone.utc),
+            self.cpu_percent,
+            self.memory_percent,
+            self.disk_percent,
+            self.quotes_recent_10min,
+            self.records_ingested,
+        )
+
+    @classmethod
+    def from_metrics(cls, metrics: Dict) -> 'MetricSnapshot':
+        """Take the snapshot fields from a collect_all_metrics() result"""
+        system = metrics['system']
+        database = metrics.get('database') or {}
+        ingestion = database.get('ingestion_metric') or {}
+        return cls(
+            timestamp=time.time(),
+            cpu_percent=system['cpu_percent'],
+            memory_percent=system['memory_percent'],
+            disk_percent=system['disk_percent'],
+            quotes_recent_10min=database.get('quotes_recent_10min'),
+            records_ingested=ingestion.get('records_ingested'),
+        )
 
 class MonitoringCollector:
     """Collects system and application metrics"""
 
     def __init__(self, db_config: Optional[Dict] = None):
         self.db_config = db_config
+        # MetricSnapshots rather than full metrics dicts, which carry the
+        # option and price history lists
         self.metrics_history = deque(maxlen=1440)  # 24 hours at 1-min intervals
+        # Uniform sample of every snapshot since start, for long-range views;
+        # _seen counts all the snapshots offered to it
+        self._reservoir: List[MetricSnapshot] = []
+        self._seen = 0
         self.alerts = []
+        # (sampled_at, usage) from the last disk_usage() call
+        self._disk_cache = (0, None)
+        # key -> (fetched_at, value) for the systemctl and journalctl results
+        self._subprocess_cache = {}
+        # (timestamp, service_name, is_up) and monitor_snapshots rows not yet
+        # written, and when the oldest of them was taken
+        self._uptime_buffer = []
+        self._snapshot_buffer = []
+        self._buffered_at = None
+        atexit.register(self.flush_history)
+        # service -> (journal.Reader, deque of (timestamp, line)), kept open
+        # so each read only picks up entries added since the last one
+        self._journal_readers = {}
+        # Connections are kept across cycles; created on first use
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # Last ingestion metric, when it was computed, and whether an
+        # ingestion_update has arrived since. Recomputed every cycle unless
+        # the listener thread is connected.
+        self._ingestion_metric = None
+        self._ingestion_fetched_at = 0
+        self._ingestion_dirty = True
+        self._ingestion_listening = False
+        # Messages written to stderr so far; the dashboard redraws in full
+        # when this changes, since they scroll its frame
+        self.messages_written = 0
+        if HAS_PSYCOPG2 and self.db_config:
+            # Imported here, before the listener and executor threads use it
+            _psycopg2()
+            threading.Thread(target=self._listen_ingestion_updates,
+                             name='ingestion-listener', daemon=True).start()
+        # The collectors mostly wait on syscalls, subprocesses and PostgreSQL,
+        # so each cycle runs them side by side
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='metrics')
+
+        # The first non-blocking cpu_percent() call only arms the counters;
+        # later calls report usage since the previous one
+        _psutil().cpu_percent(interval=None)
 
     def get_system_metrics(self) -> Dict:
-        """Collect system-level metrics"""
-        cpu_percent = psutil.cpu_percent(interval=1)
+        """Collect system-level metrics
+
+        CPU usage is averaged over the time since the previous collection
+        rather than sampled for a blocking second.
+        """
+        psutil = _psutil()
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+
+        sampled_at, disk = self._disk_cache
+        now = time.monotonic()
+        if disk is None or now - sampled_at >= DISK_CACHE_SECONDS:
+            disk = psutil.disk_usage('/')
+            self._disk_cache = (now, disk)
 
         return {
             'timestamp': datetime.now(timezone.utc).isoformat(),
@@ -50,159 +306,177 @@ class MonitoringCollector:
             'disk_total_gb': disk.total / (1024**3),
         }
 
+    def _cached(self, key, fetch):
+        """Return fetch()'s value, reusing it for SUBPROCESS_CACHE_SECONDS"""
+        now = time.monotonic()
+        cached = self._subprocess_cache.get(key)
+        if cached is None or now - cached[0] >= SUBPROCESS_CACHE_SECONDS:
+            cached = (now, fetch())
+            self._subprocess_cache[key] = cached
+        return cached[1]
+
     def get_service_status(self) -> Dict:
         """Check systemd service status"""
-        services = ['gex-ingestion', 'gex-scheduler', 'postgresql', 'fail2ban']
-        status = {}
+        return self._cached('services', self._fetch_service_status)
 
-        for service in services:
-            try:
-                result = subprocess.run(
-                    ['systemctl', 'is-active', service],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                status[service] = result.stdout.strip()
-            except Exception as e:
-                status[service] = f'error: {str(e)}'
+    def _fetch_service_status(self) -> Dict:
+        """Query every monitored unit with a single systemctl call
 
-        return status
+        systemctl prints one state per unit, in the order given.
+        """
+        try:
+            result = subprocess.run(
+                ['systemctl', 'is-active', *MONITORED_SERVICES],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+            states = result.stdout.split()
+            if len(states) != len(MONITORED_SERVICES):
+                raise RuntimeError(result.stderr.strip() or 'unexpected systemctl output')
+            return dict(zip(MONITORED_SERVICES, states))
+        except Exception as e:
+            return {service: f'error: {str(e)}' for service in MONITORED_SERVICES}
+
+    def _report(self, message: str):
+        """Write an error to stderr, out of the dashboard's stdout frame"""
+        print(message, file=sys.stderr, flush=True)
+        self.messages_written += 1
+
+    @contextmanager
+    def _db_cursor(self, cursor_factory=None, autocommit=True):
+        """Borrow a pooled connection and yield a cursor on it
+
+        Autocommit spares the read-only queries a BEGIN/COMMIT each. With
+        autocommit off, everything run on the cursor commits together when
+        the block exits, or is rolled back if it raises. If the connection
+        fails, the whole pool is dropped so the next call reconnects
+        instead of reusing dead connections.
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = _psycopg2().pool.ThreadedConnectionPool(1, 2, **self.db_config)
+            pool = self._pool
+
+        conn = pool.getconn()
+        broken = False
+        try:
+            conn.autocommit = autocommit
+            with conn.cursor(cursor_factory=cursor_factory) as cursor:
+                yield cursor
+            if not autocommit:
+                conn.commit()
+        except _psycopg2().OperationalError:
+            broken = True
+            raise
+        except Exception:
+            if not autocommit:
+                conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn, close=broken)
+            if broken:
+                with self._pool_lock:
+                    if self._pool is pool:
+                        self._pool = None
+                        pool.closeall()
 
     def get_database_metrics(self) -> Optional[Dict]:
         """Collect database metrics"""
         if not HAS_PSYCOPG2 or not self.db_config:
             return None
 
-        try:
-            conn = psycopg2.connect(**self.db_config)
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-            # Get recent data counts from options_quotes
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_rows,
-                    SUM(CASE WHEN last_updated > NOW() - INTERVAL '10 minutes' THEN 1 ELSE 0 END) as recent_10min,
-                    SUM(CASE WHEN last_updated > NOW() - INTERVAL '1 hour' THEN 1 ELSE 0 END) as recent_1hour,
-                    MAX(last_updated) as latest_timestamp
-                FROM options_quotes;
-            """)
-            quotes_data = cursor.fetchone()
-
-            print(f"Database query result - Total: {quotes_data['total_rows'] if quotes_data else 'None'}")
-            print(f"Database query result - Recent 10min: {quotes_data['recent_10min'] if quotes_data else 'None'}")
-            print(f"Database query result - Recent 1hour: {quotes_data['recent_1hour'] if quotes_data else 'None'}")
-
-            # Get GEX calculations
-            cursor.execute("""
-                SELECT COUNT(*) as gex_count, MAX(timestamp) as latest_gex
-                FROM gex_metrics;
-            """)
-            gex_data = cursor.fetchone()
-
-            # Database size
-            cursor.execute("""
-                SELECT pg_size_pretty(pg_database_size('gex_db')) as db_size;
-            """)
-            size_data = cursor.fetchone()
-
-            # Active connections
-            cursor.execute("""
-                SELECT COUNT(*) as active_connections
-                FROM pg_stat_activity
-                WHERE datname = 'gex_db';
-            """)
-            conn_data = cursor.fetchone()
-
-            # Get most recent underlying quote
-            cursor.execute("""
-                SELECT symbol, close as price, total_volume as volume, timestamp
-                FROM underlying_quotes
-                ORDER BY timestamp DESC
-                LIMIT 1;
-            """)
-            underlying_quote = cursor.fetchone()
-
-            # Get 50 most recent option quotes
-            cursor.execute("""
-                SELECT symbol, strike, expiration, dte, option_type, last, 
-                       bid, ask, mid, volume, open_interest, implied_vol, 
-                       delta, gamma, theta, vega, last_updated as timestamp
-                FROM options_quotes
-                ORDER BY last_updated DESC
-                LIMIT 50;
-            """)
-            recent_options = cursor.fetchall()
+        # Cleared before the query, so an update that lands while it runs
+        # still triggers the next recompute
+        refresh_ingestion = (
+            self._ingestion_dirty
+            or not self._ingestion_listening
+            or time.monotonic() - self._ingestion_fetched_at >= INGESTION_METRIC_MAX_AGE
+        )
+        self._ingestion_dirty = False
 
-            # Get underlying price history (all available data)
-            cursor.execute("""
-                SELECT timestamp, symbol, close as price, total_volume as volume
-                FROM underlying_quotes
-                ORDER BY timestamp ASC;
-            """)
-            underlying_history_raw = cursor.fetchall()
-            underlying_history = [dict(row) for row in underlying_history_raw] if underlying_history_raw else []
-
-            # Get ingestion metrics history (last 48 hours)
-            cursor.execute("""
-                SELECT timestamp, records_ingested, error_count
-                FROM ingestion_metrics
-                WHERE timestamp > NOW() - INTERVAL '48 hours'
-                ORDER BY timestamp ASC;
-            """)
-            ingestion_history_raw = cursor.fetchall()
-            ingestion_history = [dict(row) for row in ingestion_history_raw] if ingestion_history_raw else []
-
-            # Get most recent ingestion metrics
-            cursor.execute("""
-                SELECT
-                    MAX(timestamp) as timestamp,
-                    source,
-                    symbol,
-                    SUM(records_ingested) as records_ingested,
-                    SUM(error_count) as error_count,
-                    AVG(processing_time_ms)::BIGINT as processing_time_ms,
-                    SUM(heartbeat_count) as heartbeat_count,
-                    MAX(last_heartbeat) as last_heartbeat
-                FROM ingestion_metrics
-                WHERE timestamp > NOW() - INTERVAL '1 hour'
-                GROUP BY source, symbol
-                ORDER BY MAX(timestamp) DESC
-                LIMIT 1;
-            """)
-            ingestion_metric = cursor.fetchone()
+        try:
+            with self._db_cursor(_psycopg2().extras.RealDictCursor) as cursor:
+                cursor.execute(DATABASE_SUMMARY_SQL_FULL if refresh_ingestion
+                               else DATABASE_SUMMARY_SQL_CACHED_INGESTION)
+                summary = cursor.fetchone()
 
-            cursor.close()
-            conn.close()
+            if refresh_ingestion:
+                self._ingestion_metric = summary['ingestion_metric']
+                self._ingestion_fetched_at = time.monotonic()
 
             result = {
-                'quotes_total': quotes_data['total_rows'] if quotes_data else 0,
-                'quotes_recent_10min': quotes_data['recent_10min'] if quotes_data else 0,
-                'quotes_recent_1hour': quotes_data['recent_1hour'] if quotes_data else 0,
-                'latest_quote': quotes_data['latest_timestamp'].isoformat() if quotes_data and quotes_data['latest_timestamp'] else None,
-                'gex_count': gex_data['gex_count'] if gex_data else 0,
-                'latest_gex': gex_data['latest_gex'].isoformat() if gex_data and gex_data['latest_gex'] else None,
-                'db_size': size_data['db_size'] if size_data else 'unknown',
-                'active_connections': conn_data['active_connections'] if conn_data else 0,
-                'spy_quote': dict(underlying_quote) if underlying_quote else None,
-                'underlying_history': underlying_history,
-                'recent_options': [dict(row) for row in recent_options] if recent_options else [],
-                'ingestion_metric': dict(ingestion_metric) if ingestion_metric else None,
-                'ingestion_history': ingestion_history,
+                'quotes_total': summary['total_rows'],
+                'quotes_recent_10min': summary['recent_10min'],
+                'quotes_recent_1hour': summary['recent_1hour'],
+                'latest_quote': summary['latest_timestamp'].isoformat() if summary['latest_timestamp'] else None,
+                'gex_count': summary['gex_count'],
+                'latest_gex': summary['latest_gex'].isoformat() if summary['latest_gex'] else None,
+                'db_size': summary['db_size'],
+                'active_connections': summary['active_connections'],
+                'spy_quote': summary['spy_quote'],
+                'underlying_history': summary['underlying_history'],
+                'recent_options': summary['recent_options'],
+                'ingestion_metric': self._ingestion_metric,
+                'ingestion_history': summary['ingestion_history'],
+                'uptime_current_hour': summary['uptime_current_hour'],
             }
-
-            print(f"Returning database metrics with quotes_recent_10min={result['quotes_recent_10min']}")
             return result
 
         except Exception as e:
-            print(f"Error getting database metrics: {e}")
-            import traceback
-            traceback.print_exc()
+            if refresh_ingestion:
+                self._ingestion_dirty = True
+            self._report(f"Error getting database metrics: {e}")
             return {'error': str(e)}
 
+    def _listen_ingestion_updates(self):
+        """Mark the ingestion metric stale on each ingestion_update notification
+
+        Runs on its own thread with a dedicated connection, since LISTEN
+        needs a session that outlives any one query. Reconnects after a
+        failure; until then the metric is recomputed every cycle.
+        """
+        while True:
+            conn = None
+            try:
+                conn = _psycopg2().connect(**self.db_config)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute("LISTEN ingestion_update")
+                # Anything inserted before LISTEN was not announced
+                self._ingestion_dirty = True
+                self._ingestion_listening = True
+
+                while True:
+                    select.select([conn], [], [], 60)
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        self._ingestion_dirty = True
+
+            except Exception as e:
+                self._report(f"Ingestion update listener disconnected: {e}")
+            finally:
+                self._ingestion_listening = False
+                if conn is not None:
+                    conn.close()
+            time.sleep(30)
+
     def get_log_errors(self, service: str, minutes: int = 10) -> List[str]:
         """Get recent errors from service logs"""
+        return self._cached(('errors', service, minutes),
+                            lambda: self._fetch_log_errors(service, minutes))
+
+    def _fetch_log_errors(self, service: str, minutes: int) -> List[str]:
+        """Read a service's recent error-level journal entries
+
+        Reads the journal in-process when python-systemd is installed and
+        falls back to running journalctl otherwise.
+        """
         try:
+            if HAS_SYSTEMD_JOURNAL:
+                return self._read_journal_errors(service, minutes)
+
             result = subprocess.run(
                 ['journalctl', '-u', service, '--since', f'{minutes} minutes ago', '-p', 'err'],
                 capture_output=True,
@@ -210,10 +484,36 @@ class MonitoringCollector:
                 timeout=10
             )
             lines = result.stdout.strip().split('\n')
-            return [line for line in lines if line][-10:]  # Last 10 errors
+            return [line for line in lines if line][-LOG_ERROR_LIMIT:]
         except Exception as e:
             return [f'Error reading logs: {str(e)}']
 
+    def _read_journal_errors(self, service: str, minutes: int) -> List[str]:
+        """Read new error-level entries for service from a persistent journal reader
+
+        Lines are formatted like journalctl's default output.
+        """
+        if service not in self._journal_readers:
+            reader = journal.Reader()
+            reader.log_level(journal.LOG_ERR)
+            reader.add_match(_SYSTEMD_UNIT=f'{service}.service')
+            reader.seek_realtime(time.time() - minutes * 60)
+            self._journal_readers[service] = (reader, deque(maxlen=LOG_ERROR_LIMIT))
+        reader, recent = self._journal_readers[service]
+
+        # Picks up rotated and newly created journal files
+        reader.process()
+        for entry in reader:
+            logged_at = entry['__REALTIME_TIMESTAMP']
+            recent.append((logged_at, (
+                f"{logged_at:%b %d %H:%M:%S} {entry.get('_HOSTNAME', '')} "
+                f"{entry.get('SYSLOG_IDENTIFIER', service)}[{entry.get('_PID', '')}]: "
+                f"{entry.get('MESSAGE', '')}"
+            )))
+
+        cutoff = datetime.now() - timedelta(minutes=minutes)
+        return [line for logged_at, line in recent if logged_at >= cutoff]
+
     def check_alerts(self, metrics: Dict) -> List[Dict]:
         """Check for alert conditions"""
         alerts = []
@@ -221,19 +521,12 @@ class MonitoringCollector:
 
         # Check if market is open (9:30 AM - 4:00 PM ET, Mon-Fri)
         try:
-            eastern = pytz.timezone('US/Eastern')
-            now_et = datetime.now(eastern)
-
-            is_market_open = False
-            if now_et.weekday() < 5:  # Monday = 0, Friday = 4
-                market_open = now_et.replace(hour=9, minute=30, second=0, microsecond=0)
-                market_close = now_et.replace(hour=16, minute=0, second=0, microsecond=0)
-                is_market_open = market_open <= now_et <= market_close
+            is_market_open = market_is_open()
 
             # Store market status in metrics
             metrics['market_open'] = is_market_open
         except Exception as e:
-            print(f"Error calculating market hours: {e}")
+            self._report(f"Error calculating market hours: {e}")
             metrics['market_open'] = False
             is_market_open = False
 
@@ -317,104 +610,204 @@ class MonitoringCollector:
         """Collect all metrics"""
         now_utc = datetime.now(timezone.utc)
 
+        system = self._executor.submit(self.get_system_metrics)
+        services = self._executor.submit(self.get_service_status)
+        database = self._executor.submit(self.get_database_metrics)
+        ingestion_errors = self._executor.submit(self.get_log_errors, 'gex-ingestion', 10)
+        scheduler_errors = self._executor.submit(self.get_log_errors, 'gex-scheduler', 10)
+
         metrics = {
             'timestamp': now_utc.isoformat(),
-            'system': self.get_system_metrics(),
-            'services': self.get_service_status(),
-            'database': self.get_database_metrics(),
+            'system': system.result(),
+            'services': services.result(),
+            'database': database.result(),
         }
 
         # Add service error logs
         metrics['errors'] = {
-            'ingestion': self.get_log_errors('gex-ingestion', 10),
-            'scheduler': self.get_log_errors('gex-scheduler', 10),
+            'ingestion': ingestion_errors.result(),
+            'scheduler': scheduler_errors.result(),
         }
 
         # Check for alerts AFTER we have database metrics
         alerts = self.check_alerts(metrics)
         metrics['alerts'] = alerts
 
-        # Debug logging
-        if metrics.get('database') and not metrics['database'].get('error'):
-            print(f"Recent quotes (10min): {metrics['database'].get('quotes_recent_10min', 0)}")
-            print(f"Market open: {metrics.get('market_open', False)}")
-            print(f"Number of alerts: {len(alerts)}")
+        # Calculate uptime percentage for current hour, before this cycle's
+        # check is buffered (the database summary did not see it either)
+        metrics['uptime_current_hour'] = self.calculate_uptime_current_hour(metrics['database'])
 
         # Track service uptime
-        self.track_service_uptime()
+        self.track_service_uptime(metrics['services'])
 
-        # Calculate uptime percentage for current hour
-        metrics['uptime_current_hour'] = self.calculate_uptime_current_hour()
-
-        # Store in history
-        self.metrics_history.append(metrics)
+        # Store in history: the deque for this process, monitor_snapshots
+        # for everything older or elsewhere
+        snapshot = MetricSnapshot.from_metrics(metrics)
+        self.metrics_history.append(snapshot)
+        self.sample_snapshot(snapshot)
+        self.record_snapshot(snapshot)
 
         return metrics
 
-    def track_service_uptime(self):
-        """Track service uptime status every check"""
-        if not HAS_PSYCOPG2 or not self.db_config:
-            return
+    def sample_snapshot(self, snapshot: MetricSnapshot):
+        """Offer a snapshot to the whole-run reservoir
 
-        try:
-            # Create temporary database connection
-            conn = psycopg2.connect(**self.db_config)
-            cursor = conn.cursor()
+        Reservoir sampling (Vitter's Algorithm R): every snapshot seen so far
+        has the same RESERVOIR_SIZE / _seen chance of being held, so memory
+        stays bounded however long the daemon runs.
+        """
+        self._seen += 1
+        if len(self._reservoir) < RESERVOIR_SIZE:
+            self._reservoir.append(snapshot)
+        else:
+            j = random.randrange(self._seen)
+            if j < RESERVOIR_SIZE:
+                self._reservoir[j] = snapshot
 
-            # Check if gex-ingestion is running
-            result = subprocess.run(
-                ['systemctl', 'is-active', 'gex-ingestion'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+    def long_run_sample(self) -> List[MetricSnapshot]:
+        """The sampled snapshots in time order, covering the whole run
 
-            is_up = 1 if result.stdout.strip() == 'active' else 0
+        Use metrics_history for the last 24 hours at full resolution.
+        """
+        return sorted(self._reservoir, key=lambda snap: snap.timestamp)
 
-            insert_query = """
-                INSERT INTO service_uptime_checks
-                (timestamp, service_name, is_up)
-                VALUES (%s, %s, %s)
-            """
+    def track_service_uptime(self, services: Dict):
+        """Record whether gex-ingestion was up, from this cycle's service status
 
-            cursor.execute(insert_query, (
-                datetime.now(timezone.utc),
-                'gex-ingestion',
-                is_up
-            ))
+        Checks are buffered and written in batches (see flush_history).
+        """
+        if not HAS_PSYCOPG2 or not self.db_config:
+            return
 
-            conn.commit()
-            cursor.close()
-            conn.close()
+        is_up = 1 if services.get('gex-ingestion') == 'active' else 0
+        self._buffer_row(self._uptime_buffer, (datetime.now(timezone.utc), 'gex-ingestion', is_up))
 
-        except Exception as e:
-            print(f"Failed to track service uptime: {e}")
+    def record_snapshot(self, snapshot: MetricSnapshot):
+        """Queue a snapshot for the monitor_snapshots hypertable
+
+        Written in the same batches as the uptime checks; retention and
+        compression are left to TimescaleDB.
+        """
+        if not HAS_PSYCOPG2 or not self.db_config:
+            return
 
-    def calculate_uptime_current_hour(self) -> Dict:
-        """Calculate uptime percentage for the current hour"""
-        now = datetime.now()
-        hour_start = now.replace(minute=0, second=0, microsecond=0)
-        minutes_elapsed = (now - hour_start).seconds / 60
+        self._buffer_row(self._snapshot_buffer, snapshot.as_row())
+        if (len(self._snapshot_buffer) >= HISTORY_FLUSH_ROWS
+                or time.monotonic() - self._buffered_at >= HISTORY_FLUSH_SECONDS):
+            self.flush_history()
+
+    def _buffer_row(self, buffer: List, row: tuple):
+        """Append a row to a write buffer, noting when buffering started"""
+        if not self._uptime_buffer and not self._snapshot_buffer:
+            self._buffered_at = time.monotonic()
+        buffer.append(row)
+
+    def flush_history(self):
+        """Write the buffered uptime checks and snapshots, one transaction each
+
+        execute_values sends a backlog as several pages; they commit
+        together, so a failed flush writes nothing and its rows are all
+        kept for the next attempt, up to ten batches' worth. ON CONFLICT
+        DO NOTHING covers a commit whose acknowledgement was lost. Each
+        buffer is cleared as soon as its own transaction commits, so a
+        failure on one table does not write the other's rows twice. Also
+        runs at exit so a stopped daemon does not lose its last cycles.
+        """
+        for table, columns, buffer in (
+            ('service_uptime_checks', 'timestamp, service_name, is_up', self._uptime_buffer),
+            ('monitor_snapshots', 'timestamp, cpu_percent, memory_percent, disk_percent, '
+                                  'quotes_recent_10min, records_ingested', self._snapshot_buffer),
+        ):
+            if not buffer:
+                continue
+
+            try:
+                with self._db_cursor(autocommit=False) as cursor:
+                    _psycopg2().extras.execute_values(
+                        cursor,
+                        f"INSERT INTO {table} ({columns}) VALUES %s ON CONFLICT DO NOTHING",
+                        buffer,
+                        page_size=200,
+                    )
+                buffer.clear()
 
-        uptime_pct = (minutes_elapsed / 60) * 100 if minutes_elapsed > 0 else 0
+            except Exception as e:
+                self._report(f"Failed to write {table}: {e}")
+                # Bound the backlog while the database is unreachable
+                del buffer[:-HISTORY_FLUSH_ROWS * 10]
+
+    def calculate_uptime_current_hour(self, database: Optional[Dict]) -> Dict:
+        """Calculate gex-ingestion uptime for the current hour
+
+        Uses the hour's service_uptime_checks counts from the database
+        summary plus the checks still buffered; the percentage is None when
+        there are no checks yet.
+        """
+        hour_start = datetime.now().replace(minute=0, second=0, microsecond=0)
+        counts = (database or {}).get('uptime_current_hour') or {}
+        up_checks = counts.get('up_checks', 0)
+        total_checks = counts.get('total_checks', 0)
+
+        # The hour starts at the same instant in UTC and local time
+        utc_hour_start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        for checked_at, _, is_up in self._uptime_buffer:
+            if checked_at >= utc_hour_start:
+                up_checks += is_up
+                total_checks += 1
 
         return {
             'hour_label': hour_start.strftime('%m/%d %H:00'),
-            'uptime_percent': min(uptime_pct, 100),
-            'minutes_up': minutes_elapsed
+            'uptime_percent': up_checks / total_checks * 100 if total_checks else None,
+            'up_checks': up_checks,
+            'total_checks': total_checks,
         }
 
 
+def interval_ticks(interval: float):
+    """Yield every interval seconds on a fixed monotonic grid
+
+    Each sleep only covers what is left of the interval, so the time spent
+    collecting does not push later ticks back. Ticks missed by an overrun
+    are skipped rather than run back to back.
+    """
+    start = time.monotonic()
+    n = 0
+    while True:
+        yield
+        n += 1
+        delay = start + n * interval - time.monotonic()
+        if delay < 0:
+            n = int((time.monotonic() - start) / interval) + 1
+            delay = start + n * interval - time.monotonic()
+        time.sleep(delay)
+
+
+# Every possible progress bar, indexed by filled cells, for each color
+BAR_WIDTH = 40
+
+def _bar_table(color: str) -> List[str]:
+    """Build the BAR_WIDTH + 1 bars for one color"""
+    return [f"{color}{'█' * i}{'░' * (BAR_WIDTH - i)}\033[0m" for i in range(BAR_WIDTH + 1)]
+
+_BARS_GREEN = _bar_table("\033[92m")
+_BARS_YELLOW = _bar_table("\033[93m")
+_BARS_RED = _bar_table("\033[91m")
+
+
 class MonitoringDashboard:
     """Terminal-based monitoring dashboard"""
 
     def __init__(self, collector: MonitoringCollector):
         self.collector = collector
         self.running = False
+        # Lines of the frame currently on screen; None until the first draw
+        self._last_frame = None
+        # collector.messages_written when that frame was drawn
+        self._messages_seen = 0
 
     def clear_screen(self):
-        """Clear terminal screen"""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        """Clear terminal screen and move the cursor home"""
+        sys.stdout.write("\033[2J\033[H")
 
     def format_uptime(self, seconds: float) -> str:
         """Format uptime as human-readable string"""
@@ -424,96 +817,139 @@ class MonitoringDashboard:
         return f"{days}d {hours}h {minutes}m"
 
     def render_dashboard(self, metrics: Dict):
-        """Render the monitoring dashboard"""
-        self.clear_screen()
+        """Render the monitoring dashboard
+
+        The frame is assembled in memory and written in one call, so the
+        terminal never shows a half-drawn screen. After the first frame only
+        the lines that changed are rewritten, in place.
+        """
+        lines = []
+        out = lines.append
 
         # Header
-        print("=" * 80)
-        print(f"{'ZeroGEX Platform Monitor':^80}")
-        print(f"{'Last Updated: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'):^80}")
-        print("=" * 80)
-        print()
+        out("=" * 80)
+        out(f"{'ZeroGEX Platform Monitor':^80}")
+        out(f"{'Last Updated: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'):^80}")
+        out("=" * 80)
+        out('')
 
         # System Metrics
         sys_metrics = metrics['system']
-        print("┌─ SYSTEM RESOURCES ─────────────────────────────────────────────────────────┐")
-        print(f"│ CPU Usage:    {self._format_bar(sys_metrics['cpu_percent'], 100)} {sys_metrics['cpu_percent']:>5.1f}%  │")
-        print(f"│ Memory:       {self._format_bar(sys_metrics['memory_percent'], 100)} {sys_metrics['memory_percent']:>5.1f}%  │")
-        print(f"│               {sys_metrics['memory_used_gb']:.1f}GB / {sys_metrics['memory_total_gb']:.1f}GB{' ' * 38}│")
-        print(f"│ Disk:         {self._format_bar(sys_metrics['disk_percent'], 100)} {sys_metrics['disk_percent']:>5.1f}%  │")
-        print(f"│               {sys_metrics['disk_used_gb']:.1f}GB / {sys_metrics['disk_total_gb']:.1f}GB{' ' * 38}│")
-        print("└────────────────────────────────────────────────────────────────────────────┘")
-        print()
+        out("┌─ SYSTEM RESOURCES ─────────────────────────────────────────────────────────┐")
+        out(f"│ CPU Usage:    {self._format_bar(sys_metrics['cpu_percent'], 100)} {sys_metrics['cpu_percent']:>5.1f}%  │")
+        out(f"│ Memory:       {self._format_bar(sys_metrics['memory_percent'], 100)} {sys_metrics['memory_percent']:>5.1f}%  │")
+        out(f"│               {sys_metrics['memory_used_gb']:.1f}GB / {sys_metrics['memory_total_gb']:.1f}GB{' ' * 38}│")
+        out(f"│ Disk:         {self._format_bar(sys_metrics['disk_percent'], 100)} {sys_metrics['disk_percent']:>5.1f}%  │")
+        out(f"│               {sys_metrics['disk_used_gb']:.1f}GB / {sys_metrics['disk_total_gb']:.1f}GB{' ' * 38}│")
+        out("└────────────────────────────────────────────────────────────────────────────┘")
+        out('')
 
         # Services
-        print("┌─ SERVICE STATUS ───────────────────────────────────────────────────────────┐")
+        out("┌─ SERVICE STATUS ───────────────────────────────────────────────────────────┐")
         for service, status in metrics['services'].items():
             status_icon = "●" if status == "active" else "○"
             status_color = "\033[92m" if status == "active" else "\033[91m"
-            print(f"│ {status_color}{status_icon}\033[0m {service:<30} {status:<40}│")
-        print("└────────────────────────────────────────────────────────────────────────────┘")
-        print()
+            out(f"│ {status_color}{status_icon}\033[0m {service:<30} {status:<40}│")
+        out("└────────────────────────────────────────────────────────────────────────────┘")
+        out('')
 
         # Database Metrics
         if metrics.get('database') and not metrics['database'].get('error'):
             db = metrics['database']
-            print("┌─ DATABASE METRICS ─────────────────────────────────────────────────────────┐")
-            print(f"│ Total Quotes:        {db.get('quotes_total', 0):>10,}                                       │")
-            print(f"│ Recent (10 min):     {db.get('quotes_recent_10min', 0):>10,}                                       │")
-            print(f"│ Recent (1 hour):     {db.get('quotes_recent_1hour', 0):>10,}                                       │")
-            print(f"│ GEX Calculations:    {db.get('gex_count', 0):>10,}                                       │")
-            print(f"│ Database Size:       {db.get('db_size', 'unknown'):<63}│")
-            print(f"│ Active Connections:  {db.get('active_connections', 0):>10}                                       │")
+            out("┌─ DATABASE METRICS ─────────────────────────────────────────────────────────┐")
+            out(f"│ Total Quotes:        {db.get('quotes_total', 0):>10,}                                       │")
+            out(f"│ Recent (10 min):     {db.get('quotes_recent_10min', 0):>10,}                                       │")
+            out(f"│ Recent (1 hour):     {db.get('quotes_recent_1hour', 0):>10,}                                       │")
+            out(f"│ GEX Calculations:    {db.get('gex_count', 0):>10,}                                       │")
+            out(f"│ Database Size:       {db.get('db_size', 'unknown'):<63}│")
+            out(f"│ Active Connections:  {db.get('active_connections', 0):>10}                                       │")
 
             latest = db.get('latest_quote')
             if latest:
                 age = (datetime.now() - datetime.fromisoformat(latest)).total_seconds()
-                print(f"│ Latest Data:         {age:.0f}s ago                                            │")
-            print("└────────────────────────────────────────────────────────────────────────────┘")
-            print()
+                out(f"│ Latest Data:         {age:.0f}s ago                                            │")
+            out("└────────────────────────────────────────────────────────────────────────────┘")
+            out('')
 
         # Alerts
         alerts = metrics.get('alerts', [])
         if alerts:
-            print("┌─ ALERTS ───────────────────────────────────────────────────────────────────┐")
+            out("┌─ ALERTS ───────────────────────────────────────────────────────────────────┐")
             for alert in alerts[-5:]:  # Show last 5 alerts
                 level_color = "\033[91m" if alert['level'] == 'critical' else "\033[93m"
                 level_icon = "⚠" if alert['level'] == 'warning' else "✗"
                 msg = alert['message'][:65]
-                print(f"│ {level_color}{level_icon}\033[0m {msg:<72}│")
-            print("└────────────────────────────────────────────────────────────────────────────┘")
-            print()
+                out(f"│ {level_color}{level_icon}\033[0m {msg:<72}│")
+            out("└────────────────────────────────────────────────────────────────────────────┘")
+            out('')
 
         # Footer
-        print("Press Ctrl+C to exit")
-
-    def _format_bar(self, value: float, max_value: float, width: int = 40) -> str:
-        """Format a progress bar"""
-        filled = int((value / max_value) * width)
-        bar = "█" * filled + "░" * (width - filled)
-
-        # Color based on percentage
-        if value >= 90:
-            color = "\033[91m"  # Red
-        elif value >= 80:
-            color = "\033[93m"  # Yellow
+        out("Press Ctrl+C to exit")
+
+        self._repaint(lines)
+
+    def _repaint(self, lines: List[str]):
+        """Draw lines, rewriting only those that differ from the last frame
+
+        Rows are addressed from the top of the screen, so the frame is drawn
+        in full whenever that may no longer hold: the collector wrote to the
+        terminal since the last frame, or the frame is too tall to fit and
+        scrolled.
+        """
+        previous = self._last_frame
+        messages = self.collector.messages_written
+        if (messages != self._messages_seen
+                or len(lines) >= shutil.get_terminal_size().lines):
+            previous = None
+        self._messages_seen = messages
+        if previous is None:
+            self.clear_screen()
+            sys.stdout.write('\n'.join(lines) + '\n')
         else:
-            color = "\033[92m"  # Green
-
-        return f"{color}{bar}\033[0m"
+            # Cursor to row i + 1, write the line, clear whatever was left of
+            # the old one; rows the new frame no longer uses are blanked
+            changes = [
+                f"\033[{i + 1};1H{line}\033[K"
+                for i, line in enumerate(lines)
+                if i >= len(previous) or previous[i] != line
+            ]
+            changes.extend(f"\033[{i + 1};1H\033[K" for i in range(len(lines), len(previous)))
+            changes.append(f"\033[{len(lines) + 1};1H")
+            sys.stdout.write(''.join(changes))
+        sys.stdout.flush()
+        self._last_frame = lines
+
+    def _format_bar(self, value: float, max_value: float) -> str:
+        """Format a progress bar, colored by percentage"""
+        filled = min(max(int((value / max_value) * BAR_WIDTH), 0), BAR_WIDTH)
+        if value >= 90:
+            return _BARS_RED[filled]
+        if value >= 80:
+            return _BARS_YELLOW[filled]
+        return _BARS_GREEN[filled]
 
     def run(self, interval: int = 5):
         """Run the dashboard with auto-refresh"""
         self.running = True
         try:
-            while self.running:
+            for _ in interval_ticks(interval):
+                if not self.running:
+                    break
                 metrics = self.collector.collect_all_metrics()
                 self.render_dashboard(metrics)
-                time.sleep(interval)
         except KeyboardInterrupt:
             print("\n\nMonitoring stopped by user.")
             self.running = False
 
+def _dumps(obj) -> bytes:
+    """Serialize to compact JSON bytes, with orjson when it is installed
+
+    Values JSON has no type for (Decimal, etc.) are written as strings.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, separators=(',', ':'), default=str).encode()
+
 class MetricsExporter:
     """Export metrics to JSON files for external consumption"""
 
@@ -524,25 +960,28 @@ class MetricsExporter:
     def export_metrics(self, metrics: Dict):
         """Export current metrics to JSON with atomic write"""
         import tempfile
-        import shutil
 
         current_file = self.output_dir / "current_metrics.json"
+        # Compact, since the dashboard serves these bytes as-is. History
+        # lives in the monitor_snapshots table rather than a daily log.
+        body = _dumps(metrics)
 
         try:
             # Write to temporary file first
             with tempfile.NamedTemporaryFile(
-                mode='w',
+                mode='wb',
                 dir=self.output_dir,
                 delete=False,
                 suffix='.tmp'
             ) as tmp_file:
-                json.dump(metrics, tmp_file, indent=2, default=str)
+                tmp_file.write(body)
                 tmp_file.flush()
                 os.fsync(tmp_file.fileno())
                 tmp_path = tmp_file.name
 
-            # Atomic rename
-            shutil.move(tmp_path, current_file)
+            # Atomic rename: readers see either the old or the new file,
+            # never a partial write
+            os.replace(tmp_path, current_file)
 
         except Exception as e:
             print(f"Error exporting metrics: {e}")
@@ -553,15 +992,6 @@ class MetricsExporter:
             except:
                 pass
 
-        # Also append to daily log (but don't let it fail the main export)
-        try:
-            date_str = datetime.now().strftime('%Y%m%d')
-            daily_file = self.output_dir / f"metrics_{date_str}.jsonl"
-            with open(daily_file, 'a') as f:
-                f.write(json.dumps(metrics, default=str) + '\n')
-        except Exception as e:
-            print(f"Error appending to daily log: {e}")
-
 
 def load_db_config() -> Optional[Dict]:
     """Load database configuration from ~/.zerogex_db_creds file"""
@@ -611,6 +1041,10 @@ def main():
     # Initialize exporter if requested
     exporter = MetricsExporter(args.export_dir) if args.export else None
 
+    # systemctl stop sends SIGTERM; exit normally so atexit flushes the
+    # buffered uptime checks
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
     if args.daemon:
         print(f"Running monitoring daemon (interval: {args.interval}s)")
         print(f"Metrics export: {'enabled' if args.export else 'disabled'}")
@@ -620,12 +1054,11 @@ def main():
         print()
 
         try:
-            while True:
+            for _ in interval_ticks(args.interval):
                 metrics = collector.collect_all_metrics()
 
                 if exporter:
                     exporter.export_metrics(metrics)
-                time.sleep(args.interval)
         except KeyboardInterrupt:
             print("\nDaemon stopped by user.")
     else:
@@ -9,23 +9,28 @@ Or simply:
     import bootstrap  # Auto-runs setup
 """
 
+import os
 import sys
-from pathlib import Path
+from functools import cache
 
+@cache
 def setup_paths():
     """
     Add project root and src directory to sys.path.
     Can be called from any script regardless of location.
+    Only the first call does any work; later calls return the same paths.
     """
-    # Find the src directory by locating this bootstrap.py file
-    bootstrap_file = Path(__file__).resolve()
-    src_dir = bootstrap_file.parent
-    project_root = src_dir.parent
+    # Find the src directory by locating this bootstrap.py file; plain
+    # string paths, since sys.path wants strings anyway
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(src_dir)
     
     # Add paths if not already there
-    for path in [str(project_root), str(src_dir)]:
-        if path not in sys.path:
+    existing = set(sys.path)
+    for path in [project_root, src_dir]:
+        if path not in existing:
             sys.path.insert(0, path)
+            existing.add(path)
     
     return project_root, src_dir
 
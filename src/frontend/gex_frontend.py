@@ -4,25 +4,134 @@ ZeroGEX Customer Dashboard Backend
 Flask app serving GEX analytics and insights
 """
 
-from flask import Flask, jsonify, send_from_directory
-import json
+from flask import Flask, Response, jsonify, request
+from flask_compress import Compress
+from flask.json.provider import JSONProvider
+from werkzeug.http import generate_etag
+import os
+import select
+import orjson
+from decimal import Decimal
+import gzip
+import hashlib
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
 from pathlib import Path
 import psycopg2
 from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 import traceback
-from datetime import datetime, date, timedelta, time as dt_time
-import pytz
+from datetime import datetime, date, timedelta, timezone, time as dt_time
+from zoneinfo import ZoneInfo
+import textwrap
 import time
-from functools import wraps
+import threading
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+def _orjson_default(obj):
+    """Serialize types orjson does not handle natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson
+
+    orjson encodes straight to UTF-8 bytes and serializes datetimes as
+    ISO 8601 strings, so endpoints can hand it DB rows as-is.
+    """
+    option = orjson.OPT_NAIVE_UTC
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_orjson_default, option=self.option)
+        return self._app.response_class(body, mimetype='application/json')
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+@app.after_request
+def answer_not_modified(response):
+    """Answer a GET whose If-None-Match matches the ETag with an empty 304
+
+    Registered before Compress(app) so that it runs after compression: Flask
+    calls after_request hooks in reverse order. The ETag compared is the one
+    actually sent, which flask-compress suffixes with the encoding
+    ("<hash>:br"), so compressing clients revalidate too.
+    """
+    if (request.method in ('GET', 'HEAD') and response.status_code == 200
+            and 'ETag' in response.headers):
+        response.make_conditional(request)
+    return response
+
+# Dynamic responses are compressed with brotli when the client and the
+# installed packages allow it, gzip otherwise
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip'] if HAS_BROTLI else ['gzip']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_BR_LEVEL'] = 5
+Compress(app)
 DASHBOARD_DIR = Path("/opt/zerogex/frontend/templates")
+STATIC_DIR = Path("/opt/zerogex/frontend/static")
 CREDS_FILE = Path.home() / ".zerogex_db_creds"
-_query_cache = {}
+EASTERN = ZoneInfo('America/New_York')
+UTC = timezone.utc
+# LRU of (expires_at, body, {encoding: compressed body}, etag) keyed by
+# (endpoint, args, kwargs)
+QUERY_CACHE_MAXSIZE = 256
+# Bodies smaller than this are not worth compressing (flask-compress's default)
+GZIP_MIN_SIZE = 500
+INFLIGHT_WAIT_SECONDS = 10
+_query_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_inflight = {}
+
+# Cached endpoints to drop when ingestion announces new data on a channel
+CACHE_INVALIDATION_CHANNELS = {
+    'underlying_bucket_new': ('get_spy_market_history', 'get_spy_48hr_range'),
+}
+_listener_pid = None
+_listener_lock = threading.Lock()
+
+# path -> (mtime_ns, body, etag) for the pages, scripts and images
+_static_cache = {}
 
 # Global connection pool
 db_pool = None
+_pool_lock = threading.Lock()
+_pool_failed_at = None
+POOL_RETRY_SECONDS = 5
+POOL_MAX_CONNECTIONS = 8
+# Request threads and _query_executor workers beyond POOL_MAX_CONNECTIONS
+# queue for a free connection instead of failing with "connection pool
+# exhausted"
+POOL_WAIT_SECONDS = 5
+_pool_slots = threading.BoundedSemaphore(POOL_MAX_CONNECTIONS)
+
+# Most recent SPY quote, shared by the endpoints that need the spot price.
+# Encoded once; psycopg2 accepts bytes queries.
+LATEST_SPY_QUOTE_SQL = textwrap.dedent("""
+    SELECT timestamp, close
+    FROM underlying_quotes
+    WHERE symbol = 'SPY'
+    ORDER BY timestamp DESC
+    LIMIT 1
+""").strip().encode()
+
+# Workers for independent queries issued by a single request
+_query_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='gex-query')
 
 def get_target_expiration():
     """
@@ -36,7 +145,7 @@ def get_target_expiration():
     Returns:
         date: Target expiration date
     """
-    now_et = datetime.now(pytz.timezone('America/New_York'))
+    now_et = datetime.now(EASTERN)
     current_date = now_et.date()
 
     # If after 4:00 PM ET (options expiration time), move to next day
@@ -52,24 +161,42 @@ def get_target_expiration():
 
     return current_date
 
-def load_db_config():
-    """Load database configuration from ~/.zerogex_db_creds"""
+@lru_cache(maxsize=1)
+def _read_creds_file(mtime_ns):
+    """Parse KEY=value lines from the credentials file
+
+    Keyed on the file's mtime so the file is only re-read after it changes.
+    """
+    config = {}
+    with open(CREDS_FILE) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                config[key] = value
+    return config
+
+def load_db_config(direct=False):
+    """Load database configuration from ~/.zerogex_db_creds
+
+    Connections go through PgBouncer when it is installed unless direct is
+    set; LISTEN needs a session of its own on PostgreSQL itself. Only called
+    when the pool or the cache listener connects, never per request, and
+    the parsed file is reused until its mtime changes.
+    """
     try:
-        if not CREDS_FILE.exists():
+        try:
+            mtime_ns = CREDS_FILE.stat().st_mtime_ns
+        except FileNotFoundError:
             print(f"Credentials file not found: {CREDS_FILE}")
             return None
 
-        config = {}
-        with open(CREDS_FILE) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    config[key] = value
-
+        config = _read_creds_file(mtime_ns)
         return {
             'host': config.get('DB_HOST', 'localhost'),
-            'port': int(config.get('DB_PORT', '5432')),
+            # Prefer PgBouncer when step 022 has installed it
+            'port': int(config.get('DB_PORT', '5432') if direct
+                        else config.get('PGBOUNCER_PORT', config.get('DB_PORT', '5432'))),
             'database': config.get('DB_NAME', 'gex_db'),
             'user': config.get('DB_USER', 'gex_user'),
             'password': config.get('DB_PASSWORD', ''),
@@ -80,22 +207,39 @@ def load_db_config():
         return None
 
 def init_db_pool():
-    """Initialize database connection pool"""
-    global db_pool
-    if db_pool is None:
+    """Initialize database connection pool
+
+    Guarded by a lock so concurrent first requests build a single pool.
+    After a failure, attempts are skipped for POOL_RETRY_SECONDS so a
+    database outage does not stall every request on connect_timeout.
+    """
+    global db_pool, _pool_failed_at
+    with _pool_lock:
+        if db_pool is not None:
+            return
+        if _pool_failed_at is not None and time.monotonic() - _pool_failed_at < POOL_RETRY_SECONDS:
+            return
+
         db_config = load_db_config()
-        if db_config:
-            try:
-                db_pool = psycopg2.pool.SimpleConnectionPool(
-                    minconn=1,
-                    maxconn=5,
-                    connect_timeout=3,
-                    **db_config
-                )
-                print("Database connection pool initialized")
-            except Exception as e:
-                print(f"Error creating connection pool: {e}")
-                db_pool = None
+        if not db_config:
+            _pool_failed_at = time.monotonic()
+            return
+
+        try:
+            # Shared by the worker's request threads and query executor;
+            # see POOL_WAIT_SECONDS
+            db_pool = psycopg2.pool.ThreadedConnectionPool(
+                minconn=2,
+                maxconn=POOL_MAX_CONNECTIONS,
+                connect_timeout=3,
+                **db_config
+            )
+            _pool_failed_at = None
+            print("Database connection pool initialized")
+        except Exception as e:
+            print(f"Error creating connection pool: {e}")
+            db_pool = None
+            _pool_failed_at = time.monotonic()
 
 def get_db_connection():
     """Get a connection from the pool"""
@@ -104,9 +248,13 @@ def get_db_connection():
         init_db_pool()
 
     if db_pool:
+        if not _pool_slots.acquire(timeout=POOL_WAIT_SECONDS):
+            print("Timed out waiting for a pooled connection")
+            return None
         try:
             return db_pool.getconn()
         except Exception as e:
+            _pool_slots.release()
             print(f"Error getting connection from pool: {e}")
             return None
     return None
@@ -119,31 +267,230 @@ def return_db_connection(conn):
             db_pool.putconn(conn)
         except Exception as e:
             print(f"Error returning connection to pool: {e}")
+        finally:
+            _pool_slots.release()
+
+@contextmanager
+def db_cursor(name=None):
+    """Borrow a pooled connection and yield a RealDictCursor on it
+
+    A name makes it a server-side cursor, so iterating it fetches rows in
+    batches of cursor.itersize instead of loading the whole result. Yields
+    None when the database is unavailable. The transaction is rolled back
+    if the body raises, and the cursor and connection are always released,
+    so no route closes them by hand.
+    """
+    conn = get_db_connection()
+    if not conn:
+        yield None
+        return
+
+    cursor = conn.cursor(name=name, cursor_factory=RealDictCursor)
+    try:
+        yield cursor
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        return_db_connection(conn)
+
+def _fetch_rows(sql, params=None):
+    """Run one query on its own pooled connection and return all rows"""
+    with db_cursor() as cursor:
+        if cursor is None:
+            raise psycopg2.OperationalError('Database connection failed')
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+def fetch_concurrently(*queries):
+    """Run independent (sql, params) queries in parallel
+
+    Each query borrows its own pooled connection, so the request waits for
+    the slowest query rather than the sum of all of them. Results are
+    returned in argument order; the first failure is re-raised.
+    """
+    futures = [_query_executor.submit(_fetch_rows, sql, params) for sql, params in queries]
+    return [future.result() for future in futures]
+
+def invalidate_cache(func_name):
+    """Drop every cached response produced by the named endpoint"""
+    with _cache_lock:
+        for key in [key for key in _query_cache if key[0] == func_name]:
+            del _query_cache[key]
+
+def _listen_for_invalidations():
+    """Invalidate cached responses as soon as ingestion NOTIFYs new data
+
+    Runs forever in a daemon thread on a dedicated autocommit connection,
+    reconnecting after errors or a missing database config. The TTL still
+    bounds staleness if a notification is missed.
+    """
+    while True:
+        db_config = load_db_config(direct=True)
+        if not db_config:
+            # Retried like a lost connection; the credentials may appear later
+            print("Cache invalidation listener has no database config, retrying")
+            time.sleep(10)
+            continue
+
+        conn = None
+        try:
+            conn = psycopg2.connect(connect_timeout=3, **db_config)
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            cursor = conn.cursor()
+            for channel in CACHE_INVALIDATION_CHANNELS:
+                cursor.execute(f"LISTEN {channel}")
+
+            while True:
+                if select.select([conn], [], [], 60) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    for func_name in CACHE_INVALIDATION_CHANNELS.get(notify.channel, ()):
+                        invalidate_cache(func_name)
+        except Exception as e:
+            print(f"Cache invalidation listener error: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+        time.sleep(10)
+
+def start_cache_listener():
+    """Start the invalidation listener once per process
+
+    Checked per process because gunicorn imports the app before forking
+    and threads do not survive the fork.
+    """
+    global _listener_pid
+    if _listener_pid == os.getpid():
+        return
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return
+        _listener_pid = os.getpid()
+        threading.Thread(target=_listen_for_invalidations, name='cache-listener', daemon=True).start()
+
+def _compress_body(body):
+    """Brotli and gzip copies of a body for the cache, keyed by encoding"""
+    if len(body) < GZIP_MIN_SIZE:
+        return {}
+    encoded = {'gzip': gzip.compress(body, compresslevel=6)}
+    if HAS_BROTLI:
+        encoded['br'] = brotli.compress(body, quality=5)
+    return encoded
+
+def _cached_response(body, encoded, etag):
+    """Build a response from a cache entry, precompressed when the client accepts it
+
+    Brotli is preferred over gzip. flask-compress leaves responses that
+    already carry a Content-Encoding alone, so cache hits are never
+    recompressed; their ETag gets the same ":<encoding>" suffix
+    flask-compress gives a freshly compressed body, so hits and misses
+    validate alike.
+    """
+    for encoding in ('br', 'gzip'):
+        if encoding in encoded and encoding in request.accept_encodings:
+            response = Response(encoded[encoding], mimetype='application/json')
+            response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+            response.set_etag(f"{etag}:{encoding}")
+            return response
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
 
 def cache_query(ttl_seconds=30):
-    """Cache query results for ttl_seconds"""
+    """Cache successful JSON responses for ttl_seconds
+
+    The serialized body is cached, along with compressed copies, so hits skip
+    the query, JSON encoding and compression. The cache is an LRU bounded
+    by QUERY_CACHE_MAXSIZE entries. Concurrent misses for the same key wait
+    for the first caller's query instead of running their own.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            cache_key = f"{func.__name__}:{args}:{kwargs}"
-            now = time.time()
+            start_cache_listener()
+            cache_key = (func.__name__, args, tuple(sorted(kwargs.items())))
 
-            if cache_key in _query_cache:
-                result, timestamp = _query_cache[cache_key]
-                if now - timestamp < ttl_seconds:
-                    return result
+            while True:
+                with _cache_lock:
+                    cached = _query_cache.get(cache_key)
+                    if cached and cached[0] > time.monotonic():
+                        _query_cache.move_to_end(cache_key)
+                        return _cached_response(cached[1], cached[2], cached[3])
 
-            result = func(*args, **kwargs)
-            _query_cache[cache_key] = (result, now)
-            return result
+                    done = _inflight.get(cache_key)
+                    if done is None:
+                        done = _inflight[cache_key] = threading.Event()
+                        break
+
+                # Another request is running this query; reuse its result
+                if not done.wait(timeout=INFLIGHT_WAIT_SECONDS):
+                    return func(*args, **kwargs)
+
+            try:
+                result = func(*args, **kwargs)
+                if isinstance(result, Response) and result.status_code == 200:
+                    body = result.get_data()
+                    encoded = _compress_body(body)
+                    etag = generate_etag(body)
+                    result.set_etag(etag)
+                    with _cache_lock:
+                        _query_cache[cache_key] = (time.monotonic() + ttl_seconds, body, encoded, etag)
+                        _query_cache.move_to_end(cache_key)
+                        while len(_query_cache) > QUERY_CACHE_MAXSIZE:
+                            _query_cache.popitem(last=False)
+                return result
+            finally:
+                with _cache_lock:
+                    _inflight.pop(cache_key, None)
+                done.set()
         return wrapper
     return decorator
 
+@app.after_request
+def add_etag(response):
+    """Tag JSON responses with a hash of the uncompressed body
+
+    Runs before compression, which then suffixes the tag with the encoding;
+    answer_not_modified turns a matching If-None-Match into a 304. Streamed
+    responses are left alone since hashing them needs the full body.
+    """
+    if (request.method == 'GET' and response.status_code == 200
+            and response.mimetype == 'application/json' and not response.is_streamed):
+        response.add_etag()
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def serve_static(directory, filename, mimetype, max_age=300):
+    """Serve a static file from memory with an ETag and browser caching
+
+    The bytes and ETag are reloaded only when the file's mtime changes, so a
+    redeploy is picked up without a restart. A matching If-None-Match is
+    answered with an empty 304 by answer_not_modified, after compression.
+    """
+    path = Path(directory) / filename
+    mtime_ns = path.stat().st_mtime_ns
+    cached = _static_cache.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        body = path.read_bytes()
+        cached = (mtime_ns, body, hashlib.blake2b(body, digest_size=8).hexdigest())
+        _static_cache[path] = cached
+
+    response = Response(cached[1], mimetype=mimetype)
+    response.set_etag(cached[2])
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return response
+
 @app.route('/')
 def index():
     """Serve homepage dashboard"""
     try:
-        return send_from_directory(DASHBOARD_DIR, 'index.html')
+        return serve_static(DASHBOARD_DIR, 'index.html', 'text/html')
     except Exception as e:
         print(f"Error serving index: {e}")
         return jsonify({'error': str(e)}), 500
@@ -151,7 +498,7 @@ def index():
 @app.route('/about')
 def about_page():
     try:
-        return send_from_directory(DASHBOARD_DIR, 'about.html')
+        return serve_static(DASHBOARD_DIR, 'about.html', 'text/html')
     except Exception as e:
         print(f"Error serving about page: {e}")
         return jsonify({'error': str(e)}), 500
@@ -159,7 +506,7 @@ def about_page():
 @app.route('/gamma')
 def gamma_page():
     try:
-        return send_from_directory(DASHBOARD_DIR, 'gamma_page.html')
+        return serve_static(DASHBOARD_DIR, 'gamma_page.html', 'text/html')
     except Exception as e:
         print(f"Error serving gamma page: {e}")
         return jsonify({'error': str(e)}), 500
@@ -167,7 +514,7 @@ def gamma_page():
 @app.route('/put-call')
 def put_call_page():
     try:
-        return send_from_directory(DASHBOARD_DIR, 'put_call_page.html')
+        return serve_static(DASHBOARD_DIR, 'put_call_page.html', 'text/html')
     except Exception as e:
         print(f"Error serving put/call page: {e}")
         return jsonify({'error': str(e)}), 500
@@ -175,7 +522,7 @@ def put_call_page():
 @app.route('/flows')
 def flows_page():
     try:
-        return send_from_directory(DASHBOARD_DIR, 'flows_page.html')
+        return serve_static(DASHBOARD_DIR, 'flows_page.html', 'text/html')
     except Exception as e:
         print(f"Error serving flows page: {e}")
         return jsonify({'error': str(e)}), 500
@@ -183,7 +530,7 @@ def flows_page():
 @app.route('/spy-price')
 def spy_price_page():
     try:
-        return send_from_directory(DASHBOARD_DIR, 'spy_price_page.html')
+        return serve_static(DASHBOARD_DIR, 'spy_price_page.html', 'text/html')
     except Exception as e:
         print(f"Error serving SPY price page: {e}")
         return jsonify({'error': str(e)}), 500
@@ -191,7 +538,7 @@ def spy_price_page():
 @app.route('/market-bias')
 def market_bias_page():
     try:
-        return send_from_directory(DASHBOARD_DIR, 'market_bias_page.html')
+        return serve_static(DASHBOARD_DIR, 'market_bias_page.html', 'text/html')
     except Exception as e:
         print(f"Error serving market bias page: {e}")
         return jsonify({'error': str(e)}), 500
@@ -199,7 +546,7 @@ def market_bias_page():
 @app.route('/max-pain')
 def max_pain_page():
     try:
-        return send_from_directory(DASHBOARD_DIR, 'max_pain_page.html')
+        return serve_static(DASHBOARD_DIR, 'max_pain_page.html', 'text/html')
     except Exception as e:
         print(f"Error serving max pain page: {e}")
         return jsonify({'error': str(e)}), 500
@@ -208,7 +555,7 @@ def max_pain_page():
 def serve_navigation():
     """Serve navigation HTML fragment"""
     try:
-        return send_from_directory(DASHBOARD_DIR, '_navigation.html')
+        return serve_static(DASHBOARD_DIR, '_navigation.html', 'text/html')
     except Exception as e:
         print(f"Error serving navigation: {e}")
         return jsonify({'error': str(e)}), 500
@@ -216,7 +563,7 @@ def serve_navigation():
 @app.route('/spy')
 def spy_page():
     try:
-        return send_from_directory(DASHBOARD_DIR, 'spy_frontend.html')
+        return serve_static(DASHBOARD_DIR, 'spy_frontend.html', 'text/html')
     except Exception as e:
         print(f"Error serving SPY page: {e}")
         return jsonify({'error': str(e)}), 500
@@ -225,346 +572,264 @@ def spy_page():
 @cache_query(ttl_seconds=10)
 def get_current_gex():
     """Get current GEX metrics - uses dynamic expiration"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
 
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Get target expiration based on time of day
-        target_exp = get_target_expiration()
+            # Get target expiration based on time of day
+            target_exp = get_target_expiration()
 
-        # Get latest GEX metrics for the target expiration
-        cursor.execute("""
-            SELECT 
-                timestamp,
-                symbol,
-                expiration,
-                underlying_price,
-                total_gamma_exposure,
-                call_gamma,
-                put_gamma,
-                net_gex,
-                call_volume,
-                put_volume,
-                call_oi,
-                put_oi,
-                total_contracts,
-                max_gamma_strike,
-                max_gamma_value,
-                gamma_flip_point,
-                max_pain,
-                put_call_ratio,
-                vanna_exposure,
-                charm_exposure
-            FROM gex_metrics
-            WHERE symbol = 'SPY'
-                AND DATE(expiration) = %s
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """, (target_exp,))
+            # Get latest GEX metrics for the target expiration
+            cursor.execute("""
+                SELECT 
+                    timestamp,
+                    symbol,
+                    expiration,
+                    underlying_price,
+                    total_gamma_exposure,
+                    call_gamma,
+                    put_gamma,
+                    net_gex,
+                    call_volume,
+                    put_volume,
+                    call_oi,
+                    put_oi,
+                    total_contracts,
+                    max_gamma_strike,
+                    max_gamma_value,
+                    gamma_flip_point,
+                    max_pain,
+                    put_call_ratio,
+                    vanna_exposure,
+                    charm_exposure
+                FROM gex_metrics
+                WHERE symbol = 'SPY'
+                    AND DATE(expiration) = %s
+                ORDER BY timestamp DESC
+                LIMIT 1
+            """, (target_exp,))
 
-        row = cursor.fetchone()
-        cursor.close()
+            row = cursor.fetchone()
 
-        if not row:
-            return jsonify({'error': 'No GEX data available'}), 404
+            if not row:
+                return jsonify({'error': 'No GEX data available'}), 404
 
-        # Convert to millions and add derived fields
-        result = dict(row)
-        result['total_gex_millions'] = result['total_gamma_exposure'] / 1e6
-        result['net_gex_millions'] = result['net_gex'] / 1e6
-        result['call_gamma_millions'] = result['call_gamma'] / 1e6
-        result['put_gamma_millions'] = result['put_gamma'] / 1e6
-        result['gamma_regime'] = 'Positive (Stabilizing)' if result['net_gex'] > 0 else 'Negative (Destabilizing)'
-        result['regime_color'] = '#10b981' if result['net_gex'] > 0 else '#ef4444'
+            # Convert to millions and add derived fields
+            result = dict(row)
+            result['total_gex_millions'] = result['total_gamma_exposure'] / 1e6
+            result['net_gex_millions'] = result['net_gex'] / 1e6
+            result['call_gamma_millions'] = result['call_gamma'] / 1e6
+            result['put_gamma_millions'] = result['put_gamma'] / 1e6
+            result['gamma_regime'] = 'Positive (Stabilizing)' if result['net_gex'] > 0 else 'Negative (Destabilizing)'
+            result['regime_color'] = '#10b981' if result['net_gex'] > 0 else '#ef4444'
 
-        return jsonify(result)
+            return jsonify(result)
 
     except Exception as e:
         print(f"Error in get_current_gex: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/gex/history')
 @cache_query(ttl_seconds=30)
 def get_gex_history():
     """Get historical GEX metrics"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SET TIME ZONE 'America/New_York'")
-
-        # Get last 48 hours of GEX data
-        cursor.execute("""
-            SELECT 
-                timestamp,
-                underlying_price,
-                total_gamma_exposure / 1e6 as total_gex_millions,
-                net_gex / 1e6 as net_gex_millions,
-                call_gamma / 1e6 as call_gamma_millions,
-                put_gamma / 1e6 as put_gamma_millions,
-                max_gamma_strike,
-                gamma_flip_point,
-                put_call_ratio
-            FROM gex_metrics
-            WHERE symbol = 'SPY'
-                AND timestamp > NOW() - INTERVAL '5 days'
-            ORDER BY timestamp ASC
-        """)
-
-        rows = cursor.fetchall()
-        cursor.close()
+        # Five days of snapshots; stream them rather than fetching them all
+        with db_cursor(name='gex_history') as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
+            cursor.itersize = 500
 
-        eastern = pytz.timezone('America/New_York')
-        result = []
-        for row in rows:
-            ts = row['timestamp']
-            if ts.tzinfo is None:
-                ts = eastern.localize(ts)
-            else:
-                ts = ts.astimezone(eastern)
+            # Get last 48 hours of GEX data
+            cursor.execute("""
+                SELECT 
+                    timestamp,
+                    underlying_price,
+                    total_gamma_exposure / 1e6 as total_gex_millions,
+                    net_gex / 1e6 as net_gex_millions,
+                    call_gamma / 1e6 as call_gamma_millions,
+                    put_gamma / 1e6 as put_gamma_millions,
+                    max_gamma_strike,
+                    gamma_flip_point,
+                    put_call_ratio
+                FROM gex_metrics
+                WHERE symbol = 'SPY'
+                    AND timestamp > NOW() - INTERVAL '5 days'
+                ORDER BY timestamp ASC
+            """)
 
-            data = dict(row)
-            data['timestamp'] = ts.isoformat()
-            result.append(data)
-
-        return jsonify(result)
+            # orjson writes the timestamptz values as ISO 8601 itself
+            return jsonify(list(cursor))
 
     except Exception as e:
         print(f"Error in get_gex_history: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/gex/strike-profile')
 @cache_query(ttl_seconds=10)
 def get_strike_profile():
     """Get gamma exposure by strike price - uses dynamic expiration"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Get latest underlying price
-        cursor.execute("""
-            SELECT close as spot_price
-            FROM underlying_quotes
-            WHERE symbol = 'SPY'
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """)
-        spot_result = cursor.fetchone()
-        spot_price = float(spot_result['spot_price']) if spot_result else 600.0
-
         # Get target expiration based on time of day
         target_exp = get_target_expiration()
 
-        # Get options data for the target expiration
-        cursor.execute("""
-            SELECT DISTINCT ON (strike, option_type)
+        # Join the latest underlying price onto each strike's latest
+        # quotes and sum the call and put exposure per strike in one query
+        rows = _fetch_rows("""
+            WITH spot AS (
+                SELECT COALESCE((
+                    SELECT close
+                    FROM underlying_quotes
+                    WHERE symbol = 'SPY'
+                    ORDER BY timestamp DESC
+                    LIMIT 1
+                ), 600.0)::float8 as spot_price
+            ),
+            latest_quotes AS (
+                SELECT DISTINCT ON (strike, option_type)
+                    strike,
+                    option_type,
+                    gamma,
+                    COALESCE(open_interest, 0) as open_interest
+                FROM options_quotes
+                WHERE substring(symbol from 1 for 3) = 'SPY'
+                    AND expiration = %s
+                    AND last_updated > NOW() - INTERVAL '4 hours'
+                    AND gamma IS NOT NULL
+                    AND gamma > 0
+                ORDER BY strike, option_type, last_updated DESC
+            ),
+            strike_exposure AS (
+                -- Gamma exposure = gamma * OI * 100 * spot price
+                SELECT
+                    q.strike,
+                    s.spot_price,
+                    COALESCE(SUM(q.gamma * q.open_interest * 100 * s.spot_price)
+                        FILTER (WHERE q.option_type = 'call'), 0) as call_gamma,
+                    COALESCE(SUM(q.gamma * q.open_interest * 100 * s.spot_price)
+                        FILTER (WHERE q.option_type <> 'call'), 0) as put_gamma,
+                    COALESCE(SUM(q.open_interest) FILTER (WHERE q.option_type = 'call'), 0)::bigint as call_oi,
+                    COALESCE(SUM(q.open_interest) FILTER (WHERE q.option_type <> 'call'), 0)::bigint as put_oi
+                FROM latest_quotes q
+                CROSS JOIN spot s
+                GROUP BY q.strike, s.spot_price
+            )
+            SELECT
                 strike,
-                option_type,
-                gamma,
-                open_interest,
-                underlying_price
-            FROM options_quotes
-            WHERE symbol LIKE 'SPY%%'
-                AND DATE(expiration) = %s
-                AND last_updated > NOW() - INTERVAL '4 hours'
-                AND gamma IS NOT NULL
-                AND gamma > 0
-            ORDER BY strike, option_type, last_updated DESC
+                spot_price,
+                call_gamma,
+                put_gamma,
+                call_oi,
+                put_oi,
+                call_gamma + put_gamma as total_gamma,
+                call_gamma - put_gamma as net_gamma,
+                (call_gamma + put_gamma) / 1e6 as total_gamma_millions,
+                (call_gamma - put_gamma) / 1e6 as net_gamma_millions,
+                call_gamma / 1e6 as call_gamma_millions,
+                put_gamma / 1e6 as put_gamma_millions
+            FROM strike_exposure
+            ORDER BY strike
         """, (target_exp,))
 
-        rows = cursor.fetchall()
-        cursor.close()
-
         if not rows:
             return jsonify({'error': 'No options data available'}), 404
 
-        # Calculate gamma exposure by strike
-        strike_data = {}
+        # The spot price is the same on every row; report it once
+        spot_price = rows[0]['spot_price']
         for row in rows:
-            strike = float(row['strike'])
-            opt_type = row['option_type']
-            gamma = float(row['gamma'])
-            oi = int(row['open_interest'])
-
-            # Gamma exposure = gamma * OI * 100 * spot price
-            gamma_exp = gamma * oi * 100 * spot_price
-
-            if strike not in strike_data:
-                strike_data[strike] = {
-                    'strike': strike,
-                    'call_gamma': 0,
-                    'put_gamma': 0,
-                    'call_oi': 0,
-                    'put_oi': 0
-                }
-
-            if opt_type == 'call':
-                strike_data[strike]['call_gamma'] += gamma_exp
-                strike_data[strike]['call_oi'] += oi
-            else:
-                strike_data[strike]['put_gamma'] += gamma_exp
-                strike_data[strike]['put_oi'] += oi
-
-        # Convert to list and add derived fields
-        result = []
-        for strike, data in sorted(strike_data.items()):
-            data['total_gamma'] = data['call_gamma'] + data['put_gamma']
-            data['net_gamma'] = data['call_gamma'] - data['put_gamma']
-            data['total_gamma_millions'] = data['total_gamma'] / 1e6
-            data['net_gamma_millions'] = data['net_gamma'] / 1e6
-            data['call_gamma_millions'] = data['call_gamma'] / 1e6
-            data['put_gamma_millions'] = data['put_gamma'] / 1e6
-            result.append(data)
+            del row['spot_price']
 
         return jsonify({
             'spot_price': spot_price,
             'expiration': target_exp.isoformat(),
-            'strikes': result
+            'strikes': rows
         })
 
     except Exception as e:
         print(f"Error in get_strike_profile: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/gex/regime-changes')
 @cache_query(ttl_seconds=60)
 def get_regime_changes():
     """Get gamma regime changes over time"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
 
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SET TIME ZONE 'America/New_York'")
-
-        # Get regime changes (when net_gex crosses zero)
-        cursor.execute("""
-            WITH gex_with_regime AS (
-                SELECT 
-                    timestamp,
-                    underlying_price,
-                    net_gex,
-                    CASE WHEN net_gex > 0 THEN 'positive' ELSE 'negative' END as regime
-                FROM gex_metrics
-                WHERE symbol = 'SPY'
-                    AND timestamp > NOW() - INTERVAL '7 days'
-                ORDER BY timestamp ASC
-            ),
-            regime_changes AS (
+            # Get regime changes (when net_gex crosses zero). The window
+            # supplies the ordering, so the rows are sorted only once.
+            cursor.execute("""
+                WITH gex_with_regime AS (
+                    SELECT 
+                        timestamp,
+                        underlying_price,
+                        net_gex,
+                        CASE WHEN net_gex > 0 THEN 'positive' ELSE 'negative' END as regime
+                    FROM gex_metrics
+                    WHERE symbol = 'SPY'
+                        AND timestamp > NOW() - INTERVAL '7 days'
+                ),
+                regime_changes AS (
+                    SELECT 
+                        timestamp,
+                        underlying_price,
+                        net_gex,
+                        regime,
+                        LAG(regime) OVER (ORDER BY timestamp) as prev_regime
+                    FROM gex_with_regime
+                )
                 SELECT 
                     timestamp,
                     underlying_price,
-                    net_gex,
-                    regime,
-                    LAG(regime) OVER (ORDER BY timestamp) as prev_regime
-                FROM gex_with_regime
-            )
-            SELECT 
-                timestamp,
-                underlying_price,
-                net_gex / 1e6 as net_gex_millions,
-                prev_regime as from_regime,
-                regime as to_regime
-            FROM regime_changes
-            WHERE regime != prev_regime
-            ORDER BY timestamp DESC
-            LIMIT 20
-        """)
-
-        rows = cursor.fetchall()
-        cursor.close()
-
-        eastern = pytz.timezone('America/New_York')
-        result = []
-        for row in rows:
-            ts = row['timestamp']
-            if ts.tzinfo is None:
-                ts = eastern.localize(ts)
-            else:
-                ts = ts.astimezone(eastern)
+                    net_gex / 1e6 as net_gex_millions,
+                    prev_regime as from_regime,
+                    regime as to_regime
+                FROM regime_changes
+                WHERE regime != prev_regime
+                ORDER BY timestamp DESC
+                LIMIT 20
+            """)
 
-            data = dict(row)
-            data['timestamp'] = ts.isoformat()
-            result.append(data)
-
-        return jsonify(result)
+            return jsonify(cursor.fetchall())
 
     except Exception as e:
         print(f"Error in get_regime_changes: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/gex/key-levels')
 @cache_query(ttl_seconds=30)
 def get_key_levels():
     """Get key support/resistance levels based on gamma - uses dynamic expiration"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Get spot price
-        cursor.execute("""
-            SELECT close as spot_price
-            FROM underlying_quotes
-            WHERE symbol = 'SPY'
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """)
-        spot_result = cursor.fetchone()
-        spot_price = float(spot_result['spot_price']) if spot_result else 600.0
-
         # Get target expiration based on time of day
         target_exp = get_target_expiration()
 
-        # Get options with significant gamma
-        cursor.execute("""
-            SELECT DISTINCT ON (strike, option_type)
-                strike,
-                option_type,
-                gamma,
-                open_interest
-            FROM options_quotes
-            WHERE symbol LIKE 'SPY%%'
-                AND DATE(expiration) = %s
-                AND last_updated > NOW() - INTERVAL '4 hours'
-                AND gamma IS NOT NULL
-            ORDER BY strike, option_type, last_updated DESC
-        """, (target_exp,))
-
-        rows = cursor.fetchall()
-        cursor.close()
+        # Spot price and options with significant gamma are independent,
+        # so fetch them in parallel
+        spot_rows, rows = fetch_concurrently(
+            (LATEST_SPY_QUOTE_SQL, None),
+            ("""
+                SELECT DISTINCT ON (strike, option_type)
+                    strike,
+                    option_type,
+                    gamma,
+                    open_interest
+                FROM options_quotes
+                WHERE substring(symbol from 1 for 3) = 'SPY'
+                    AND expiration = %s
+                    AND last_updated > NOW() - INTERVAL '4 hours'
+                    AND gamma IS NOT NULL
+                ORDER BY strike, option_type, last_updated DESC
+            """, (target_exp,))
+        )
+        spot_price = float(spot_rows[0]['close']) if spot_rows else 600.0
 
         # Calculate gamma by strike
         strike_gamma = {}
@@ -613,810 +878,629 @@ def get_key_levels():
         print(f"Error in get_key_levels: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/gex/put-call-history')
 @cache_query(ttl_seconds=30)
 def get_put_call_history():
     """Get historical put/call ratio data"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SET TIME ZONE 'America/New_York'")
-
-        cursor.execute("""
-            SELECT 
-                timestamp,
-                put_call_ratio
-            FROM gex_metrics
-            WHERE symbol = 'SPY'
-                AND timestamp > NOW() - INTERVAL '48 hours'
-            ORDER BY timestamp ASC
-        """)
-
-        rows = cursor.fetchall()
-        cursor.close()
-
-        import pytz
-        eastern = pytz.timezone('America/New_York')
-        result = []
-        for row in rows:
-            ts = row['timestamp']
-            if ts.tzinfo is None:
-                ts = eastern.localize(ts)
-            else:
-                ts = ts.astimezone(eastern)
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
 
-            result.append({
-                'timestamp': ts.isoformat(),
-                'put_call_ratio': float(row['put_call_ratio']) if row['put_call_ratio'] else 0
-            })
+            cursor.execute("""
+                SELECT 
+                    timestamp,
+                    COALESCE(put_call_ratio, 0) as put_call_ratio
+                FROM gex_metrics
+                WHERE symbol = 'SPY'
+                    AND timestamp > NOW() - INTERVAL '48 hours'
+                ORDER BY timestamp ASC
+            """)
 
-        return jsonify(result)
+            return jsonify(cursor.fetchall())
 
     except Exception as e:
         print(f"Error in get_put_call_history: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/flows/history')
 @cache_query(ttl_seconds=30)
 def get_flows_history():
     """Get historical option flow data from option_flow_metrics table"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SET TIME ZONE 'America/New_York'")
-
-        # Query the option_flow_metrics table - last 48 hours
-        cursor.execute("""
-            SELECT 
-                timestamp,
-                symbol,
-                option_type,
-                total_premium,
-                delta_weighted_volume,
-                net_delta_exposure,
-                total_notional,
-                buy_volume,
-                sell_volume,
-                net_flow,
-                avg_underlying_price
-            FROM option_flow_metrics
-            WHERE symbol = 'SPY'
-                AND timestamp > NOW() - INTERVAL '48 hours'
-            ORDER BY timestamp ASC
-        """)
-
-        rows = cursor.fetchall()
-        cursor.close()
-
-        import pytz
-        eastern = pytz.timezone('America/New_York')
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
 
-        # Aggregate by timestamp
-        buckets = {}
-        cumulative_delta_flow = 0  # Track cumulative delta flow
+            # Query the option_flow_metrics table - last 48 hours
+            cursor.execute("""
+                SELECT 
+                    timestamp,
+                    symbol,
+                    option_type,
+                    total_premium,
+                    delta_weighted_volume,
+                    net_delta_exposure,
+                    total_notional,
+                    buy_volume,
+                    sell_volume,
+                    net_flow,
+                    avg_underlying_price
+                FROM option_flow_metrics
+                WHERE symbol = 'SPY'
+                    AND timestamp > NOW() - INTERVAL '48 hours'
+                ORDER BY timestamp ASC
+            """)
 
-        for row in rows:
-            ts = row['timestamp']
-            if ts.tzinfo is None:
-                ts = eastern.localize(ts)
-            else:
-                ts = ts.astimezone(eastern)
-            ts_str = ts.isoformat()
-
-            if ts_str not in buckets:
-                buckets[ts_str] = {
-                    'timestamp': ts_str,
-                    'premium_spent': 0,
-                    'delta_weighted_flow': 0,  # This will be cumulative
-                    'call_notional': 0,
-                    'put_notional': 0
-                }
+            rows = cursor.fetchall()
 
-            # Premium is per-bucket (sum calls + puts)
-            buckets[ts_str]['premium_spent'] += float(row['total_premium'] or 0)
 
-            # Delta flow is cumulative across the entire time series
-            cumulative_delta_flow += float(row['delta_weighted_volume'] or 0)
-            buckets[ts_str]['delta_weighted_flow'] = cumulative_delta_flow
+            # Aggregate by timestamp
+            buckets = {}
+            cumulative_delta_flow = 0  # Track cumulative delta flow
 
-            # Notional values are per-bucket, separate for calls and puts
-            if row['option_type'] == 'call':
-                buckets[ts_str]['call_notional'] += float(row['total_notional'] or 0)
-            else:
-                buckets[ts_str]['put_notional'] += float(row['total_notional'] or 0)
+            for row in rows:
+                ts = row['timestamp']
+                if ts.tzinfo is None:
+                    ts = ts.replace(tzinfo=EASTERN)
+                else:
+                    ts = ts.astimezone(EASTERN)
+                ts_str = ts.isoformat()
+
+                if ts_str not in buckets:
+                    buckets[ts_str] = {
+                        'timestamp': ts_str,
+                        'premium_spent': 0,
+                        'delta_weighted_flow': 0,  # This will be cumulative
+                        'call_notional': 0,
+                        'put_notional': 0
+                    }
+
+                # Premium is per-bucket (sum calls + puts)
+                buckets[ts_str]['premium_spent'] += float(row['total_premium'] or 0)
+
+                # Delta flow is cumulative across the entire time series
+                cumulative_delta_flow += float(row['delta_weighted_volume'] or 0)
+                buckets[ts_str]['delta_weighted_flow'] = cumulative_delta_flow
+
+                # Notional values are per-bucket, separate for calls and puts
+                if row['option_type'] == 'call':
+                    buckets[ts_str]['call_notional'] += float(row['total_notional'] or 0)
+                else:
+                    buckets[ts_str]['put_notional'] += float(row['total_notional'] or 0)
 
-        # Convert to sorted list
-        result = sorted(buckets.values(), key=lambda x: x['timestamp'])
+            # Convert to sorted list
+            result = sorted(buckets.values(), key=lambda x: x['timestamp'])
 
-        return jsonify(result)
+            return jsonify(result)
 
     except Exception as e:
         print(f"Error in get_flows_history: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/market/SPY/latest')
 def get_spy_latest():
     """Get only the most recent SPY bar - no cache, for real-time banner updates"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("""
-            SELECT
-                timestamp,
-                actual_time,
-                close,
-                open,
-                high,
-                low,
-                total_volume as volume,
-                up_volume,
-                down_volume
-            FROM underlying_quotes
-            WHERE symbol = 'SPY'
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """)
-        row = cursor.fetchone()
-        cursor.close()
-        if not row:
-            return jsonify({'error': 'No data'}), 404
-        result = dict(row)
-        # Serialize datetime fields
-        import pytz
-        eastern = pytz.timezone('America/New_York')
-        for key in ['timestamp', 'actual_time']:
-            if result.get(key):
-                ts = result[key]
-                if hasattr(ts, 'tzinfo'):
-                    if ts.tzinfo is None:
-                        ts = eastern.localize(ts)
-                    else:
-                        ts = ts.astimezone(eastern)
-                    result[key] = ts.isoformat()
-        return jsonify(result)
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
+            cursor.execute("""
+                SELECT
+                    timestamp,
+                    actual_time,
+                    close,
+                    open,
+                    high,
+                    low,
+                    total_volume as volume,
+                    up_volume,
+                    down_volume
+                FROM underlying_quotes
+                WHERE symbol = 'SPY'
+                ORDER BY timestamp DESC
+                LIMIT 1
+            """)
+            row = cursor.fetchone()
+            if not row:
+                return jsonify({'error': 'No data'}), 404
+            return jsonify(row)
     except Exception as e:
         print(f"Error in get_spy_latest: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/market/SPY/current')
 @cache_query(ttl_seconds=5)
 def get_spy_current():
     """Get current SPY market data"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("""
-            SELECT 
-                actual_time,
-                symbol,
-                close as last_price,
-                open,
-                high,
-                low,
-                total_volume as volume,
-                up_volume,
-                down_volume
-            FROM underlying_quotes
-            WHERE symbol = 'SPY'
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """)
-
-        row = cursor.fetchone()
-        cursor.close()
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
 
-        if not row:
-            return jsonify({'error': 'No current data available'}), 404
+            cursor.execute("""
+                SELECT 
+                    actual_time,
+                    symbol,
+                    close as last_price,
+                    open,
+                    high,
+                    low,
+                    total_volume as volume,
+                    up_volume,
+                    down_volume
+                FROM underlying_quotes
+                WHERE symbol = 'SPY'
+                ORDER BY timestamp DESC
+                LIMIT 1
+            """)
+
+            row = cursor.fetchone()
 
-        return jsonify(dict(row))
+            if not row:
+                return jsonify({'error': 'No current data available'}), 404
+
+            return jsonify(dict(row))
 
     except Exception as e:
         print(f"Error in get_spy_current: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/market/SPY/history')
 @cache_query(ttl_seconds=30)
 def get_spy_market_history():
     """Get SPY market history for charts - last 384 5-minute bars"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SET TIME ZONE 'America/New_York'")
-
-        cursor.execute("""
-            WITH five_min_buckets AS (
-                SELECT
-                    date_trunc('hour', timestamp AT TIME ZONE 'America/New_York') +
-                    (floor((EXTRACT(minute FROM timestamp AT TIME ZONE 'America/New_York') - 1) / 5) * INTERVAL '5 minutes') as bucket_time,
-                    (array_agg(open ORDER BY timestamp))[1] as open,
-                    MAX(high) as high,
-                    MIN(low) as low,
-                    (array_agg(close ORDER BY timestamp DESC))[1] as close,
-                    MAX(timestamp) as actual_timestamp,
-                    MAX(actual_time) as actual_time,
-                    SUM(COALESCE(total_volume, 0)) as volume,
-                    SUM(COALESCE(up_volume, 0)) as up_volume,
-                    SUM(COALESCE(down_volume, 0)) as down_volume
-                FROM underlying_quotes
-                WHERE symbol = 'SPY'
-                GROUP BY bucket_time
-                ORDER BY bucket_time DESC
-                LIMIT 384
-            )
-            SELECT * FROM five_min_buckets
-            ORDER BY bucket_time DESC
-        """)
-
-        rows = cursor.fetchall()
-        cursor.close()
-
-        # Reverse to get chronological order
-        rows = list(reversed(rows)) if rows else []
-
-        import pytz
-        eastern = pytz.timezone('America/New_York')
-        result = []
-        for row in rows:
-            ts = row['bucket_time']
-            if ts.tzinfo is None:
-                ts = eastern.localize(ts)
-            else:
-                ts = ts.astimezone(eastern)
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
+
+            # Bars are pre-aggregated by the underlying_5min_bars continuous
+            # aggregate (config/performance_indexes.sql). Missing prices fall
+            # back to the close and numeric columns are cast in SQL. json_agg
+            # builds the response body server-side, so the ~400 rows never
+            # become Python dicts; the single text value is returned as is.
+            cursor.execute("""
+                SELECT COALESCE(json_agg(latest_bars ORDER BY latest_bars.timestamp), '[]')::text as body
+                FROM (
+                    SELECT
+                        bucket - INTERVAL '1 minute' as timestamp,
+                        actual_timestamp,
+                        actual_time,
+                        COALESCE(open, close, 0)::float8 as open,
+                        COALESCE(high, close, 0)::float8 as high,
+                        COALESCE(low, close, 0)::float8 as low,
+                        COALESCE(close, 0)::float8 as close,
+                        COALESCE(volume, 0)::bigint as volume,
+                        COALESCE(up_volume, 0)::bigint as up_volume,
+                        COALESCE(down_volume, 0)::bigint as down_volume
+                    FROM underlying_5min_bars
+                    WHERE symbol = 'SPY'
+                    ORDER BY bucket DESC
+                    LIMIT 384
+                ) latest_bars
+            """)
 
-            actual_ts = row['actual_timestamp']
-            if actual_ts:
-                if actual_ts.tzinfo is None:
-                    actual_ts_display = eastern.localize(actual_ts)
-                else:
-                    actual_ts_display = actual_ts.astimezone(eastern)
-            else:
-                actual_ts_display = ts
-
-            result.append({
-                'timestamp': ts.isoformat(),
-                'actual_timestamp': actual_ts_display.isoformat(),
-                'actual_time': row['actual_time'].isoformat() if row['actual_time'] else None,
-                'open': float(row['open'] or row['close'] or 0),
-                'high': float(row['high'] or row['close'] or 0),
-                'low': float(row['low'] or row['close'] or 0),
-                'close': float(row['close'] or 0),
-                'volume': int(row['volume'] or 0),
-                'up_volume': int(row['up_volume'] or 0),
-                'down_volume': int(row['down_volume'] or 0)
-            })
+            body = cursor.fetchone()['body']
 
-        return jsonify(result)
+        return Response(body, mimetype='application/json')
 
     except Exception as e:
         print(f"Error in get_spy_market_history: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/spy-48hr-range')
 @cache_query(ttl_seconds=10)
 def get_spy_48hr_range():
     """Get SPY range from last 384 5-minute bars and today's cumulative volume"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SET TIME ZONE 'America/New_York'")
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
 
-        # Get range from last 384 5-minute buckets
-        cursor.execute("""
-            WITH five_min_buckets AS (
-                SELECT
-                    date_trunc('hour', timestamp AT TIME ZONE 'America/New_York') +
-                    (floor((EXTRACT(minute FROM timestamp AT TIME ZONE 'America/New_York') - 1) / 5) * INTERVAL '5 minutes') as bucket_time,
-                    MAX(high) as high,
-                    MIN(low) as low
-                FROM underlying_quotes
-                WHERE symbol = 'SPY'
-                GROUP BY bucket_time
-                ORDER BY bucket_time DESC
-                LIMIT 384
-            )
-            SELECT
-                MIN(low) as range_low,
-                MAX(high) as range_high
-            FROM five_min_buckets
-        """)
-        range_result = cursor.fetchone()
-
-        # Get today's cumulative volume since 4:00 AM ET
-        cursor.execute("""
-            SELECT
-                SUM(COALESCE(total_volume, 0)) as total_volume,
-                SUM(COALESCE(up_volume, 0)) as up_volume,
-                SUM(COALESCE(down_volume, 0)) as down_volume
-            FROM underlying_quotes
-            WHERE symbol = 'SPY'
-                AND timestamp >= DATE_TRUNC('day', NOW() AT TIME ZONE 'America/New_York')
-                    + INTERVAL '4 hours'
-        """)
-        volume_result = cursor.fetchone()
+            # Range over the last 384 5-minute buckets and today's cumulative
+            # volume since 4:00 AM ET, fetched in a single round-trip
+            cursor.execute("""
+                WITH five_min_buckets AS (
+                    SELECT high, low
+                    FROM underlying_5min_bars
+                    WHERE symbol = 'SPY'
+                    ORDER BY bucket DESC
+                    LIMIT 384
+                ),
+                range_stats AS (
+                    SELECT
+                        MIN(low) as range_low,
+                        MAX(high) as range_high
+                    FROM five_min_buckets
+                ),
+                volume_stats AS (
+                    SELECT
+                        SUM(COALESCE(total_volume, 0)) as total_volume,
+                        SUM(COALESCE(up_volume, 0)) as up_volume,
+                        SUM(COALESCE(down_volume, 0)) as down_volume
+                    FROM underlying_quotes
+                    WHERE symbol = 'SPY'
+                        AND timestamp >= (DATE_TRUNC('day', NOW() AT TIME ZONE 'America/New_York')
+                            + INTERVAL '4 hours') AT TIME ZONE 'America/New_York'
+                )
+                SELECT * FROM range_stats CROSS JOIN volume_stats
+            """)
+            row = cursor.fetchone()
 
-        cursor.close()
 
-        return jsonify({
-            'range_low': float(range_result['range_low']) if range_result and range_result['range_low'] else 0,
-            'range_high': float(range_result['range_high']) if range_result and range_result['range_high'] else 0,
-            'total_volume': int(volume_result['total_volume']) if volume_result and volume_result['total_volume'] else 0,
-            'up_volume': int(volume_result['up_volume']) if volume_result and volume_result['up_volume'] else 0,
-            'down_volume': int(volume_result['down_volume']) if volume_result and volume_result['down_volume'] else 0
-        })
+            return jsonify({
+                'range_low': float(row['range_low']) if row and row['range_low'] else 0,
+                'range_high': float(row['range_high']) if row and row['range_high'] else 0,
+                'total_volume': int(row['total_volume']) if row and row['total_volume'] else 0,
+                'up_volume': int(row['up_volume']) if row and row['up_volume'] else 0,
+                'down_volume': int(row['down_volume']) if row and row['down_volume'] else 0
+            })
 
     except Exception as e:
         print(f"Error in get_spy_48hr_range: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/market/bias/history')
 @cache_query(ttl_seconds=30)
 def get_bias_history():
     """Get historical market bias data"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SET TIME ZONE 'America/New_York'")
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
 
-        cursor.execute("""
-            WITH gex_data AS (
+            cursor.execute("""
+                WITH gex_data AS (
+                    SELECT 
+                        timestamp,
+                        net_gex,
+                        gamma_flip_point,
+                        underlying_price,
+                        put_call_ratio,
+                        max_gamma_strike
+                    FROM gex_metrics
+                    WHERE symbol = 'SPY'
+                        AND timestamp > NOW() - INTERVAL '48 hours'
+                )
                 SELECT 
                     timestamp,
                     net_gex,
                     gamma_flip_point,
                     underlying_price,
                     put_call_ratio,
-                    max_gamma_strike
-                FROM gex_metrics
-                WHERE symbol = 'SPY'
-                    AND timestamp > NOW() - INTERVAL '48 hours'
-            )
-            SELECT 
-                timestamp,
-                net_gex,
-                gamma_flip_point,
-                underlying_price,
-                put_call_ratio,
-                max_gamma_strike,
-                CASE 
-                    WHEN net_gex > 0 AND underlying_price > COALESCE(gamma_flip_point, underlying_price) THEN 'Bullish'
-                    WHEN net_gex < 0 AND underlying_price < COALESCE(gamma_flip_point, underlying_price) THEN 'Bearish'
-                    ELSE 'Neutral'
-                END as market_bias
-            FROM gex_data
-            ORDER BY timestamp;
-        """)
-
-        rows = cursor.fetchall()
-        cursor.close()
+                    max_gamma_strike,
+                    CASE 
+                        WHEN net_gex > 0 AND underlying_price > COALESCE(gamma_flip_point, underlying_price) THEN 'Bullish'
+                        WHEN net_gex < 0 AND underlying_price < COALESCE(gamma_flip_point, underlying_price) THEN 'Bearish'
+                        ELSE 'Neutral'
+                    END as market_bias
+                FROM gex_data
+                ORDER BY timestamp;
+            """)
 
-        import pytz
-        eastern = pytz.timezone('America/New_York')
-        result = []
-        for row in rows:
-            ts = row['timestamp']
-            if ts.tzinfo is None:
-                ts = eastern.localize(ts)
-            else:
-                ts = ts.astimezone(eastern)
-
-            result.append({
-                'timestamp': ts.isoformat(),
-                'market_bias': row['market_bias'],
-                'net_gex': float(row['net_gex']) if row['net_gex'] else 0,
-                'gamma_flip_point': float(row['gamma_flip_point']) if row['gamma_flip_point'] else None,
-                'underlying_price': float(row['underlying_price']) if row['underlying_price'] else 0,
-                'put_call_ratio': float(row['put_call_ratio']) if row['put_call_ratio'] else 0,
-                'max_gamma_strike': float(row['max_gamma_strike']) if row['max_gamma_strike'] else 0
-            })
+            rows = cursor.fetchall()
 
-        return jsonify(result)
+            result = []
+            for row in rows:
+                ts = row['timestamp']
+                if ts.tzinfo is None:
+                    ts = ts.replace(tzinfo=EASTERN)
+                else:
+                    ts = ts.astimezone(EASTERN)
+
+                result.append({
+                    'timestamp': ts.isoformat(),
+                    'market_bias': row['market_bias'],
+                    'net_gex': float(row['net_gex']) if row['net_gex'] else 0,
+                    'gamma_flip_point': float(row['gamma_flip_point']) if row['gamma_flip_point'] else None,
+                    'underlying_price': float(row['underlying_price']) if row['underlying_price'] else 0,
+                    'put_call_ratio': float(row['put_call_ratio']) if row['put_call_ratio'] else 0,
+                    'max_gamma_strike': float(row['max_gamma_strike']) if row['max_gamma_strike'] else 0
+                })
+
+            return jsonify(result)
 
     except Exception as e:
         print(f"Error in get_bias_history: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/market/bias/current')
 @cache_query(ttl_seconds=10)
 def get_current_bias_score():
     """Get current market bias with calculated score - uses dynamic expiration"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
 
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Get target expiration based on time of day
-        target_exp = get_target_expiration()
+            # Get target expiration based on time of day
+            target_exp = get_target_expiration()
 
-        # Get latest GEX metrics for target expiration
-        cursor.execute("""
-            SELECT
-                timestamp,
-                expiration,
-                net_gex,
-                underlying_price,
-                gamma_flip_point,
-                put_call_ratio,
-                max_gamma_strike
-            FROM gex_metrics
-            WHERE symbol = 'SPY'
-                AND DATE(expiration) = %s
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """, (target_exp,))
+            # Get latest GEX metrics for target expiration
+            cursor.execute("""
+                SELECT
+                    timestamp,
+                    expiration,
+                    net_gex,
+                    underlying_price,
+                    gamma_flip_point,
+                    put_call_ratio,
+                    max_gamma_strike
+                FROM gex_metrics
+                WHERE symbol = 'SPY'
+                    AND DATE(expiration) = %s
+                ORDER BY timestamp DESC
+                LIMIT 1
+            """, (target_exp,))
 
-        row = cursor.fetchone()
-        cursor.close()
+            row = cursor.fetchone()
 
-        if not row:
-            return jsonify({'error': 'No data available'}), 404
+            if not row:
+                return jsonify({'error': 'No data available'}), 404
 
-        data = dict(row)
+            data = dict(row)
 
-        # Calculate bias score (same logic as frontend)
-        score = 0
+            # Calculate bias score (same logic as frontend)
+            score = 0
 
-        # Net GEX contribution (-30 to +30)
-        if data['net_gex']:
-            score += min(30, max(-30, (data['net_gex'] / 1e9) * 30))
+            # Net GEX contribution (-30 to +30)
+            if data['net_gex']:
+                score += min(30, max(-30, (data['net_gex'] / 1e9) * 30))
 
-        # Flip point contribution (-25 to +25)
-        if data['gamma_flip_point'] and data['underlying_price']:
-            flip_distance = ((data['underlying_price'] - data['gamma_flip_point']) / data['underlying_price']) * 100
-            score += max(-25, min(25, flip_distance * 5))
+            # Flip point contribution (-25 to +25)
+            if data['gamma_flip_point'] and data['underlying_price']:
+                flip_distance = ((data['underlying_price'] - data['gamma_flip_point']) / data['underlying_price']) * 100
+                score += max(-25, min(25, flip_distance * 5))
 
-        # Put/Call ratio contribution (-20 to +20)
-        if data['put_call_ratio']:
-            score += max(-20, min(20, (1 - data['put_call_ratio']) * 20))
+            # Put/Call ratio contribution (-20 to +20)
+            if data['put_call_ratio']:
+                score += max(-20, min(20, (1 - data['put_call_ratio']) * 20))
 
-        # Max gamma distance contribution (-15 to +15)
-        if data['max_gamma_strike'] and data['underlying_price']:
-            gamma_distance = ((data['underlying_price'] - data['max_gamma_strike']) / data['underlying_price']) * 100
-            score += -max(-15, min(15, gamma_distance * 3))
+            # Max gamma distance contribution (-15 to +15)
+            if data['max_gamma_strike'] and data['underlying_price']:
+                gamma_distance = ((data['underlying_price'] - data['max_gamma_strike']) / data['underlying_price']) * 100
+                score += -max(-15, min(15, gamma_distance * 3))
 
-        # Determine bias
-        if score > 25:
-            bias = 'BULLISH'
-            css_class = 'bullish'
-        elif score < -25:
-            bias = 'BEARISH'
-            css_class = 'bearish'
-        else:
-            bias = 'NEUTRAL'
-            css_class = 'neutral'
+            # Determine bias
+            if score > 25:
+                bias = 'BULLISH'
+                css_class = 'bullish'
+            elif score < -25:
+                bias = 'BEARISH'
+                css_class = 'bearish'
+            else:
+                bias = 'NEUTRAL'
+                css_class = 'neutral'
 
-        return jsonify({
-            'timestamp': data['timestamp'].isoformat(),
-            'expiration': data['expiration'].isoformat() if data['expiration'] else None,
-            'bias': bias,
-            'score': round(score, 1),
-            'css_class': css_class,
-            'net_gex': float(data['net_gex']) if data['net_gex'] else 0,
-            'gamma_flip_point': float(data['gamma_flip_point']) if data['gamma_flip_point'] else None,
-            'underlying_price': float(data['underlying_price']) if data['underlying_price'] else 0,
-            'put_call_ratio': float(data['put_call_ratio']) if data['put_call_ratio'] else 0,
-            'max_gamma_strike': float(data['max_gamma_strike']) if data['max_gamma_strike'] else 0
-        })
+            return jsonify({
+                'timestamp': data['timestamp'].isoformat(),
+                'expiration': data['expiration'].isoformat() if data['expiration'] else None,
+                'bias': bias,
+                'score': round(score, 1),
+                'css_class': css_class,
+                'net_gex': float(data['net_gex']) if data['net_gex'] else 0,
+                'gamma_flip_point': float(data['gamma_flip_point']) if data['gamma_flip_point'] else None,
+                'underlying_price': float(data['underlying_price']) if data['underlying_price'] else 0,
+                'put_call_ratio': float(data['put_call_ratio']) if data['put_call_ratio'] else 0,
+                'max_gamma_strike': float(data['max_gamma_strike']) if data['max_gamma_strike'] else 0
+            })
 
     except Exception as e:
         print(f"Error in get_current_bias_score: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/market/bias/score-history')
 @cache_query(ttl_seconds=30)
 def get_bias_score_history():
     """Get historical market bias scores"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
 
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SET TIME ZONE 'America/New_York'")
-
-        cursor.execute("""
-            SELECT
-                timestamp,
-                net_gex,
-                gamma_flip_point,
-                underlying_price,
-                put_call_ratio,
-                max_gamma_strike
-            FROM gex_metrics
-            WHERE symbol = 'SPY'
-                AND timestamp > NOW() - INTERVAL '48 hours'
-            ORDER BY timestamp ASC
-        """)
-
-        rows = cursor.fetchall()
-        cursor.close()
-
-        import pytz
-        eastern = pytz.timezone('America/New_York')
-        result = []
-
-        for row in rows:
-            ts = row['timestamp']
-            if ts.tzinfo is None:
-                ts = eastern.localize(ts)
-            else:
-                ts = ts.astimezone(eastern)
-
-            # Calculate score for each point
-            score = 0
-
-            # Net GEX contribution
-            if row['net_gex']:
-                score += min(30, max(-30, (row['net_gex'] / 1e9) * 30))
-
-            # Flip point contribution
-            if row['gamma_flip_point'] and row['underlying_price']:
-                flip_distance = ((row['underlying_price'] - row['gamma_flip_point']) / row['underlying_price']) * 100
-                score += max(-25, min(25, flip_distance * 5))
-
-            # Put/Call ratio contribution
-            if row['put_call_ratio']:
-                score += max(-20, min(20, (1 - row['put_call_ratio']) * 20))
+            cursor.execute("""
+                SELECT
+                    timestamp,
+                    net_gex,
+                    gamma_flip_point,
+                    underlying_price,
+                    put_call_ratio,
+                    max_gamma_strike
+                FROM gex_metrics
+                WHERE symbol = 'SPY'
+                    AND timestamp > NOW() - INTERVAL '48 hours'
+                ORDER BY timestamp ASC
+            """)
 
-            # Max gamma distance contribution
-            if row['max_gamma_strike'] and row['underlying_price']:
-                gamma_distance = ((row['underlying_price'] - row['max_gamma_strike']) / row['underlying_price']) * 100
-                score += -max(-15, min(15, gamma_distance * 3))
+            rows = cursor.fetchall()
 
-            # Determine bias
-            if score > 25:
-                bias = 'BULLISH'
-            elif score < -25:
-                bias = 'BEARISH'
-            else:
-                bias = 'NEUTRAL'
+            result = []
 
-            result.append({
-                'timestamp': ts.isoformat(),
-                'score': round(score, 1),
-                'bias': bias,
-                'net_gex': float(row['net_gex']) if row['net_gex'] else 0,
-                'gamma_flip_point': float(row['gamma_flip_point']) if row['gamma_flip_point'] else None,
-                'underlying_price': float(row['underlying_price']) if row['underlying_price'] else 0,
-                'put_call_ratio': float(row['put_call_ratio']) if row['put_call_ratio'] else 0,
-                'max_gamma_strike': float(row['max_gamma_strike']) if row['max_gamma_strike'] else 0
-            })
+            for row in rows:
+                ts = row['timestamp']
+                if ts.tzinfo is None:
+                    ts = ts.replace(tzinfo=EASTERN)
+                else:
+                    ts = ts.astimezone(EASTERN)
+
+                # Calculate score for each point
+                score = 0
+
+                # Net GEX contribution
+                if row['net_gex']:
+                    score += min(30, max(-30, (row['net_gex'] / 1e9) * 30))
+
+                # Flip point contribution
+                if row['gamma_flip_point'] and row['underlying_price']:
+                    flip_distance = ((row['underlying_price'] - row['gamma_flip_point']) / row['underlying_price']) * 100
+                    score += max(-25, min(25, flip_distance * 5))
+
+                # Put/Call ratio contribution
+                if row['put_call_ratio']:
+                    score += max(-20, min(20, (1 - row['put_call_ratio']) * 20))
+
+                # Max gamma distance contribution
+                if row['max_gamma_strike'] and row['underlying_price']:
+                    gamma_distance = ((row['underlying_price'] - row['max_gamma_strike']) / row['underlying_price']) * 100
+                    score += -max(-15, min(15, gamma_distance * 3))
+
+                # Determine bias
+                if score > 25:
+                    bias = 'BULLISH'
+                elif score < -25:
+                    bias = 'BEARISH'
+                else:
+                    bias = 'NEUTRAL'
+
+                result.append({
+                    'timestamp': ts.isoformat(),
+                    'score': round(score, 1),
+                    'bias': bias,
+                    'net_gex': float(row['net_gex']) if row['net_gex'] else 0,
+                    'gamma_flip_point': float(row['gamma_flip_point']) if row['gamma_flip_point'] else None,
+                    'underlying_price': float(row['underlying_price']) if row['underlying_price'] else 0,
+                    'put_call_ratio': float(row['put_call_ratio']) if row['put_call_ratio'] else 0,
+                    'max_gamma_strike': float(row['max_gamma_strike']) if row['max_gamma_strike'] else 0
+                })
 
-        return jsonify(result)
+            return jsonify(result)
 
     except Exception as e:
         print(f"Error in get_bias_score_history: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/spy-change')
 def get_spy_change():
     """Get SPY price change from previous close"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
 
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Try to get from monitoring cache first
-        try:
-            import json
-            from pathlib import Path
-            cache_file = Path("/data/monitoring/spy_previous_close.json")
-            if cache_file.exists():
-                with open(cache_file, 'r') as f:
-                    cache_data = json.load(f)
-                prev_close = cache_data.get('prev_close')
-            else:
+            # Try to get from monitoring cache first
+            try:
+                from pathlib import Path
+                cache_file = Path("/data/monitoring/spy_previous_close.json")
+                if cache_file.exists():
+                    cache_data = orjson.loads(cache_file.read_bytes())
+                    prev_close = cache_data.get('prev_close')
+                else:
+                    prev_close = None
+            except:
                 prev_close = None
-        except:
-            prev_close = None
-
-        # Get current price
-        cursor.execute("""
-            SELECT close as current_price
-            FROM underlying_quotes
-            WHERE symbol = 'SPY'
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """)
-        result = cursor.fetchone()
-
-        if not result:
-            return jsonify({'error': 'No current price'}), 404
-
-        current_price = float(result['current_price'])
-
-        # If no cache, calculate from database
-        if not prev_close:
-            cursor.execute("""
-                WITH latest_price AS (
-                    SELECT timestamp
-                    FROM underlying_quotes
-                    WHERE symbol = 'SPY'
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                ),
-                previous_close AS (
-                    SELECT close as prev_close
+
+            if prev_close:
+                # Get current price
+                cursor.execute("""
+                    SELECT close as current_price
                     FROM underlying_quotes
                     WHERE symbol = 'SPY'
-                      AND timestamp < (SELECT DATE_TRUNC('day', timestamp AT TIME ZONE 'America/New_York')
-                                       FROM latest_price)
                     ORDER BY timestamp DESC
                     LIMIT 1
-                )
-                SELECT prev_close FROM previous_close
-            """)
-            prev_result = cursor.fetchone()
-            prev_close = float(prev_result['prev_close']) if prev_result else current_price
-
-        cursor.close()
-
-        change = current_price - prev_close
-        percent_change = (change / prev_close * 100) if prev_close > 0 else 0
+                """)
+            else:
+                # No cache: get the current price and the last close before
+                # its trading day in one round trip
+                cursor.execute("""
+                    WITH latest_price AS (
+                        SELECT timestamp, close
+                        FROM underlying_quotes
+                        WHERE symbol = 'SPY'
+                        ORDER BY timestamp DESC
+                        LIMIT 1
+                    )
+                    SELECT
+                        lp.close as current_price,
+                        (
+                            SELECT close
+                            FROM underlying_quotes
+                            WHERE symbol = 'SPY'
+                              AND timestamp < DATE_TRUNC('day', lp.timestamp AT TIME ZONE 'America/New_York')
+                                                  AT TIME ZONE 'America/New_York'
+                            ORDER BY timestamp DESC
+                            LIMIT 1
+                        ) as prev_close
+                    FROM latest_price lp
+                """)
+            result = cursor.fetchone()
+
+            if not result:
+                return jsonify({'error': 'No current price'}), 404
+
+            current_price = float(result['current_price'])
+            if not prev_close:
+                prev_close = float(result['prev_close']) if result['prev_close'] is not None else current_price
+
+
+            change = current_price - prev_close
+            percent_change = (change / prev_close * 100) if prev_close > 0 else 0
 
-        return jsonify({
-            'current_price': current_price,
-            'prev_close': prev_close,
-            'change': change,
-            'percent_change': percent_change
-        })
+            return jsonify({
+                'current_price': current_price,
+                'prev_close': prev_close,
+                'change': change,
+                'percent_change': percent_change
+            })
 
     except Exception as e:
         print(f"Error in get_spy_change: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/max-pain/analysis')
 @cache_query(ttl_seconds=10)
 def get_max_pain_analysis():
     """Get max pain analysis with strike-by-strike breakdown - uses dynamic expiration"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SET TIME ZONE 'America/New_York'")
-
-        # Get current SPY price
-        cursor.execute("""
-            SELECT close as current_price
-            FROM underlying_quotes
-            WHERE symbol = 'SPY'
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """)
-        price_result = cursor.fetchone()
-        current_price = float(price_result['current_price']) if price_result else 600.0
-
         # Get target expiration based on time of day
         target_date = get_target_expiration()
 
-        # Get the most recent max pain data for target expiration
-        cursor.execute("""
-            SELECT max_pain, timestamp, expiration
-            FROM gex_metrics
-            WHERE symbol = 'SPY'
-                AND DATE(expiration) = %s
-                AND max_pain IS NOT NULL
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """, (target_date,))
-        max_pain_result = cursor.fetchone()
-
-        if not max_pain_result or not max_pain_result['max_pain']:
-            return jsonify({'error': 'No max pain data available'}), 404
-
-        max_pain = float(max_pain_result['max_pain'])
-        timestamp = max_pain_result['timestamp']
-
-        # Get options data for that expiration
-        cursor.execute("""
-            SELECT
-                strike,
-                option_type,
-                open_interest,
-                mid,
-                underlying_price
-            FROM (
-                SELECT
+        # Current price, latest max pain and the options chain for the
+        # target expiration are independent, so fetch them in parallel
+        price_rows, max_pain_rows, options_rows = fetch_concurrently(
+            (LATEST_SPY_QUOTE_SQL, None),
+            ("""
+                SELECT max_pain, timestamp, expiration
+                FROM gex_metrics
+                WHERE symbol = 'SPY'
+                    AND DATE(expiration) = %s
+                    AND max_pain IS NOT NULL
+                ORDER BY timestamp DESC
+                LIMIT 1
+            """, (target_date,)),
+            ("""
+                SELECT DISTINCT ON (strike, option_type)
                     strike,
                     option_type,
                     open_interest,
                     mid,
-                    underlying_price,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY strike, option_type
-                        ORDER BY last_updated DESC
-                    ) as rn
+                    underlying_price
                 FROM options_quotes
-                WHERE symbol LIKE 'SPY%%'
+                WHERE substring(symbol from 1 for 3) = 'SPY'
                     AND expiration = %s
                     AND open_interest > 0
-            ) latest
-            WHERE rn = 1
-            ORDER BY strike, option_type
-        """, (target_date,))
+                ORDER BY strike, option_type, last_updated DESC
+            """, (target_date,))
+        )
+        current_price = float(price_rows[0]['close']) if price_rows else 600.0
 
-        options_rows = cursor.fetchall()
-        cursor.close()
+        max_pain_result = max_pain_rows[0] if max_pain_rows else None
+        if not max_pain_result or not max_pain_result['max_pain']:
+            return jsonify({'error': 'No max pain data available'}), 404
+
+        max_pain = float(max_pain_result['max_pain'])
+        timestamp = max_pain_result['timestamp'].astimezone(EASTERN)
 
         if not options_rows:
             return jsonify({'error': 'No options data available'}), 404
@@ -1477,16 +1561,14 @@ def get_max_pain_analysis():
         total_value_at_max_pain = max_pain_data['total_value'] if max_pain_data else 0
 
         # Format expiration display
-        import pytz
-        eastern = pytz.timezone('America/New_York')
-        now_et = datetime.now(eastern)
+        now_et = datetime.now(EASTERN)
 
         expiration_display = target_date.strftime('%b %d, %Y')
         if target_date == now_et.date():
             expiration_display += ' (0DTE)'
 
         result = {
-            'timestamp': timestamp.isoformat() if timestamp else datetime.now(pytz.utc).isoformat(),
+            'timestamp': timestamp.isoformat() if timestamp else datetime.now(UTC).isoformat(),
             'expiration': target_date.isoformat(),
             'expiration_display': expiration_display,
             'current_price': current_price,
@@ -1500,81 +1582,51 @@ def get_max_pain_analysis():
     except Exception as e:
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/max-pain/history')
 @cache_query(ttl_seconds=30)
 def get_max_pain_history():
     """Get historical max pain data for time series chart - last 2 trading sessions"""
-    conn = None
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Database connection failed'}), 500
-
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SET TIME ZONE 'America/New_York'")
-
-        # Get last 48 hours of GEX metrics (covers 2 trading sessions)
-        cursor.execute("""
-            SELECT 
-                timestamp,
-                max_pain,
-                underlying_price,
-                expiration
-            FROM gex_metrics
-            WHERE symbol = 'SPY'
-                AND max_pain IS NOT NULL
-                AND timestamp > NOW() - INTERVAL '48 hours'
-            ORDER BY timestamp ASC
-        """)
-
-        rows = cursor.fetchall()
-        cursor.close()
+        with db_cursor() as cursor:
+            if cursor is None:
+                return jsonify({'error': 'Database connection failed'}), 503
 
-        if not rows:
-            return jsonify({'error': 'No historical max pain data available'}), 404
+            # Get last 48 hours of GEX metrics (covers 2 trading sessions)
+            cursor.execute("""
+                SELECT 
+                    timestamp,
+                    max_pain,
+                    COALESCE(underlying_price, 0) as underlying_price,
+                    expiration
+                FROM gex_metrics
+                WHERE symbol = 'SPY'
+                    AND max_pain IS NOT NULL
+                    AND timestamp > NOW() - INTERVAL '48 hours'
+                ORDER BY timestamp ASC
+            """)
 
-        import pytz
-        eastern = pytz.timezone('America/New_York')
-        result = []
+            rows = cursor.fetchall()
 
-        for row in rows:
-            ts = row['timestamp']
-            if ts.tzinfo is None:
-                ts = eastern.localize(ts)
-            else:
-                ts = ts.astimezone(eastern)
+            if not rows:
+                return jsonify({'error': 'No historical max pain data available'}), 404
 
-            result.append({
-                'timestamp': ts.isoformat(),
-                'max_pain': float(row['max_pain']) if row['max_pain'] else 0,
-                'underlying_price': float(row['underlying_price']) if row['underlying_price'] else 0,
-                'expiration': row['expiration'].isoformat() if row['expiration'] else None
-            })
-
-        return jsonify(result)
+            # orjson writes the timestamps and dates as ISO 8601 itself
+            return jsonify(rows)
 
     except Exception as e:
         print(f"Error in get_max_pain_history: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
-    finally:
-        if conn:
-            return_db_connection(conn)
 
 @app.route('/api/market-status')
 def get_market_status():
     """Get detailed market status based on time and recent quote freshness"""
-    import pytz
     from datetime import time as dt_time
 
     try:
         # Get current ET time
-        eastern = pytz.timezone('America/New_York')
-        now_et = datetime.now(eastern)
+        now_et = datetime.now(EASTERN)
         current_time = now_et.time()
         is_weekday = now_et.weekday() < 5  # Monday=0, Friday=4
 
@@ -1588,11 +1640,9 @@ def get_market_status():
             })
 
         # Check for fresh data
-        conn = None
         quote_is_fresh = False
-        try:
-            conn = get_db_connection()
-            if not conn:
+        with db_cursor() as cursor:
+            if cursor is None:
                 return jsonify({
                     'status': 'unknown',
                     'label': 'Status Unknown (Connection Failed)',
@@ -1600,31 +1650,19 @@ def get_market_status():
                     'color': 'gray'
                 })
 
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-            cursor.execute("""
-                SELECT timestamp, close
-                FROM underlying_quotes
-                WHERE symbol = 'SPY'
-                ORDER BY timestamp DESC
-                LIMIT 1
-            """)
+            cursor.execute(LATEST_SPY_QUOTE_SQL)
 
             latest_quote = cursor.fetchone()
-            cursor.close()
 
             # Check quote freshness
             if latest_quote:
                 quote_time = latest_quote['timestamp']
                 if quote_time.tzinfo is None:
-                    quote_time = pytz.utc.localize(quote_time)
+                    quote_time = quote_time.replace(tzinfo=UTC)
 
-                seconds_ago = (datetime.now(pytz.utc) - quote_time).total_seconds()
+                seconds_ago = (datetime.now(UTC) - quote_time).total_seconds()
                 quote_is_fresh = seconds_ago <= 30
 
-        finally:
-            if conn:
-                return_db_connection(conn)
-
         # Streaming data, market must be open
         if quote_is_fresh:
 
@@ -1677,7 +1715,7 @@ def get_market_status():
 @app.route('/logo_full')
 def get_logo_full():
     try:
-        return send_from_directory('/opt/zerogex/frontend/static', 'Dark_Full.png')
+        return serve_static(STATIC_DIR, 'Dark_Full.png', 'image/png', max_age=86400)
     except Exception as e:
         print(f"Error serving logo: {e}")
         return jsonify({'error': str(e)}), 500
@@ -1685,7 +1723,7 @@ def get_logo_full():
 @app.route('/logo_full_light')
 def get_logo_full_light():
     try:
-        return send_from_directory('/opt/zerogex/frontend/static', 'Light_Full.png')
+        return serve_static(STATIC_DIR, 'Light_Full.png', 'image/png', max_age=86400)
     except Exception as e:
         print(f"Error serving logo: {e}")
         return jsonify({'error': str(e)}), 500
@@ -1693,7 +1731,7 @@ def get_logo_full_light():
 @app.route('/logo_title')
 def get_logo_title():
     try:
-        return send_from_directory('/opt/zerogex/frontend/static', 'Dark_Title.png')
+        return serve_static(STATIC_DIR, 'Dark_Title.png', 'image/png', max_age=86400)
     except Exception as e:
         print(f"Error serving logo: {e}")
         return jsonify({'error': str(e)}), 500
@@ -1701,7 +1739,7 @@ def get_logo_title():
 @app.route('/logo_title_light')
 def get_logo_title_light():
     try:
-        return send_from_directory('/opt/zerogex/frontend/static', 'Light_Title.png')
+        return serve_static(STATIC_DIR, 'Light_Title.png', 'image/png', max_age=86400)
     except Exception as e:
         print(f"Error serving logo: {e}")
         return jsonify({'error': str(e)}), 500
@@ -1709,7 +1747,7 @@ def get_logo_title_light():
 @app.route('/logo_icon_helmet')
 def get_logo_icon_helmet():
     try:
-        return send_from_directory('/opt/zerogex/frontend/static', 'Dark_Helmet.png')
+        return serve_static(STATIC_DIR, 'Dark_Helmet.png', 'image/png', max_age=86400)
     except Exception as e:
         print(f"Error serving logo: {e}")
         return jsonify({'error': str(e)}), 500
@@ -1717,7 +1755,7 @@ def get_logo_icon_helmet():
 @app.route('/logo_icon_helmet_light')
 def get_logo_icon_helmet_light():
     try:
-        return send_from_directory('/opt/zerogex/frontend/static', 'Light_Helmet.png')
+        return serve_static(STATIC_DIR, 'Light_Helmet.png', 'image/png', max_age=86400)
     except Exception as e:
         print(f"Error serving logo: {e}")
         return jsonify({'error': str(e)}), 500
@@ -1725,7 +1763,7 @@ def get_logo_icon_helmet_light():
 @app.route('/favicon.ico')
 def get_logo_icon_ico():
     try:
-        return send_from_directory('/opt/zerogex/frontend/static', 'favicon.ico')
+        return serve_static(STATIC_DIR, 'favicon.ico', 'image/x-icon', max_age=86400)
     except Exception as e:
         print(f"Error serving logo: {e}")
         return jsonify({'error': str(e)}), 500
@@ -1734,11 +1772,12 @@ def get_logo_icon_ico():
 def serve_navigation_js():
     """Serve navigation JavaScript"""
     try:
-        return send_from_directory(DASHBOARD_DIR, 'navigation.js')
+        return serve_static(DASHBOARD_DIR, 'navigation.js', 'text/javascript')
     except Exception as e:
         print(f"Error serving navigation.js: {e}")
         return jsonify({'error': str(e)}), 500
 
+# Local development only; the service runs under gunicorn (gex-frontend.service)
 if __name__ == '__main__':
     print("Starting GEX Dashboard on port 8081...")
     print(f"Dashboard directory: {DASHBOARD_DIR}")
@@ -1747,4 +1786,5 @@ if __name__ == '__main__':
     # Initialize connection pool on startup
     init_db_pool()
 
-    app.run(host='0.0.0.0', port=8081, debug=False, threaded=True)
+    # The Werkzeug debugger and reloader only when asked for explicitly
+    app.run(host='0.0.0.0', port=8081, debug=os.environ.get('FLASK_DEBUG') == '1', threaded=True)
@@ -12,7 +12,7 @@ import asyncio
 import psycopg2
 from psycopg2 import OperationalError, InterfaceError
 from datetime import datetime, date, time as dt_time, timedelta
-import pytz
+from zoneinfo import ZoneInfo
 import os
 import sys
 from pathlib import Path
@@ -32,6 +32,8 @@ load_dotenv(env_file)
 
 logger = get_logger(__name__)
 
+EASTERN = ZoneInfo('America/New_York')
+
 
 class GEXScheduler:
     """Schedule and run GEX calculations with connection resilience"""
@@ -75,7 +77,7 @@ class GEXScheduler:
             'calculations': 0,
             'errors': 0,
             'reconnections': 0,
-            'start_time': datetime.now(pytz.timezone('America/New_York'))
+            'start_time': datetime.now(EASTERN)
         }
 
         logger.info("✅ GEX Scheduler initialized successfully")
@@ -162,8 +164,7 @@ class GEXScheduler:
         Returns:
             True if market is open, False otherwise
         """
-        et_tz = pytz.timezone('America/New_York')
-        now_et = datetime.now(et_tz)
+        now_et = datetime.now(EASTERN)
 
         # Weekend check
         if now_et.weekday() >= 5:
@@ -192,8 +193,7 @@ class GEXScheduler:
             Date object for expiration
         """
         if self.target_expiration == 'today':
-            et_tz = pytz.timezone('America/New_York')
-            now_et = datetime.now(et_tz)
+            now_et = datetime.now(EASTERN)
 
             # After 4 PM ET, roll to next trading day
             if now_et.time() >= dt_time(16, 0):
@@ -376,7 +376,7 @@ class GEXScheduler:
 
     def _log_statistics(self):
         """Log scheduler statistics"""
-        uptime = datetime.now(pytz.timezone('America/New_York')) - self.stats['start_time']
+        uptime = datetime.now(EASTERN) - self.stats['start_time']
         uptime_hours = uptime.total_seconds() / 3600
 
         logger.info("="*60)
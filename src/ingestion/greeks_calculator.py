@@ -7,7 +7,9 @@ Standalone module for calculating options Greeks.
 import numpy as np
 from scipy.stats import norm
 from datetime import datetime, time as dt_time, date
-import pytz
+from zoneinfo import ZoneInfo
+
+EASTERN = ZoneInfo('America/New_York')
 
 class GreeksCalculator:
     """Calculate options Greeks using Black-Scholes model with dividends"""
@@ -38,7 +40,7 @@ class GreeksCalculator:
             dict with delta, gamma, theta, vega, rho
         """
         if current_time is None:
-            current_time = datetime.now(pytz.timezone('America/New_York'))
+            current_time = datetime.now(EASTERN)
         
         # Calculate time to expiration in years
         T = self._time_to_expiration(current_time, expiration)
@@ -102,13 +104,13 @@ class GreeksCalculator:
 
                 expiration, 
                 dt_time(16, 0)
-            ).replace(tzinfo=pytz.timezone('America/New_York'))
+            ).replace(tzinfo=EASTERN)
         else:
             exp_datetime = expiration
         
         # Ensure current_time is timezone-aware
         if current_time.tzinfo is None:
-            current_time = pytz.timezone('America/New_York').localize(current_time)
+            current_time = current_time.replace(tzinfo=EASTERN)
         
         # Time difference in years
         time_diff = (exp_datetime - current_time).total_seconds()
@@ -148,7 +150,7 @@ class GreeksCalculator:
         from scipy.optimize import brentq
         
         if current_time is None:
-            current_time = datetime.now(pytz.timezone('America/New_York'))
+            current_time = datetime.now(EASTERN)
         
         T = self._time_to_expiration(current_time, expiration)
         
@@ -9,6 +9,7 @@ import asyncio
 import psycopg2
 from psycopg2.extras import execute_values
 from datetime import datetime, date, timezone, timedelta, time as dt_time
+from zoneinfo import ZoneInfo
 import time
 import os
 import sys
@@ -28,6 +29,8 @@ from src.utils import get_logger
 
 logger = get_logger(__name__)
 
+EASTERN = ZoneInfo('America/New_York')
+
 
 class StreamingIngestionEngine:
     """Ingest real-time options data from TradeStation streaming API"""
@@ -106,6 +109,10 @@ class StreamingIngestionEngine:
         # Underlying price cache
         self.underlying_prices = {}
 
+        # Last 5-minute bar seen per symbol, used to NOTIFY dashboards once
+        # per new bar rather than on every tick
+        self.underlying_buckets = {}
+
         # Heartbeat monitoring
         self.last_activity = {}  # Track per symbol
         self.heartbeat_timeout = self.config['ingestion']['heartbeat_timeout']
@@ -173,10 +180,9 @@ class StreamingIngestionEngine:
         Returns:
             date: Target expiration date
         """
-        import pytz
         from datetime import timedelta, time as dt_time
 
-        now_et = datetime.now(pytz.timezone('America/New_York'))
+        now_et = datetime.now(EASTERN)
         current_date = now_et.date()
 
         # If after 4:00 PM ET (options expiration time), move to next day
@@ -498,6 +504,9 @@ class StreamingIngestionEngine:
                 actual_time = EXCLUDED.actual_time
         """
 
+        # 5-minute bars start one minute past each mark (see underlying_5min_bars)
+        bucket = int((quote_timestamp.timestamp() - 60) // 300)
+
         try:
             cursor.execute(insert_query, (
                 quote_timestamp,  # Use TradeStation's timestamp
@@ -511,10 +520,14 @@ class StreamingIngestionEngine:
                 quote['down_vol'],
                 actual_time  # NEW: Actual time when quote was received
             ))
+            if self.underlying_buckets.get(symbol) != bucket:
+                # Dashboards drop cached history on this; delivered at commit
+                cursor.execute("SELECT pg_notify('underlying_bucket_new', %s)", (symbol,))
             self.db_conn.commit()
 
             # Update in-memory cache
             self.underlying_prices[symbol] = quote['close']
+            self.underlying_buckets[symbol] = bucket
 
             logger.debug(f"Stored underlying quote: {symbol} = ${quote['close']:.2f}, vol={int(quote['total_vol']) if quote['total_vol'] else 0} (ts: {quote_timestamp_str}, actual: {actual_time.isoformat()})")
 
@@ -747,7 +760,6 @@ class StreamingIngestionEngine:
         This ensures we automatically roll to the next trading day's options
         when today's options expire.
         """
-        import pytz
         from datetime import timedelta
 
         logger.info("📍 Starting expiration rollover monitor (checks at 4:00 PM ET)")
@@ -756,7 +768,7 @@ class StreamingIngestionEngine:
 
         while True:
             try:
-                now_et = datetime.now(pytz.timezone('America/New_York'))
+                now_et = datetime.now(EASTERN)
                 current_date = now_et.date()
 
                 # Only trigger rollover once per day at 4:00 PM ET
@@ -5,6 +5,8 @@ Handles OAuth2 authentication with TradeStation API.
 """
 
 import os
+import asyncio
+import aiohttp
 import requests
 import time
 from datetime import datetime, timedelta
@@ -46,6 +48,12 @@ class TradeStationAuth:
         self.access_token = None
         self.token_expiry = None
 
+        # Serializes async refreshes, so concurrent streams share one.
+        # Created on the running loop by _get_refresh_lock, since a lock
+        # cannot be shared between event loops
+        self._refresh_lock = None
+        self._refresh_lock_loop = None
+
         logger.info(f"TradeStationAuth initialized for {'sandbox' if sandbox else 'production'}")
 
     def get_access_token(self) -> str:
@@ -55,6 +63,53 @@ class TradeStationAuth:
         Returns:
             Valid access token
         """
+        if self._has_valid_token():
+            return self.access_token
+
+        return self._refresh_access_token()
+
+    async def get_access_token_async(self, session: aiohttp.ClientSession) -> str:
+        """
+        Get valid access token without blocking the event loop
+
+        Same as get_access_token, but refreshes over the caller's aiohttp
+        session.
+
+        Args:
+            session: aiohttp session to send the refresh request on
+
+        Returns:
+            Valid access token
+        """
+        if self._has_valid_token():
+            return self.access_token
+
+        async with self._get_refresh_lock():
+            # Another coroutine may have refreshed while we waited
+            if self._has_valid_token():
+                return self.access_token
+            return await self._refresh_access_token_async(session)
+
+    def _get_refresh_lock(self) -> asyncio.Lock:
+        """
+        Get the refresh lock for the running event loop
+
+        Returns:
+            Lock created on, and only used from, the current loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._refresh_lock_loop is not loop:
+            self._refresh_lock = asyncio.Lock()
+            self._refresh_lock_loop = loop
+        return self._refresh_lock
+
+    def _has_valid_token(self) -> bool:
+        """
+        Check whether the cached access token can still be used
+
+        Returns:
+            True if the token is more than 5 minutes from expiry
+        """
         logger.debug("Checking access token validity...")
 
         # If we already have an access token and it's not expired
@@ -66,7 +121,7 @@ class TradeStationAuth:
 
             if time_until_expiry > 5*60:
                 logger.debug("Using cached access token")
-                return self.access_token
+                return True
             elif time_until_expiry > 0:
                 logger.debug("Access token will expire in <5 minutes, refreshing...")
             else:
@@ -74,29 +129,60 @@ class TradeStationAuth:
         else:
             logger.info("No cached token, obtaining new access token...")
 
-        return self._refresh_access_token()
+        return False
 
-    def _refresh_access_token(self) -> str:
+    def _refresh_payload(self) -> dict:
         """
-        Refresh access token using refresh token
+        Build the form body for a refresh_token request
 
         Returns:
-            New access token
+            Dictionary of form fields
         """
-        logger.debug(f"Requesting new access token from {self.token_url}...")
-
         # Generate JSON payload for refresh_token request
         # grant_type:    'refresh_token'
         # client_id:     client ID or API key from .env
         # client_secret: client secrect from .env
         # refresh_token: refresh token from .env
-        payload = {
+        return {
             'grant_type': 'refresh_token',
             'client_id': self.client_id,
             'client_secret': self.client_secret,
             'refresh_token': self.refresh_token
         }
 
+    def _store_token(self, data: dict) -> str:
+        """
+        Cache the access token from a token response
+
+        Args:
+            data: Parsed JSON token response
+
+        Returns:
+            New access token
+        """
+        # Pull access token from JSON response
+        # Access tokens have a 20-minute lifetime
+        # For more details, see:
+        # https://api.tradestation.com/docs/fundamentals/authentication/refresh-tokens
+        self.access_token = data['access_token']
+        expires_in = data.get('expires_in', 1200)
+        self.token_expiry = datetime.now() + timedelta(seconds=expires_in)
+        logger.info(f"✅ Access token refreshed successfully (expires in {expires_in}s)")
+        logger.debug(f"Token expiry set to: {self.token_expiry}")
+
+        return self.access_token
+
+    def _refresh_access_token(self) -> str:
+        """
+        Refresh access token using refresh token
+
+        Returns:
+            New access token
+        """
+        logger.debug(f"Requesting new access token from {self.token_url}...")
+
+        payload = self._refresh_payload()
+
         try:
 
             # Make refresh token request to https://signin.tradestation.com/oauth/token
@@ -113,17 +199,7 @@ class TradeStationAuth:
             # Parse JSON response
             data = response.json()
 
-            # Pull access token from JSON response
-            # Access tokens have a 20-minute lifetime
-            # For more details, see:
-            # https://api.tradestation.com/docs/fundamentals/authentication/refresh-tokens
-            self.access_token = data['access_token']
-            expires_in = data.get('expires_in', 1200)
-            self.token_expiry = datetime.now() + timedelta(seconds=expires_in)
-            logger.info(f"✅ Access token refreshed successfully (expires in {expires_in}s)")
-            logger.debug(f"Token expiry set to: {self.token_expiry}")
-
-            return self.access_token
+            return self._store_token(data)
 
         except requests.exceptions.Timeout:
             logger.error("Token refresh request timed out")
@@ -139,6 +215,54 @@ class TradeStationAuth:
             logger.critical(f"Unexpected error during token refresh: {e}", exc_info=True)
             raise
 
+    async def _refresh_access_token_async(self, session: aiohttp.ClientSession) -> str:
+        """
+        Refresh access token using refresh token, over aiohttp
+
+        Args:
+            session: aiohttp session to send the request on
+
+        Returns:
+            New access token
+        """
+        logger.debug(f"Requesting new access token from {self.token_url}...")
+
+        payload = self._refresh_payload()
+
+        try:
+
+            async with session.post(
+                self.token_url,
+                data=payload,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+
+                logger.debug(f"Token request status code: {response.status}")
+
+                if response.status != 200:
+                    logger.error(f"Token refresh failed with status {response.status}")
+                    logger.error(f"Response: {await response.text()}")
+                    response.raise_for_status()
+
+                # Parse JSON response
+                data = await response.json()
+
+            return self._store_token(data)
+
+        except asyncio.TimeoutError:
+            logger.error("Token refresh request timed out")
+            raise
+        except aiohttp.ClientError as e:
+            logger.error(f"Token refresh request failed: {e}")
+            raise
+        except KeyError as e:
+            logger.error(f"Unexpected token response format, missing key: {e}")
+            logger.debug(f"Response data: {data}")
+            raise
+        except Exception as e:
+            logger.critical(f"Unexpected error during token refresh: {e}", exc_info=True)
+            raise
+
     def get_headers(self) -> dict:
         """
         Get authorization headers for API requests
@@ -152,6 +276,22 @@ class TradeStationAuth:
         logger.debug("Generated authorization headers")
         return headers
 
+    async def get_headers_async(self, session: aiohttp.ClientSession) -> dict:
+        """
+        Get authorization headers without blocking the event loop
+
+        Args:
+            session: aiohttp session to refresh the token on if needed
+
+        Returns:
+            Dictionary with Authorization header
+            containing the access token
+        """
+        token = await self.get_access_token_async(session)
+        headers = {'Authorization': f'Bearer {token}'}
+        logger.debug("Generated authorization headers")
+        return headers
+
 
 def main():
 
@@ -96,14 +96,15 @@ class TradeStationStreamingClient:
             params['strikeProximity'] = strike_proximity
             logger.debug(f"Filtering to {strike_proximity} strikes above/below spot")
 
-        # Get fresh access token
-        headers = self.auth.get_headers()
-        headers['Content-Type'] = 'application/json'
-        headers['Accept'] = 'application/vnd.tradestation.streams.v2+json'
-
         if not self.session:
             self.session = aiohttp.ClientSession()
 
+        # Get fresh access token; refreshed on the stream's own session so
+        # the event loop keeps running during the token request
+        headers = await self.auth.get_headers_async(self.session)
+        headers['Content-Type'] = 'application/json'
+        headers['Accept'] = 'application/vnd.tradestation.streams.v2+json'
+
         try:
             logger.debug(f"Connecting to stream: {url} with params {params}...")
             
@@ -1,11 +1,14 @@
-from datetime import datetime, time as dt_time, timezone
-import pytz
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'monitoring'))
+from market_hours import EASTERN, OPEN_MINUTE, CLOSE_MINUTE, is_market_open
 
-et_tz = pytz.timezone('America/New_York')
 utc_tz = timezone.utc
 
 now_utc = datetime.now(utc_tz)
-now_et = datetime.now(et_tz)
+now_et = datetime.now(EASTERN)
 
 print("="*60)
 print("MARKET HOURS DEBUG")
@@ -16,18 +19,14 @@ print(f"Day of week: {now_et.weekday()} (0=Mon, 4=Fri, 5=Sat, 6=Sun)")
 print(f"Current time: {now_et.time()}")
 print()
 
-market_open = dt_time(9, 30)
-market_close = dt_time(16, 0)
-current_time = now_et.time()
-
-print(f"Market opens: {market_open}")
-print(f"Market closes: {market_close}")
+print(f"Market opens: {OPEN_MINUTE // 60:02d}:{OPEN_MINUTE % 60:02d}")
+print(f"Market closes: {CLOSE_MINUTE // 60:02d}:{CLOSE_MINUTE % 60:02d}")
 print()
 
 is_weekday = now_et.weekday() < 5
-is_open_hours = market_open <= current_time <= market_close
+is_open_hours = OPEN_MINUTE <= now_et.hour * 60 + now_et.minute < CLOSE_MINUTE
 
 print(f"Is weekday: {is_weekday}")
 print(f"In market hours: {is_open_hours}")
-print(f"Market is OPEN: {is_weekday and is_open_hours}")
+print(f"Market is OPEN: {is_market_open(now_et)}")
 print("="*60)
@@ -0,0 +1,124 @@
+"""
+ETag / 304 revalidation for the monitoring dashboard and the customer
+frontend, through the full after_request chain including flask-compress
+"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('flask_compress')
+pytest.importorskip('brotli')
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'monitoring'))
+sys.path.insert(0, os.path.join(ROOT, 'src', 'frontend'))
+
+from flask import Response
+
+import dashboard
+import gex_frontend
+
+# Large enough to be compressed (COMPRESS_MIN_SIZE is 500 bytes)
+PAYLOAD = b'{"values":[' + b','.join(b'%d' % i for i in range(400)) + b']}'
+
+
+def _payload_view():
+    return Response(PAYLOAD, mimetype='application/json')
+
+
+# Registered at import, before either app has handled a request
+for _module in (dashboard, gex_frontend):
+    _module.app.add_url_rule('/test/plain', 'test_plain', _payload_view)
+    _module.app.add_url_rule('/test/cached', 'test_cached',
+                             _module.cache_query(ttl_seconds=60)(_payload_view))
+
+
+@pytest.fixture(params=[dashboard, gex_frontend], ids=['dashboard', 'frontend'])
+def module(request, monkeypatch):
+    if hasattr(request.param, 'start_cache_listener'):
+        monkeypatch.setattr(request.param, 'start_cache_listener', lambda: None)
+    request.param._query_cache.clear()
+    return request.param
+
+
+def _revalidate(client, path, encoding):
+    """Fetch path, then repeat with the returned ETag; return both responses"""
+    headers = {'Accept-Encoding': encoding}
+    first = client.get(path, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    second = client.get(path, headers={**headers, 'If-None-Match': etag})
+    return first, second
+
+
+@pytest.mark.parametrize('encoding', ['br', 'gzip', 'identity'])
+def test_unchanged_response_revalidates_to_304(module, encoding):
+    first, second = _revalidate(module.app.test_client(), '/test/plain', encoding)
+
+    if encoding == 'identity':
+        assert 'Content-Encoding' not in first.headers
+    else:
+        assert first.headers['Content-Encoding'] == encoding
+        assert first.headers['ETag'].endswith(f':{encoding}"')
+    assert second.status_code == 304
+    assert second.data == b''
+
+
+@pytest.mark.parametrize('encoding', ['br', 'gzip', 'identity'])
+def test_cached_response_revalidates_to_304(module, encoding):
+    client = module.app.test_client()
+    headers = {'Accept-Encoding': encoding}
+
+    # The miss is compressed by flask-compress, the hit is served from the
+    # precompressed cache entry; both must carry the same validator
+    miss = client.get('/test/cached', headers=headers)
+    hit = client.get('/test/cached', headers=headers)
+    assert miss.headers['ETag'] == hit.headers['ETag']
+    assert hit.headers.get('Content-Encoding') == miss.headers.get('Content-Encoding')
+
+    again = client.get('/test/cached', headers={**headers, 'If-None-Match': hit.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_etag_from_other_encoding_does_not_match(module):
+    client = module.app.test_client()
+    gzip_etag = client.get('/test/plain', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+
+    response = client.get('/test/plain', headers={'Accept-Encoding': 'br',
+                                                  'If-None-Match': gzip_etag})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'br'
+
+
+def test_changed_response_is_sent_in_full(module):
+    client = module.app.test_client()
+    response = client.get('/test/plain', headers={'Accept-Encoding': 'br',
+                                                  'If-None-Match': '"stale:br"'})
+    assert response.status_code == 200
+    assert response.data
+
+
+def test_metrics_file_revalidates_to_304(tmp_path, monkeypatch):
+    metrics_file = tmp_path / 'current_metrics.json'
+    metrics_file.write_bytes(b'{"timestamp":"2026-01-02T15:04:05Z","pad":"' + b'x' * 600 + b'"}')
+    monkeypatch.setattr(dashboard, 'METRICS_FILE', metrics_file)
+    monkeypatch.setattr(dashboard, '_metrics_cache', (0, None, None, None))
+
+    first, second = _revalidate(dashboard.app.test_client(), '/api/metrics', 'br')
+    assert first.headers['Content-Encoding'] == 'br'
+    assert second.status_code == 304
+
+
+def test_metrics_without_top_level_timestamp_get_one(tmp_path, monkeypatch):
+    metrics_file = tmp_path / 'current_metrics.json'
+    # Only a nested entry carries a timestamp
+    metrics_file.write_bytes(b'{"alerts":[{"timestamp":"2026-01-02T15:04:05Z"}]}')
+    monkeypatch.setattr(dashboard, 'METRICS_FILE', metrics_file)
+    monkeypatch.setattr(dashboard, '_metrics_cache', (0, None, None, None))
+
+    data = dashboard.app.test_client().get('/api/metrics').get_json()
+    assert data['timestamp']
+    assert data['alerts'] == [{'timestamp': '2026-01-02T15:04:05Z'}]
@@ -0,0 +1,59 @@
+"""
+Terminal dashboard repaint: only changed rows are rewritten, unless the
+frame may have been scrolled off its rows
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('psutil')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'monitoring'))
+
+import monitor
+
+CLEAR = '\033[2J\033[H'
+
+
+@pytest.fixture
+def screen(capsys, monkeypatch):
+    monkeypatch.setattr(monitor.shutil, 'get_terminal_size',
+                        lambda: os.terminal_size((80, 24)))
+    return capsys
+
+
+@pytest.fixture
+def dashboard():
+    return monitor.MonitoringDashboard(SimpleNamespace(messages_written=0))
+
+
+def _draw(dashboard, screen, lines):
+    dashboard._repaint(lines)
+    return screen.readouterr().out
+
+
+def test_unchanged_rows_are_not_rewritten(dashboard, screen):
+    _draw(dashboard, screen, ['a', 'b', 'c'])
+    output = _draw(dashboard, screen, ['a', 'B', 'c'])
+
+    assert CLEAR not in output
+    assert output == '\033[2;1HB\033[K\033[4;1H'
+
+
+def test_collector_message_forces_full_redraw(dashboard, screen):
+    _draw(dashboard, screen, ['a', 'b'])
+    dashboard.collector.messages_written += 1
+
+    assert _draw(dashboard, screen, ['a', 'b']).startswith(CLEAR)
+    # Back to partial updates once the frame is clean again
+    assert _draw(dashboard, screen, ['a', 'b']) == '\033[3;1H'
+
+
+def test_frame_taller_than_terminal_is_redrawn_in_full(dashboard, screen):
+    lines = [str(i) for i in range(30)]
+    _draw(dashboard, screen, lines)
+
+    assert _draw(dashboard, screen, lines).startswith(CLEAR)
@@ -0,0 +1,167 @@
+"""
+Batched history writes in the monitor: a failed flush must keep its rows
+and a retry must write each of them exactly once
+"""
+
+import atexit
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('psutil')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'monitoring'))
+
+import monitor
+
+
+class FakeDatabase:
+    """Rows per table, with uncommitted rows held until commit()"""
+
+    def __init__(self):
+        self.committed = {}
+        self.fail_on_page = None
+        self.pages = 0
+
+    def connect(self):
+        return FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+        self.autocommit = True
+        self.pending = []
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        for table, rows in self.pending:
+            self.db.committed.setdefault(table, []).extend(rows)
+        self.pending = []
+
+    def rollback(self):
+        self.pending = []
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def insert(self, table, rows):
+        self.conn.pending.append((table, list(rows)))
+        if self.conn.autocommit:
+            self.conn.commit()
+
+
+class FakePool:
+    def __init__(self, db):
+        self.db = db
+
+    def getconn(self):
+        return self.db.connect()
+
+    def putconn(self, conn, close=False):
+        pass
+
+    def closeall(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = FakeDatabase()
+
+    def execute_values(cursor, sql, rows, page_size=100):
+        # Like psycopg2's: one statement per page of rows
+        table = sql.split()[2]
+        for start in range(0, len(rows), page_size):
+            database.pages += 1
+            if database.pages == database.fail_on_page:
+                raise RuntimeError('connection lost mid-flush')
+            cursor.insert(table, rows[start:start + page_size])
+
+    fake_psycopg2 = SimpleNamespace(
+        OperationalError=type('OperationalError', (Exception,), {}),
+        extras=SimpleNamespace(execute_values=execute_values),
+        pool=SimpleNamespace(ThreadedConnectionPool=lambda *args, **kwargs: FakePool(database)),
+    )
+    monkeypatch.setattr(monitor, '_psycopg2', lambda: fake_psycopg2)
+    return database
+
+
+@pytest.fixture
+def collector(db):
+    collector = monitor.MonitoringCollector(db_config=None)
+    atexit.unregister(collector.flush_history)
+    collector.db_config = {}
+    yield collector
+    collector._executor.shutdown()
+
+
+def _uptime_rows(count):
+    return [(i, 'gex-ingestion', 1) for i in range(count)]
+
+
+def test_flush_writes_and_clears_buffer(collector, db):
+    collector._uptime_buffer.extend(_uptime_rows(5))
+
+    collector.flush_history()
+
+    assert db.committed['service_uptime_checks'] == _uptime_rows(5)
+    assert collector._uptime_buffer == []
+
+
+def test_failed_multi_page_flush_keeps_rows_and_retry_writes_once(collector, db):
+    # 450 rows are three pages of 200; the second page fails
+    rows = _uptime_rows(450)
+    collector._uptime_buffer.extend(rows)
+    db.fail_on_page = 2
+
+    collector.flush_history()
+
+    assert db.committed.get('service_uptime_checks', []) == []
+    assert collector._uptime_buffer == rows
+
+    collector.flush_history()
+
+    assert db.committed['service_uptime_checks'] == rows
+    assert collector._uptime_buffer == []
+
+
+def test_failure_on_one_table_does_not_rewrite_the_other(collector, db):
+    collector._uptime_buffer.extend(_uptime_rows(3))
+    collector._snapshot_buffer.append((0, 1.0, 2.0, 3.0, 4, 5))
+    # Page 1 is the uptime insert, page 2 the snapshot insert
+    db.fail_on_page = 2
+
+    collector.flush_history()
+
+    assert collector._uptime_buffer == []
+    assert collector._snapshot_buffer == [(0, 1.0, 2.0, 3.0, 4, 5)]
+
+    collector.flush_history()
+
+    assert db.committed['service_uptime_checks'] == _uptime_rows(3)
+    assert db.committed['monitor_snapshots'] == [(0, 1.0, 2.0, 3.0, 4, 5)]
+
+
+def test_backlog_is_bounded_while_database_is_down(collector, db):
+    limit = monitor.HISTORY_FLUSH_ROWS * 10
+    rows = _uptime_rows(limit + 50)
+    collector._uptime_buffer.extend(rows)
+    db.fail_on_page = 1
+
+    collector.flush_history()
+
+    # The newest rows are kept
+    assert collector._uptime_buffer == rows[-limit:]
@@ -0,0 +1,82 @@
+"""
+Monitor scheduling and market-hours helpers
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('psutil')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'monitoring'))
+
+import monitor
+from market_hours import EASTERN, is_market_open
+
+
+class FakeTime:
+    """monotonic() and sleep() on a virtual clock; work() simulates a cycle"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        assert seconds >= 0
+        self.now += seconds
+
+    def work(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(monitor, 'time', fake)
+    return fake
+
+
+def test_ticks_stay_on_the_grid_despite_work(clock):
+    ticks = monitor.interval_ticks(10)
+    times = []
+    for _ in range(4):
+        next(ticks)
+        times.append(clock.now)
+        clock.work(3)
+
+    assert times == [0, 10, 20, 30]
+
+
+def test_overrun_skips_missed_ticks(clock):
+    ticks = monitor.interval_ticks(10)
+    next(ticks)
+    clock.work(25)
+    next(ticks)
+
+    # 10 and 20 were missed; the next tick is the next grid point
+    assert clock.now == 30
+
+
+@pytest.mark.parametrize('when, expected', [
+    (datetime(2026, 10, 16, 9, 29), False),   # Friday, before the open
+    (datetime(2026, 10, 16, 9, 30), True),    # the open
+    (datetime(2026, 10, 16, 15, 59), True),
+    (datetime(2026, 10, 16, 16, 0), False),   # the close
+    (datetime(2026, 10, 17, 12, 0), False),   # Saturday
+    (datetime(2026, 10, 18, 12, 0), False),   # Sunday
+])
+def test_is_market_open(when, expected):
+    assert is_market_open(when.replace(tzinfo=EASTERN)) is expected
+
+
+def test_market_hours_follow_daylight_saving():
+    # 13:45 UTC is 9:45 EDT in summer but 8:45 EST in winter
+    summer = datetime.fromisoformat('2026-07-01T13:45:00+00:00').astimezone(EASTERN)
+    winter = datetime.fromisoformat('2026-12-01T13:45:00+00:00').astimezone(EASTERN)
+
+    assert is_market_open(summer)
+    assert not is_market_open(winter)
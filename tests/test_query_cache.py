@@ -0,0 +1,168 @@
+"""
+cache_query in the monitoring dashboard and the customer frontend: TTL
+expiry, LRU bound and single-flight for concurrent misses
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('flask_compress')
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'monitoring'))
+sys.path.insert(0, os.path.join(ROOT, 'src', 'frontend'))
+
+from flask import Response
+
+import dashboard
+import gex_frontend
+
+
+class FakeClock:
+    """Stands in for the module's time import with a settable monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+@pytest.fixture(params=[dashboard, gex_frontend], ids=['dashboard', 'frontend'])
+def module(request, monkeypatch):
+    if hasattr(request.param, 'start_cache_listener'):
+        monkeypatch.setattr(request.param, 'start_cache_listener', lambda: None)
+    request.param._query_cache.clear()
+    yield request.param
+    request.param._query_cache.clear()
+
+
+@pytest.fixture
+def clock(module, monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(module, 'time', fake)
+    return fake
+
+
+def _counting_view(module, ttl_seconds=30):
+    calls = []
+
+    @module.cache_query(ttl_seconds=ttl_seconds)
+    def view(value):
+        calls.append(value)
+        return Response(b'{"value":%d,"call":%d}' % (value, len(calls)),
+                        mimetype='application/json')
+
+    return view, calls
+
+
+def _call(module, view, *args):
+    with module.app.test_request_context(headers={'Accept-Encoding': 'identity'}):
+        return view(*args).get_data()
+
+
+def test_hit_within_ttl_skips_the_query(module, clock):
+    view, calls = _counting_view(module)
+
+    first = _call(module, view, 1)
+    clock.now += 29
+    second = _call(module, view, 1)
+
+    assert calls == [1]
+    assert first == second
+
+
+def test_entry_expires_after_ttl(module, clock):
+    view, calls = _counting_view(module)
+
+    _call(module, view, 1)
+    clock.now += 31
+    body = _call(module, view, 1)
+
+    assert calls == [1, 1]
+    assert body == b'{"value":1,"call":2}'
+
+
+def test_arguments_are_cached_separately(module, clock):
+    view, calls = _counting_view(module)
+
+    _call(module, view, 1)
+    _call(module, view, 2)
+    _call(module, view, 1)
+
+    assert calls == [1, 2]
+
+
+def test_errors_are_not_cached(module, clock):
+    calls = []
+
+    @module.cache_query(ttl_seconds=30)
+    def failing():
+        calls.append(1)
+        return Response(b'{"error":"down"}', status=503, mimetype='application/json')
+
+    with module.app.test_request_context():
+        failing()
+        failing()
+
+    assert len(calls) == 2
+
+
+def test_cache_is_bounded(module, clock, monkeypatch):
+    monkeypatch.setattr(module, 'QUERY_CACHE_MAXSIZE', 3)
+    view, calls = _counting_view(module)
+
+    for value in range(5):
+        _call(module, view, value)
+
+    assert len(module._query_cache) == 3
+    # The oldest entries were evicted
+    _call(module, view, 0)
+    assert calls == [0, 1, 2, 3, 4, 0]
+
+
+def test_concurrent_misses_run_the_query_once(module):
+    release = threading.Event()
+    started = threading.Event()
+    calls = []
+
+    @module.cache_query(ttl_seconds=30)
+    def slow():
+        calls.append(1)
+        started.set()
+        assert release.wait(5)
+        return Response(b'{"ok":true}', mimetype='application/json')
+
+    results = []
+
+    def request_slow():
+        with module.app.test_request_context(headers={'Accept-Encoding': 'identity'}):
+            results.append(slow().get_data())
+
+    first = threading.Thread(target=request_slow)
+    first.start()
+    assert started.wait(5)
+
+    waiters = [threading.Thread(target=request_slow) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    # Give the waiters time to find the in-flight query
+    time.sleep(0.1)
+    release.set()
+    for thread in [first, *waiters]:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == [b'{"ok":true}'] * 4
+    assert module._inflight == {}